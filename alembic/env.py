@@ -0,0 +1,51 @@
+"""
+Entorno de Alembic: aplica las migraciones sobre DATABASE_URL.
+
+Se ejecuta con `alembic upgrade head` o desde `python -m app.server`
+antes de arrancar los workers.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app import models
+from app.config import DATABASE_URL
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = models.Base.metadata
+
+
+def _database_url() -> str:
+    # `alembic -x url=...` permite migrar otra base de datos sin cambiar el entorno
+    return context.get_x_argument(as_dictionary=True).get("url") or DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (`alembic upgrade head --sql`)"""
+    context.configure(url=_database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # NullPool: el proceso que migra no necesita conservar conexiones abiertas
+    connectable = create_engine(_database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite no soporta ALTER TABLE completo; las columnas se agregan en modo batch
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,78 @@
+"""Esquema inicial de la tabla pokemon
+
+Crea la tabla con sus índices. Es idempotente para las bases de datos
+creadas antes de usar Alembic (por `init_pokemon_data.sql` o por el antiguo
+`create_all` al importar la aplicación): solo agrega las columnas e índices
+que falten, equivalente a los scripts de `migrations/`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Índices secundarios de app/models.py (las expresiones van como texto)
+INDEXES = {
+    "ix_pokemon_type1_lower": [sa.text("lower(type1)")],
+    "ix_pokemon_type2_lower": [sa.text("lower(type2)")],
+    "ix_pokemon_hp_id": ["hp", "id"],
+    "ix_pokemon_attack_id": ["attack", "id"],
+    "ix_pokemon_defense_id": ["defense", "id"],
+    "ix_pokemon_sp_attack_id": ["sp_attack", "id"],
+    "ix_pokemon_sp_defense_id": ["sp_defense", "id"],
+    "ix_pokemon_speed_id": ["speed", "id"],
+}
+
+
+def _existing_columns():
+    # Sin conexión (`--sql`) no se puede inspeccionar: se asume una base vacía
+    if context.is_offline_mode():
+        return None
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("pokemon"):
+        return None
+    return {column["name"] for column in inspector.get_columns("pokemon")}
+
+
+def upgrade() -> None:
+    columns = _existing_columns()
+    if columns is None:
+        op.create_table(
+            "pokemon",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("type1", sa.String(), nullable=False),
+            sa.Column("type2", sa.String(), nullable=True),
+            sa.Column("hp", sa.Integer(), nullable=False),
+            sa.Column("attack", sa.Integer(), nullable=False),
+            sa.Column("defense", sa.Integer(), nullable=False),
+            sa.Column("sp_attack", sa.Integer(), nullable=False),
+            sa.Column("sp_defense", sa.Integer(), nullable=False),
+            sa.Column("speed", sa.Integer(), nullable=False),
+            sa.Column("height", sa.Float(), nullable=False),
+            sa.Column("weight", sa.Float(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("image_url", sa.String(), nullable=True),
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+        op.create_index("ix_pokemon_id", "pokemon", ["id"])
+        op.create_index("ix_pokemon_name", "pokemon", ["name"], unique=True)
+    else:
+        with op.batch_alter_table("pokemon") as batch:
+            if "image_url" not in columns:
+                batch.add_column(sa.Column("image_url", sa.String(), nullable=True))
+            if "version" not in columns:
+                batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+    for name, index_columns in INDEXES.items():
+        op.create_index(name, "pokemon", index_columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("pokemon")
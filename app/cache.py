@@ -0,0 +1,126 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from . import schemas
+from .config import CACHE_ENABLED, CACHE_MAX_SIZE, CACHE_TTL_SECONDS
+
+
+class PokemonCache:
+    """
+    Caché LRU con expiración (TTL) para lecturas de Pokémon individuales.
+
+    Las entradas se indexan por ID y se mantiene un índice secundario por
+    nombre, de modo que `get_pokemon` y `get_pokemon_by_name` comparten la
+    misma entrada. Se guardan copias `schemas.PokemonRecord` (no objetos ORM)
+    para que sean seguras entre sesiones e hilos.
+
+    Cada invalidación incrementa la generación: quien leyó la base de datos
+    antes de una escritura no puede volver a guardar la fila anterior.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled and max_size > 0
+        self._entries: "OrderedDict[int, Tuple[float, schemas.PokemonRecord]]" = OrderedDict()
+        self._by_name: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, pokemon_id: int) -> Optional[schemas.PokemonRecord]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._get_locked(pokemon_id)
+
+    def get_by_name(self, name: str) -> Optional[schemas.PokemonRecord]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            pokemon_id = self._by_name.get(name)
+            if pokemon_id is None:
+                self.misses += 1
+                return None
+            return self._get_locked(pokemon_id)
+
+    def _get_locked(self, pokemon_id: int) -> Optional[schemas.PokemonRecord]:
+        entry = self._entries.get(pokemon_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, pokemon = entry
+        if expires_at < time.monotonic():
+            self._remove_locked(pokemon_id)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(pokemon_id)
+        self.hits += 1
+        return pokemon
+
+    def set(self, pokemon: schemas.PokemonRecord, generation: int) -> None:
+        """
+        Guarda `pokemon` si no hubo invalidaciones desde `generation` (leída
+        antes de consultar la base de datos)
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._remove_locked(pokemon.id)
+            self._entries[pokemon.id] = (time.monotonic() + self.ttl, pokemon)
+            self._by_name[pokemon.name] = pokemon.id
+            while len(self._entries) > self.max_size:
+                oldest_id = next(iter(self._entries))
+                self._remove_locked(oldest_id)
+                self.evictions += 1
+
+    def invalidate(self, pokemon_id: Optional[int] = None, name: Optional[str] = None) -> None:
+        """Elimina la entrada asociada al ID y/o al nombre indicados"""
+        with self._lock:
+            self._generation += 1
+            if name is not None and pokemon_id is None:
+                pokemon_id = self._by_name.get(name)
+            if pokemon_id is not None:
+                self._remove_locked(pokemon_id)
+            if name is not None:
+                self._by_name.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_name.clear()
+
+    def _remove_locked(self, pokemon_id: int) -> None:
+        entry = self._entries.pop(pokemon_id, None)
+        if entry is not None and self._by_name.get(entry[1].name) == pokemon_id:
+            del self._by_name[entry[1].name]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+pokemon_cache = PokemonCache(
+    max_size=CACHE_MAX_SIZE,
+    ttl=CACHE_TTL_SECONDS,
+    enabled=CACHE_ENABLED,
+)
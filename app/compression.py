@@ -0,0 +1,214 @@
+"""
+Compresión de respuestas según `Accept-Encoding`.
+
+Siempre se ofrece gzip; brotli (`br`) y zstd se agregan si los paquetes
+`brotli` y `zstandard` están instalados. Se usa el algoritmo que el cliente
+acepta con mayor `q`, con preferencia br > zstd > gzip en caso de empate.
+
+Al comprimir, el ETag se convierte en débil (`W/"..."`), igual que hace
+nginx: los bytes enviados ya no son los de la representación original,
+pero la revalidación con If-None-Match sigue funcionando.
+"""
+import zlib
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import COMPRESSION_MIN_SIZE
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+# Tipos de contenido que vale la pena comprimir
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class _BrotliStream:
+    # Misma interfaz que zlib.compressobj: compress() por bloque y flush() al final
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+    def flush_block(self) -> bytes:
+        return self._compressor.flush()
+
+
+class Codec:
+    """
+    Algoritmo de compresión con dos niveles: `dynamic_level` para respuestas
+    comprimidas en cada petición y `static_level` para cuerpos que se
+    comprimen una vez y se reutilizan (ver `payload_cache`).
+
+    `flush_block` vacía el compresor sin cerrar el flujo, para que cada
+    bloque de una respuesta en streaming salga completo y el cliente pueda
+    descomprimirlo sin esperar al final.
+    """
+
+    def __init__(self, name: str, factory: Callable[[int], object], dynamic_level: int, static_level: int,
+                 flush_block: Callable[[object], bytes]):
+        self.name = name
+        self.factory = factory
+        self.dynamic_level = dynamic_level
+        self.static_level = static_level
+        self.flush_block = flush_block
+
+    def stream(self, static: bool = False):
+        return self.factory(self.static_level if static else self.dynamic_level)
+
+    def compress(self, data: bytes, static: bool = False) -> bytes:
+        stream = self.stream(static)
+        return stream.compress(data) + stream.flush()
+
+
+def _available_codecs() -> Dict[str, Codec]:
+    # En orden de preferencia
+    codecs = {}
+    if brotli is not None:
+        codecs["br"] = Codec(
+            "br", _BrotliStream, dynamic_level=4, static_level=9, flush_block=lambda stream: stream.flush_block(),
+        )
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd", lambda level: zstandard.ZstdCompressor(level=level).compressobj(),
+            dynamic_level=3, static_level=12,
+            flush_block=lambda stream: stream.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        )
+    codecs["gzip"] = Codec(
+        "gzip", lambda level: zlib.compressobj(level, zlib.DEFLATED, 31),
+        dynamic_level=6, static_level=9, flush_block=lambda stream: stream.flush(zlib.Z_SYNC_FLUSH),
+    )
+    return codecs
+
+
+CODECS = _available_codecs()
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[Codec]:
+    """Algoritmo a usar para el `Accept-Encoding` recibido, o None para no comprimir"""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for name, codec in CODECS.items():
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def mark_encoded(headers: MutableHeaders, codec: Codec) -> None:
+    """Cabeceras de una respuesta cuyo cuerpo se envía comprimido con `codec`"""
+    headers["Content-Encoding"] = codec.name
+    headers.add_vary_header("Accept-Encoding")
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime respuestas de al menos `minimum_size` bytes.
+
+    Las respuestas que ya traen `Content-Encoding` (p. ej. cuerpos
+    precomprimidos) pasan sin cambios. Las respuestas en streaming se
+    comprimen bloque a bloque sin conocer su tamaño total.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self.app, codec, self.minimum_size)(scope, receive, send)
+
+
+class _CompressedResponder:
+    def __init__(self, app: ASGIApp, codec: Codec, minimum_size: int):
+        self.app = app
+        self.codec = codec
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        # Compresor activo una vez que se decidió comprimir
+        self.stream = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Se retiene hasta ver el primer bloque del cuerpo
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if (
+                "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            mark_encoded(headers, self.codec)
+            self.stream = self.codec.stream()
+            if not more_body:
+                body = self.stream.compress(body) + self.stream.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        chunk = self.stream.compress(body)
+        if not more_body:
+            chunk += self.stream.flush()
+        elif body:
+            # Sin vaciar el compresor, la salida puede quedar retenida hasta el final del cuerpo
+            chunk += self.codec.flush_block(self.stream)
+        body = chunk
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -6,4 +6,92 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://pokemon_user:pokemon_pass@db:5432/pokemon_db")
 POSTGRES_USER = os.getenv("POSTGRES_USER", "pokemon_user")
 POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "pokemon_pass")
-POSTGRES_DB = os.getenv("POSTGRES_DB", "pokemon_db") 
\ No newline at end of file
+POSTGRES_DB = os.getenv("POSTGRES_DB", "pokemon_db")
+
+# Caché en memoria para lecturas de Pokémon individuales
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+
+# Modo asíncrono de base de datos (asyncpg / aiosqlite)
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Réplicas de solo lectura (separadas por comas); las lecturas GET se reparten en round-robin
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Segundos después de una escritura en los que las lecturas van al primario (0 = desactivado)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "0"))
+
+# Pool de conexiones (QueuePool de SQLAlchemy)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Máximo de elementos aceptados por las operaciones masivas (/pokemon/bulk) y de claves en /pokemon/batch
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+
+# Importación masiva (/pokemon/import y python -m app.importer): filas por lote
+# validado y escrito, y errores de validación detallados en el resumen
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "10000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+
+# Caché compartida entre workers y nodos: none, memory (un solo proceso; pruebas) o redis
+SHARED_CACHE_BACKEND = os.getenv("SHARED_CACHE_BACKEND", "none").lower()
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", "redis://localhost:6379/0")
+SHARED_CACHE_PREFIX = os.getenv("SHARED_CACHE_PREFIX", "pokemon")
+SHARED_CACHE_TTL_SECONDS = float(os.getenv("SHARED_CACHE_TTL_SECONDS", "300"))
+# Vida del candado de carga y espera máxima de quienes no lo obtienen (single-flight)
+SHARED_CACHE_LOCK_TTL_SECONDS = float(os.getenv("SHARED_CACHE_LOCK_TTL_SECONDS", "5"))
+SHARED_CACHE_LOCK_WAIT_SECONDS = float(os.getenv("SHARED_CACHE_LOCK_WAIT_SECONDS", "1"))
+
+# Índice en memoria tipo → IDs para /pokemon/type/{pokemon_type}
+TYPE_INDEX_ENABLED = os.getenv("TYPE_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+TYPE_INDEX_TTL_SECONDS = float(os.getenv("TYPE_INDEX_TTL_SECONDS", "60"))
+
+# Índice en memoria de nombres para /pokemon/autocomplete
+NAME_INDEX_TTL_SECONDS = float(os.getenv("NAME_INDEX_TTL_SECONDS", "300"))
+
+# Almacén NumPy de estadísticas (/pokemon/{id}/similar y /pokemon/stats/summary);
+# las escrituras se aplican de forma incremental, el TTL recoge cambios de otros procesos
+STAT_STORE_TTL_SECONDS = float(os.getenv("STAT_STORE_TTL_SECONDS", "300"))
+
+# Máximo de enfrentamientos (pares atacante/defensor) por petición a /matchups
+MATCHUP_MAX_PAIRS = int(os.getenv("MATCHUP_MAX_PAIRS", "100000"))
+
+# Segundos que clientes y proxies (nginx) pueden reutilizar una respuesta sin revalidarla
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+
+# Compresión de respuestas (gzip y, si están instalados, brotli/zstd)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Cuerpos ya codificados (y comprimidos) de los listados más consultados
+PAYLOAD_CACHE_MAX_ENTRIES = int(os.getenv("PAYLOAD_CACHE_MAX_ENTRIES", "128"))
+PAYLOAD_CACHE_TTL_SECONDS = float(os.getenv("PAYLOAD_CACHE_TTL_SECONDS", "60"))
+
+# Endpoint /metrics (latencia por ruta, consultas SQL por petición y errores)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Registro de consultas lentas (con EXPLAIN) para diagnosticar latencia
+SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+
+# Perfil de una sola petición enviando PROFILING_HEADER con uno de los tokens permitidos
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")
+PROFILING_TOKENS = [token.strip() for token in os.getenv("PROFILING_TOKENS", "").split(",") if token.strip()]
+# auto (pyinstrument si está instalado), pyinstrument o cprofile
+PROFILER = os.getenv("PROFILER", "auto").lower()
+
+# Servidor de producción (python -m app.server); WEB_CONCURRENCY=0 usa un worker por núcleo
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0")) or (os.cpu_count() or 1)
+GRACEFUL_SHUTDOWN_TIMEOUT = float(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "*")
+ACCESS_LOG = os.getenv("ACCESS_LOG", "false").lower() in ("1", "true", "yes")
+# Aplicar `alembic upgrade head` antes de arrancar los workers
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS", "true").lower() in ("1", "true", "yes")
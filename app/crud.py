@@ -1,42 +1,732 @@
+import csv
+import io
+
+import numpy as np
+from sqlalchemy import BigInteger, Column, MetaData, Table, bindparam, delete, func, insert, literal_column, or_, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from . import models, schemas
-from typing import List, Optional
+from .cache import pokemon_cache
+from .database import is_replica
+from .name_index import name_index
+from .payload_cache import payload_cache
+from .shared_cache import Codec, shared_cache
+from .stat_store import STAT_FIELDS, stat_store
+from .type_chart import TYPE_CODES, defense_profile, matchups as type_matchups
+from .type_index import normalize_type, type_index
+from typing import Dict, List, Optional, Tuple
+
+# Filas por sentencia INSERT multi-fila (muy por debajo del límite de parámetros)
+BULK_CHUNK_SIZE = 1000
+# Claves por consulta IN (...) al releer o buscar filas (por debajo del límite de parámetros de SQLite)
+_LOOKUP_CHUNK = 5000
+
+class ConcurrentModification(Exception):
+    """Otra petición modificó el Pokémon entre la lectura y la escritura (columna `version`)"""
+
+def _snapshot(db_pokemon: models.Pokemon) -> schemas.PokemonRecord:
+    # Copia desacoplada de la sesión, segura para guardar en caché
+    return schemas.PokemonRecord.model_validate(db_pokemon)
+
+# Pokémon guardados en la caché compartida como JSON de schemas.PokemonRecord
+RECORD_CODEC = Codec(lambda pokemon: pokemon.model_dump_json().encode(), schemas.PokemonRecord.model_validate_json)
+
+# Escritura para invalidar: (id, nombre anterior, nombre vigente o None si se eliminó)
+Write = Tuple[int, Optional[str], Optional[str]]
+
+def invalidate_local(pokemon_id: int, old_name: Optional[str] = None, new_name: Optional[str] = None):
+    """
+    Mantiene al día las estructuras en memoria de este proceso después de una
+    escritura, propia o anunciada por otro nodo a través de `shared_cache`.
+
+    `new_name` es el nombre vigente tras crear/actualizar; si es None el
+    Pokémon fue eliminado.
+    """
+    invalidate_local_many([(pokemon_id, old_name, new_name)])
+
+def invalidate_local_many(writes: List[Write]):
+    """`invalidate_local` para todas las escrituras de una operación masiva, en una pasada"""
+    type_index.invalidate()
+    payload_cache.invalidate()
+    for pokemon_id, old_name, new_name in writes:
+        pokemon_cache.invalidate(pokemon_id=pokemon_id)
+        for name in (old_name, new_name):
+            if name is not None:
+                pokemon_cache.invalidate(name=name)
+        if new_name is not None:
+            name_index.upsert(pokemon_id, new_name)
+        else:
+            name_index.discard(pokemon_id)
+        stat_store.mark_dirty(pokemon_id)
+
+def invalidate_all_local():
+    """Vacía todas las estructuras en memoria de este proceso (tras una importación masiva)"""
+    type_index.invalidate()
+    payload_cache.invalidate()
+    pokemon_cache.clear()
+    name_index.invalidate()
+    stat_store.invalidate()
+
+def apply_invalidation(message: dict):
+    """Aplica en este proceso una invalidación publicada por otro nodo"""
+    if message.get("all"):
+        invalidate_all_local()
+    else:
+        invalidate_local_many([tuple(write) for write in message["writes"]])
+
+def invalidate_everywhere():
+    """Invalida todas las cachés (locales, de los demás nodos y compartida)"""
+    invalidate_all_local()
+    shared_cache.invalidate_all({"all": True})
+
+def _shared_invalidation(writes: List[Write]) -> Tuple[List[str], dict]:
+    # Caché compartida: nuevas versiones para los Pokémon, sus nombres y los
+    # listados, y un solo mensaje con todas las escrituras para los demás nodos
+    namespaces = {"lists": None}
+    for pokemon_id, old_name, new_name in writes:
+        namespaces[f"id:{pokemon_id}"] = None
+        namespaces.update((f"name:{name}", None) for name in (old_name, new_name) if name is not None)
+    return list(namespaces), {"writes": [list(write) for write in writes]}
+
+def _after_writes(writes: List[Write]):
+    if not writes:
+        return
+    invalidate_local_many(writes)
+    shared_cache.invalidate(*_shared_invalidation(writes))
+
+async def _aafter_writes(writes: List[Write]):
+    """`_after_writes` para código asíncrono: la E/S con el backend compartido sale del event loop"""
+    if not writes:
+        return
+    invalidate_local_many(writes)
+    await shared_cache.ainvalidate(*_shared_invalidation(writes))
+
+def _after_write(pokemon_id: int, old_name: Optional[str] = None, new_name: Optional[str] = None):
+    _after_writes([(pokemon_id, old_name, new_name)])
 
 def get_pokemon(db: Session, pokemon_id: int):
-    return db.query(models.Pokemon).filter(models.Pokemon.id == pokemon_id).first()
+    cached = pokemon_cache.get(pokemon_id)
+    if cached is not None:
+        return cached
+    generation = pokemon_cache.generation
+
+    def load():
+        db_pokemon = db.query(models.Pokemon).filter(models.Pokemon.id == pokemon_id).first()
+        return _snapshot(db_pokemon) if db_pokemon is not None else None
+
+    pokemon = shared_cache.get_or_load(f"id:{pokemon_id}", load, RECORD_CODEC, from_replica=is_replica(db))
+    if pokemon is not None:
+        pokemon_cache.set(pokemon, generation)
+    return pokemon
 
 def get_pokemon_by_name(db: Session, name: str):
-    return db.query(models.Pokemon).filter(models.Pokemon.name == name).first()
+    cached = pokemon_cache.get_by_name(name)
+    if cached is not None:
+        return cached
+    generation = pokemon_cache.generation
+
+    def load():
+        db_pokemon = db.query(models.Pokemon).filter(models.Pokemon.name == name).first()
+        return _snapshot(db_pokemon) if db_pokemon is not None else None
+
+    pokemon = shared_cache.get_or_load(f"name:{name}", load, RECORD_CODEC, from_replica=is_replica(db))
+    if pokemon is not None:
+        pokemon_cache.set(pokemon, generation)
+    return pokemon
+
+def _batch_pending(ids: List[int], names: List[str]) -> Tuple[Dict[str, schemas.PokemonRecord], List[str]]:
+    """
+    Claves del lote (`id:25`, `name:Pikachu`) ya presentes en la caché local
+    y las que faltan. Leer `pokemon_cache.generation` antes de llamarla.
+    """
+    found: Dict[str, schemas.PokemonRecord] = {}
+    pending: List[str] = []
+    for key, cached in (
+        *((f"id:{pokemon_id}", pokemon_cache.get(pokemon_id)) for pokemon_id in dict.fromkeys(ids)),
+        *((f"name:{name}", pokemon_cache.get_by_name(name)) for name in dict.fromkeys(names)),
+    ):
+        if cached is not None:
+            found[key] = cached
+        else:
+            pending.append(key)
+    return found, pending
 
-def get_pokemons(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Pokemon).offset(skip).limit(limit).all()
+def _batch_query(keys: List[str]):
+    ids = [int(key[3:]) for key in keys if key.startswith("id:")]
+    names = [key[5:] for key in keys if key.startswith("name:")]
+    conditions = []
+    if ids:
+        conditions.append(models.Pokemon.id.in_(ids))
+    if names:
+        conditions.append(models.Pokemon.name.in_(names))
+    return select(models.Pokemon).where(or_(*conditions))
+
+def _batch_records(db_pokemons, keys: List[str]) -> Dict[str, schemas.PokemonRecord]:
+    wanted = set(keys)
+    records: Dict[str, schemas.PokemonRecord] = {}
+    for db_pokemon in db_pokemons:
+        record = _snapshot(db_pokemon)
+        for key in (f"id:{record.id}", f"name:{record.name}"):
+            if key in wanted:
+                records[key] = record
+    return records
+
+def _batch_result(ids: List[int], names: List[str], found: Dict[str, schemas.PokemonRecord],
+                  loaded: Dict[str, schemas.PokemonRecord], generation: int):
+    for record in loaded.values():
+        pokemon_cache.set(record, generation)
+    found.update(loaded)
+    return [found.get(f"id:{pokemon_id}") for pokemon_id in ids], [found.get(f"name:{name}") for name in names]
+
+def get_pokemons_batch(db: Session, ids: List[int], names: List[str]):
+    """
+    Resuelve varios IDs y nombres a la vez: primero la caché local, luego la
+    caché compartida (dos MGET) y para el resto una sola consulta
+    `WHERE id IN (...) OR name IN (...)`.
+
+    Devuelve dos listas alineadas con `ids` y `names`, con None en las
+    claves que no existen.
+    """
+    generation = pokemon_cache.generation
+    found, pending = _batch_pending(ids, names)
+    loaded = shared_cache.get_many_or_load(
+        pending, lambda keys: _batch_records(db.scalars(_batch_query(keys)), keys), RECORD_CODEC,
+        from_replica=is_replica(db),
+    )
+    return _batch_result(ids, names, found, loaded, generation)
+
+def get_pokemons(db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    query = db.query(models.Pokemon).order_by(models.Pokemon.id)
+    if after_id is not None:
+        # Paginación por cursor: búsqueda sobre la llave primaria, sin OFFSET
+        return query.filter(models.Pokemon.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+# Campos que se pueden pedir con `fields=` en los listados
+LIST_FIELDS = tuple(schemas.Pokemon.model_fields)
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Convierte `name,type1` en las columnas a seleccionar. El `id` se incluye
+    siempre (lo necesitan el cursor y el ETag); None si no se pidió proyección.
+    """
+    if fields is None:
+        return None
+    requested = {part.strip() for part in fields.split(",") if part.strip()}
+    unknown = sorted(requested - set(LIST_FIELDS))
+    if unknown:
+        raise ValueError(f"Campos inválidos: {', '.join(unknown)}. Campos válidos: {', '.join(LIST_FIELDS)}")
+    return ["id"] + [field for field in LIST_FIELDS if field in requested and field != "id"]
+
+def _select_columns(fields: Optional[List[str]]):
+    """SELECT de objetos ORM completos o, si se indican `fields`, de esas columnas"""
+    if fields is None:
+        return select(models.Pokemon)
+    table = models.Pokemon.__table__
+    # La versión va al final: sólo se usa para el ETag
+    return select(*[table.c[field] for field in fields], table.c.version)
+
+def _projection_query(fields: List[str], skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    table = models.Pokemon.__table__
+    query = _select_columns(fields).order_by(table.c.id)
+    if after_id is not None:
+        return query.where(table.c.id > after_id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+def get_pokemon_rows(db: Session, fields: List[str], skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    """Como `get_pokemons`, pero selecciona sólo `fields` y devuelve filas sin crear objetos ORM"""
+    return db.execute(_projection_query(fields, skip, limit, after_id)).all()
+
+def stream_pokemons(db: Session, fields: List[str], batch_size: int = 1000):
+    """Recorre la tabla con un cursor del servidor y entrega lotes de tuplas"""
+    table = models.Pokemon.__table__
+    result = db.execute(
+        select(*[table.c[field] for field in fields])
+        .order_by(table.c.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for partition in result.partitions():
+        yield partition
+
+# Columnas con filtro por rango (min_<campo> / max_<campo>) en /pokemon/search
+RANGE_FIELDS = ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed", "height", "weight")
+SORT_FIELDS = ("id", "name") + RANGE_FIELDS
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, bool]]:
+    """Convierte `-attack,speed` en [("attack", True), ("speed", False)]"""
+    keys: List[Tuple[str, bool]] = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        field = part.lstrip("+-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"No se puede ordenar por '{field}'. Campos válidos: {', '.join(SORT_FIELDS)}")
+        keys.append((field, descending))
+    return keys
+
+def _search_query(
+    pokemon_type: Optional[str] = None,
+    type1: Optional[str] = None,
+    type2: Optional[str] = None,
+    ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    sort: Optional[List[Tuple[str, bool]]] = None,
+):
+    query = select(models.Pokemon)
+    if pokemon_type:
+        query = query.where(_type_filter(pokemon_type))
+    if type1:
+        query = query.where(func.lower(models.Pokemon.type1) == normalize_type(type1))
+    if type2:
+        query = query.where(func.lower(models.Pokemon.type2) == normalize_type(type2))
+    for field, (minimum, maximum) in (ranges or {}).items():
+        column = getattr(models.Pokemon, field)
+        if minimum is not None:
+            query = query.where(column >= minimum)
+        if maximum is not None:
+            query = query.where(column <= maximum)
+    order_by = []
+    for field, descending in sort or []:
+        column = getattr(models.Pokemon, field)
+        order_by.append(column.desc() if descending else column.asc())
+    if all(field != "id" for field, _ in sort or []):
+        # Desempate estable para que la paginación sea determinista; sigue la
+        # dirección del primer campo para poder recorrer el índice (campo, id)
+        descending = bool(sort) and sort[0][1]
+        order_by.append(models.Pokemon.id.desc() if descending else models.Pokemon.id.asc())
+    return query.order_by(*order_by)
+
+def search_pokemons(db: Session, skip: int = 0, limit: int = 100, **criteria):
+    """Filtra por tipo y rangos de estadísticas con ordenamiento multi-campo"""
+    return db.scalars(_search_query(**criteria).offset(skip).limit(limit)).all()
+
+def _name_index_query():
+    return select(models.Pokemon.id, models.Pokemon.name)
+
+def autocomplete_pokemon(db: Session, query: str, limit: int = 10, fuzzy: bool = True):
+    if not name_index.ready:
+        generation = name_index.generation
+        name_index.load(db.execute(_name_index_query()).all(), generation)
+    return name_index.search(query, limit=limit, fuzzy=fuzzy)
 
 def create_pokemon(db: Session, pokemon: schemas.PokemonCreate):
     db_pokemon = models.Pokemon(**pokemon.dict())
     db.add(db_pokemon)
     db.commit()
     db.refresh(db_pokemon)
+    _after_write(db_pokemon.id, new_name=db_pokemon.name)
     return db_pokemon
 
+def _exists_query(pokemon_id: int):
+    return select(models.Pokemon.id).where(models.Pokemon.id == pokemon_id)
+
+def _stale_write(pokemon_id: int, exists: bool):
+    """
+    Resultado de una escritura que falló con StaleDataError: None (404) si
+    otra petición eliminó el Pokémon, ConcurrentModification (409) si lo
+    modificó.
+    """
+    if not exists:
+        return None
+    raise ConcurrentModification(f"El Pokémon con ID {pokemon_id} fue modificado por otra petición; vuelve a intentarlo")
+
 def update_pokemon(db: Session, pokemon_id: int, pokemon: schemas.PokemonUpdate):
     db_pokemon = db.query(models.Pokemon).filter(models.Pokemon.id == pokemon_id).first()
     if db_pokemon:
+        old_name = db_pokemon.name
         update_data = pokemon.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_pokemon, field, value)
-        db.commit()
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            return _stale_write(pokemon_id, db.execute(_exists_query(pokemon_id)).first() is not None)
         db.refresh(db_pokemon)
+        _after_write(pokemon_id, old_name, db_pokemon.name)
     return db_pokemon
 
 def delete_pokemon(db: Session, pokemon_id: int):
     db_pokemon = db.query(models.Pokemon).filter(models.Pokemon.id == pokemon_id).first()
     if db_pokemon:
+        name = db_pokemon.name
         db.delete(db_pokemon)
-        db.commit()
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            return _stale_write(pokemon_id, db.execute(_exists_query(pokemon_id)).first() is not None)
+        _after_write(pokemon_id, old_name=name)
     return db_pokemon
 
-def search_pokemon_by_type(db: Session, pokemon_type: str):
-    return db.query(models.Pokemon).filter(
-        (models.Pokemon.type1 == pokemon_type) | 
-        (models.Pokemon.type2 == pokemon_type)
-    ).all() 
\ No newline at end of file
+def _stat_store_query(ids: Optional[List[int]] = None):
+    table = models.Pokemon.__table__
+    query = select(table.c.id, table.c.type1, table.c.type2, *(table.c[field] for field in STAT_FIELDS))
+    if ids is not None:
+        return query.where(table.c.id.in_(ids))
+    return query.order_by(table.c.id)
+
+def _sync_stat_store(db: Session):
+    """Carga el almacén de estadísticas o relee las filas modificadas desde la última consulta"""
+    if not stat_store.ready:
+        generation = stat_store.generation
+        stat_store.take_dirty()
+        stat_store.load(db.execute(_stat_store_query()).all(), generation)
+        return
+    dirty = stat_store.take_dirty()
+    try:
+        for start in range(0, len(dirty), _LOOKUP_CHUNK):
+            ids = dirty[start:start + _LOOKUP_CHUNK]
+            stat_store.apply(db.execute(_stat_store_query(ids)).all(), ids)
+    except Exception:
+        # Los IDs pendientes ya se olvidaron: se fuerza una carga completa
+        stat_store.invalidate()
+        raise
+
+def _similar_result(neighbours, pokemons) -> List[Tuple[schemas.PokemonRecord, float]]:
+    return [(pokemon, distance) for pokemon, (_, distance) in zip(pokemons, neighbours) if pokemon is not None]
+
+def similar_pokemons(db: Session, pokemon_id: int, k: int = 10, metric: str = "euclidean"):
+    """
+    Los `k` Pokémon con estadísticas más parecidas a las de `pokemon_id`,
+    como (Pokémon, distancia) de más a menos parecido; None si no existe.
+    """
+    _sync_stat_store(db)
+    neighbours = stat_store.similar(pokemon_id, k, metric)
+    if neighbours is None:
+        return None
+    pokemons, _ = get_pokemons_batch(db, [neighbour_id for neighbour_id, _ in neighbours], [])
+    return _similar_result(neighbours, pokemons)
+
+def _leader_ids(summary: dict) -> List[int]:
+    return list({pokemon_id for group in summary["groups"] for pokemon_id, _ in group["leaderboard"]})
+
+def _names_query(ids: List[int]):
+    return select(models.Pokemon.id, models.Pokemon.name).where(models.Pokemon.id.in_(ids))
+
+def _stats_summary_result(summary: dict, names: Dict[int, str]) -> dict:
+    groups = [
+        {**group, "leaderboard": [{"id": pokemon_id, "name": names.get(pokemon_id), "bst": bst}
+                                  for pokemon_id, bst in group["leaderboard"]]}
+        for group in summary["groups"]
+    ]
+    return {"count": summary["count"], "overall": groups[0], "by_type": groups[1:]}
+
+def stats_summary(db: Session, top: int = 10) -> dict:
+    """
+    Media y percentiles de cada estadística y del BST (total de las seis),
+    en todo el catálogo y por tipo, con los `top` Pokémon de mayor BST.
+    """
+    _sync_stat_store(db)
+    summary = stat_store.summary(top)
+    ids = _leader_ids(summary)
+    names = dict(db.execute(_names_query(ids)).all()) if ids else {}
+    return _stats_summary_result(summary, names)
+
+def _nullable(values: np.ndarray) -> list:
+    result = values.astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+def _matchup_result(attackers: List[int], defenders: List[int]) -> dict:
+    count = len(attackers)
+    # Atacantes y defensores se resuelven juntos: una sola búsqueda en el almacén
+    ids = np.array(attackers + defenders, dtype=np.int64)
+    type1, type2, found = stat_store.types(ids, TYPE_CODES)
+    by_type1, by_type2, best = type_matchups(type1[:count], type2[:count], type1[count:], type2[count:])
+    missing = ~(found[:count] & found[count:])
+    for values in (by_type1, by_type2, best):
+        values[missing] = np.nan
+    return {
+        "count": count,
+        "multipliers": _nullable(best),
+        "by_type1": _nullable(by_type1),
+        "by_type2": _nullable(by_type2),
+        "missing_ids": np.unique(ids[~found]).tolist(),
+    }
+
+def matchups(db: Session, attackers: List[int], defenders: List[int]) -> dict:
+    """
+    Multiplicador de daño de `attackers[i]` contra `defenders[i]` para cada
+    par, con los tipos de ambos resueltos desde el almacén de estadísticas
+    y calculados en una sola pasada vectorizada.
+    """
+    _sync_stat_store(db)
+    return _matchup_result(attackers, defenders)
+
+def _weaknesses_result(pokemon) -> dict:
+    return {
+        "id": pokemon.id, "name": pokemon.name, "type1": pokemon.type1, "type2": pokemon.type2,
+        **defense_profile(pokemon.type1, pokemon.type2),
+    }
+
+def pokemon_weaknesses(db: Session, pokemon_id: int) -> Optional[dict]:
+    """Efectividad de cada tipo de ataque contra el Pokémon; None si no existe"""
+    pokemon = get_pokemon(db, pokemon_id)
+    return _weaknesses_result(pokemon) if pokemon is not None else None
+
+def _type_filter(pokemon_type: str):
+    pokemon_type = normalize_type(pokemon_type)
+    return (
+        (func.lower(models.Pokemon.type1) == pokemon_type) |
+        (func.lower(models.Pokemon.type2) == pokemon_type)
+    )
+
+def _type_index_query():
+    return select(models.Pokemon.id, models.Pokemon.type1, models.Pokemon.type2)
+
+def search_pokemon_by_type(
+    db: Session, pokemon_type: str, skip: int = 0, limit: Optional[int] = None, fields: Optional[List[str]] = None
+):
+    """
+    Pokémon del tipo indicado ordenados por ID. Con `fields` devuelve filas
+    con esas columnas (más la versión) en lugar de objetos ORM.
+    """
+    query = _select_columns(fields).order_by(models.Pokemon.id)
+    if not type_index.enabled:
+        query = query.where(_type_filter(pokemon_type)).offset(skip).limit(limit)
+    else:
+        ids = type_index.lookup(pokemon_type)
+        if ids is None:
+            generation = type_index.generation
+            buckets = type_index.rebuild(db.execute(_type_index_query()).all(), generation)
+            ids = buckets.get(normalize_type(pokemon_type), [])
+        page = ids[skip:skip + limit if limit is not None else None]
+        if not page:
+            return []
+        query = query.where(models.Pokemon.id.in_(page))
+    result = db.execute(query)
+    return result.all() if fields is not None else result.scalars().all()
+
+def _insert_ignoring_conflicts(db: Session):
+    table = models.Pokemon.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing(index_elements=["name"])
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing(index_elements=["name"])
+    return None
+
+def bulk_create_pokemons(db: Session, pokemons: List[schemas.PokemonCreate]) -> List[dict]:
+    """
+    Inserta varios Pokémon en una sola transacción con INSERT multi-fila.
+
+    Los nombres que ya existen (o que se repiten dentro del mismo lote) no
+    abortan la operación: se reportan como `conflict` en su posición.
+    """
+    results, writes = _bulk_create(db, pokemons)
+    _after_writes(writes)
+    return results
+
+# Las operaciones masivas devuelven sus escrituras en lugar de invalidar fila
+# por fila: cada lote hace una sola invalidación (ver _after_writes)
+def _bulk_create(db: Session, pokemons: List[schemas.PokemonCreate]) -> Tuple[List[dict], List[Write]]:
+    table = models.Pokemon.__table__
+    results: List[dict] = [None] * len(pokemons)
+    pending: Dict[str, int] = {}
+    for index, pokemon in enumerate(pokemons):
+        if pokemon.name in pending:
+            results[index] = {"index": index, "id": None, "status": "conflict",
+                              "detail": f"Nombre repetido en el lote: '{pokemon.name}'"}
+        else:
+            pending[pokemon.name] = index
+
+    rows = [pokemons[index].model_dump() for index in pending.values()]
+    created: Dict[str, int] = {}
+    stmt = _insert_ignoring_conflicts(db)
+    if stmt is None:
+        # Dialecto sin ON CONFLICT: se descartan primero los nombres existentes
+        existing = set(db.scalars(select(table.c.name).where(table.c.name.in_(list(pending)))))
+        rows = [row for row in rows if row["name"] not in existing]
+        stmt = insert(table)
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_CHUNK_SIZE]
+        if chunk:
+            returned = db.execute(stmt.values(chunk).returning(table.c.id, table.c.name))
+            created.update({name: pokemon_id for pokemon_id, name in returned})
+    db.commit()
+
+    writes: List[Write] = []
+    for name, index in pending.items():
+        if name in created:
+            writes.append((created[name], None, name))
+            results[index] = {"index": index, "id": created[name], "status": "created", "detail": None}
+        else:
+            results[index] = {"index": index, "id": None, "status": "conflict",
+                              "detail": f"El Pokémon '{name}' ya existe en la base de datos"}
+    return results, writes
+
+def bulk_update_pokemons(db: Session, pokemons: List[schemas.PokemonBulkUpdate]) -> List[dict]:
+    """
+    Actualiza varios Pokémon en una sola transacción.
+
+    Los elementos se agrupan por el conjunto de campos enviados y cada grupo
+    se ejecuta como un único UPDATE con executemany.
+    """
+    results, writes = _bulk_update(db, pokemons)
+    _after_writes(writes)
+    return results
+
+def _bulk_update(db: Session, pokemons: List[schemas.PokemonBulkUpdate]) -> Tuple[List[dict], List[Write]]:
+    table = models.Pokemon.__table__
+    ids = [pokemon.id for pokemon in pokemons]
+    old_names = dict(db.execute(select(table.c.id, table.c.name).where(table.c.id.in_(ids))).all())
+
+    results: List[dict] = []
+    groups: Dict[tuple, List[dict]] = {}
+    seen = set()
+    for index, pokemon in enumerate(pokemons):
+        update_data = pokemon.model_dump(exclude_unset=True, exclude={"id"})
+        if pokemon.id not in old_names:
+            status, detail = "not_found", f"No se encontró ningún Pokémon con ID {pokemon.id}"
+        elif pokemon.id in seen:
+            status, detail = "conflict", f"ID repetido en el lote: {pokemon.id}"
+        elif not update_data:
+            status, detail = "unchanged", None
+        else:
+            status, detail = "updated", None
+            groups.setdefault(tuple(sorted(update_data)), []).append(
+                {"b_id": pokemon.id, **{f"b_{field}": value for field, value in update_data.items()}}
+            )
+        seen.add(pokemon.id)
+        results.append({"index": index, "id": pokemon.id, "status": status, "detail": detail})
+
+    for fields, params in groups.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({**{field: bindparam(f"b_{field}") for field in fields}, "version": table.c.version + 1})
+        )
+        db.connection().execute(stmt, params)
+    db.commit()
+
+    writes = [(row["b_id"], old_names[row["b_id"]], row.get("b_name", old_names[row["b_id"]]))
+              for params in groups.values() for row in params]
+    return results, writes
+
+def bulk_delete_pokemons(db: Session, pokemon_ids: List[int]) -> List[dict]:
+    """Elimina varios Pokémon con un único DELETE ... WHERE id IN (...)"""
+    results, writes = _bulk_delete(db, pokemon_ids)
+    _after_writes(writes)
+    return results
+
+def _bulk_delete(db: Session, pokemon_ids: List[int]) -> Tuple[List[dict], List[Write]]:
+    table = models.Pokemon.__table__
+    names = dict(db.execute(select(table.c.id, table.c.name).where(table.c.id.in_(pokemon_ids))).all())
+    if names:
+        db.execute(delete(table).where(table.c.id.in_(list(names))))
+    db.commit()
+
+    results: List[dict] = []
+    writes: List[Write] = []
+    seen = set()
+    for index, pokemon_id in enumerate(pokemon_ids):
+        if pokemon_id not in names:
+            results.append({"index": index, "id": pokemon_id, "status": "not_found",
+                            "detail": f"No se encontró ningún Pokémon con ID {pokemon_id}"})
+        elif pokemon_id in seen:
+            results.append({"index": index, "id": pokemon_id, "status": "conflict",
+                            "detail": f"ID repetido en el lote: {pokemon_id}"})
+        else:
+            writes.append((pokemon_id, names[pokemon_id], None))
+            results.append({"index": index, "id": pokemon_id, "status": "deleted", "detail": None})
+        seen.add(pokemon_id)
+    return results, writes
+
+# Columnas que recibe una importación, en el orden de schemas.PokemonCreate
+IMPORT_FIELDS = tuple(schemas.PokemonCreate.model_fields)
+
+# Tabla temporal de PostgreSQL donde COPY deja cada lote antes de fusionarlo
+_import_staging = Table(
+    "pokemon_import_staging",
+    MetaData(),
+    Column("seq", BigInteger, nullable=False),
+    *(Column(field, models.Pokemon.__table__.c[field].type) for field in IMPORT_FIELDS),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+def _upsert(stmt, on_conflict: str):
+    """ON CONFLICT (name) para un INSERT de PostgreSQL o SQLite"""
+    if on_conflict == "skip":
+        return stmt.on_conflict_do_nothing(index_elements=["name"])
+    table = models.Pokemon.__table__
+    fields = [field for field in IMPORT_FIELDS if field != "name"]
+    # Solo se reescriben (y cambian de versión) las filas con algún valor distinto
+    return stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={**{field: stmt.excluded[field] for field in fields}, "version": table.c.version + 1},
+        where=or_(*(table.c[field].is_distinct_from(stmt.excluded[field]) for field in fields)),
+    )
+
+def _import_rows_copy(db: Session, rows: List[dict], on_conflict: str) -> Tuple[int, int]:
+    table = models.Pokemon.__table__
+    conn = db.connection()
+    _import_staging.create(conn, checkfirst=True)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows((seq, *(row[field] for field in IMPORT_FIELDS)) for seq, row in enumerate(rows))
+    buffer.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_import_staging.name} (seq, {', '.join(IMPORT_FIELDS)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+    finally:
+        cursor.close()
+
+    # Si un nombre se repite en el lote gana la última fila (ON CONFLICT no admite duplicados)
+    source = (
+        select(*(_import_staging.c[field] for field in IMPORT_FIELDS))
+        .distinct(_import_staging.c.name)
+        .order_by(_import_staging.c.name, _import_staging.c.seq.desc())
+    )
+    stmt = _upsert(postgresql.insert(table).from_select(list(IMPORT_FIELDS), source), on_conflict)
+    # xmax = 0 solo en las filas recién insertadas (no en las actualizadas)
+    merged = stmt.returning(literal_column("xmax = 0").label("inserted")).cte("merged")
+    inserted, total = conn.execute(
+        select(func.count().filter(merged.c.inserted), func.count()).select_from(merged)
+    ).one()
+    conn.execute(text(f"TRUNCATE {_import_staging.name}"))
+    return inserted, total - inserted
+
+def _import_rows_executemany(db: Session, rows: List[dict], on_conflict: str, dialect) -> Tuple[int, int]:
+    table = models.Pokemon.__table__
+    # ON CONFLICT no admite el mismo nombre dos veces en un INSERT multi-fila: gana la última fila
+    latest = {row["name"]: row for row in rows}
+    names = list(latest)
+    existing = 0
+    for start in range(0, len(names), _LOOKUP_CHUNK):
+        existing += db.scalar(
+            select(func.count()).select_from(table).where(table.c.name.in_(names[start:start + _LOOKUP_CHUNK]))
+        )
+    result = db.connection().execute(_upsert(dialect.insert(table), on_conflict), list(latest.values()))
+    inserted = len(latest) - existing
+    return inserted, max(result.rowcount - inserted, 0)
+
+def import_rows(db: Session, rows: List[dict], on_conflict: str = "update") -> Tuple[int, int]:
+    """
+    Inserta o actualiza (por nombre) un lote de filas ya validadas, dentro de
+    la transacción en curso; no hace commit ni invalida cachés (ver
+    `invalidate_everywhere`). Devuelve (insertados, actualizados).
+
+    En PostgreSQL el lote se carga con COPY en una tabla temporal y se
+    fusiona con un único INSERT ... SELECT ... ON CONFLICT; en SQLite se usa
+    un INSERT ... ON CONFLICT con executemany. Con `on_conflict="skip"` los
+    nombres existentes no se modifican. Las filas idénticas a las guardadas
+    no se reescriben ni cambian de versión.
+    """
+    if not rows:
+        return 0, 0
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # COPY necesita psycopg2 (cursor.copy_expert); otros drivers usan executemany
+        if db.get_bind().dialect.driver == "psycopg2":
+            return _import_rows_copy(db, rows, on_conflict)
+        return _import_rows_executemany(db, rows, on_conflict, postgresql)
+    if dialect == "sqlite":
+        return _import_rows_executemany(db, rows, on_conflict, sqlite)
+    raise ValueError(f"La importación no está soportada para el dialecto '{dialect}'")
@@ -0,0 +1,252 @@
+"""
+Versiones asíncronas de las operaciones de `crud`.
+
+Cada función acepta una `AsyncSession` (modo DATABASE_ASYNC) o una `Session`
+síncrona; en el segundo caso delega en la función equivalente de `crud`
+dentro del threadpool, de modo que los endpoints `async def` funcionan igual
+en ambos modos.
+"""
+import functools
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, models, schemas
+from .cache import pokemon_cache
+from .database import is_replica
+from .name_index import name_index
+from .shared_cache import shared_cache
+from .stat_store import stat_store
+from .type_index import normalize_type, type_index
+
+
+def _sync_fallback(sync_fn):
+    def decorator(async_fn):
+        @functools.wraps(async_fn)
+        async def wrapper(db, *args, **kwargs):
+            if isinstance(db, AsyncSession):
+                return await async_fn(db, *args, **kwargs)
+            return await run_in_threadpool(sync_fn, db, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _get_by_id(db: AsyncSession, pokemon_id: int):
+    result = await db.execute(select(models.Pokemon).where(models.Pokemon.id == pokemon_id))
+    return result.scalar_one_or_none()
+
+
+@_sync_fallback(crud.get_pokemon)
+async def get_pokemon(db: AsyncSession, pokemon_id: int):
+    cached = pokemon_cache.get(pokemon_id)
+    if cached is not None:
+        return cached
+    generation = pokemon_cache.generation
+
+    async def load():
+        db_pokemon = await _get_by_id(db, pokemon_id)
+        return crud._snapshot(db_pokemon) if db_pokemon is not None else None
+
+    pokemon = await shared_cache.aget_or_load(f"id:{pokemon_id}", load, crud.RECORD_CODEC, from_replica=is_replica(db))
+    if pokemon is not None:
+        pokemon_cache.set(pokemon, generation)
+    return pokemon
+
+
+@_sync_fallback(crud.get_pokemon_by_name)
+async def get_pokemon_by_name(db: AsyncSession, name: str):
+    cached = pokemon_cache.get_by_name(name)
+    if cached is not None:
+        return cached
+    generation = pokemon_cache.generation
+
+    async def load():
+        result = await db.execute(select(models.Pokemon).where(models.Pokemon.name == name))
+        db_pokemon = result.scalar_one_or_none()
+        return crud._snapshot(db_pokemon) if db_pokemon is not None else None
+
+    pokemon = await shared_cache.aget_or_load(f"name:{name}", load, crud.RECORD_CODEC, from_replica=is_replica(db))
+    if pokemon is not None:
+        pokemon_cache.set(pokemon, generation)
+    return pokemon
+
+
+@_sync_fallback(crud.get_pokemons_batch)
+async def get_pokemons_batch(db: AsyncSession, ids, names):
+    generation = pokemon_cache.generation
+    found, pending = crud._batch_pending(ids, names)
+
+    async def load(keys):
+        result = await db.execute(crud._batch_query(keys))
+        return crud._batch_records(result.scalars(), keys)
+
+    loaded = await shared_cache.aget_many_or_load(pending, load, crud.RECORD_CODEC, from_replica=is_replica(db))
+    return crud._batch_result(ids, names, found, loaded, generation)
+
+
+@_sync_fallback(crud.get_pokemons)
+async def get_pokemons(db: AsyncSession, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    query = select(models.Pokemon).order_by(models.Pokemon.id)
+    if after_id is not None:
+        query = query.where(models.Pokemon.id > after_id)
+    else:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit))
+    return result.scalars().all()
+
+
+@_sync_fallback(crud.get_pokemon_rows)
+async def get_pokemon_rows(db: AsyncSession, fields, skip: int = 0, limit: int = 100, after_id: Optional[int] = None):
+    return (await db.execute(crud._projection_query(fields, skip, limit, after_id))).all()
+
+
+@_sync_fallback(crud.search_pokemons)
+async def search_pokemons(db: AsyncSession, skip: int = 0, limit: int = 100, **criteria):
+    result = await db.execute(crud._search_query(**criteria).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+@_sync_fallback(crud.autocomplete_pokemon)
+async def autocomplete_pokemon(db: AsyncSession, query: str, limit: int = 10, fuzzy: bool = True):
+    if not name_index.ready:
+        generation = name_index.generation
+        name_index.load((await db.execute(crud._name_index_query())).all(), generation)
+    return name_index.search(query, limit=limit, fuzzy=fuzzy)
+
+
+async def _sync_stat_store(db: AsyncSession):
+    if not stat_store.ready:
+        generation = stat_store.generation
+        stat_store.take_dirty()
+        stat_store.load((await db.execute(crud._stat_store_query())).all(), generation)
+        return
+    dirty = stat_store.take_dirty()
+    try:
+        for start in range(0, len(dirty), crud._LOOKUP_CHUNK):
+            ids = dirty[start:start + crud._LOOKUP_CHUNK]
+            stat_store.apply((await db.execute(crud._stat_store_query(ids))).all(), ids)
+    except Exception:
+        stat_store.invalidate()
+        raise
+
+
+@_sync_fallback(crud.similar_pokemons)
+async def similar_pokemons(db: AsyncSession, pokemon_id: int, k: int = 10, metric: str = "euclidean"):
+    await _sync_stat_store(db)
+    neighbours = stat_store.similar(pokemon_id, k, metric)
+    if neighbours is None:
+        return None
+    pokemons, _ = await get_pokemons_batch(db, [neighbour_id for neighbour_id, _ in neighbours], [])
+    return crud._similar_result(neighbours, pokemons)
+
+
+@_sync_fallback(crud.stats_summary)
+async def stats_summary(db: AsyncSession, top: int = 10):
+    await _sync_stat_store(db)
+    summary = stat_store.summary(top)
+    ids = crud._leader_ids(summary)
+    names = dict((await db.execute(crud._names_query(ids))).all()) if ids else {}
+    return crud._stats_summary_result(summary, names)
+
+
+@_sync_fallback(crud.matchups)
+async def matchups(db: AsyncSession, attackers, defenders):
+    await _sync_stat_store(db)
+    return crud._matchup_result(attackers, defenders)
+
+
+@_sync_fallback(crud.pokemon_weaknesses)
+async def pokemon_weaknesses(db: AsyncSession, pokemon_id: int):
+    pokemon = await get_pokemon(db, pokemon_id)
+    return crud._weaknesses_result(pokemon) if pokemon is not None else None
+
+
+@_sync_fallback(crud.create_pokemon)
+async def create_pokemon(db: AsyncSession, pokemon: schemas.PokemonCreate):
+    db_pokemon = models.Pokemon(**pokemon.dict())
+    db.add(db_pokemon)
+    await db.commit()
+    await db.refresh(db_pokemon)
+    await crud._aafter_writes([(db_pokemon.id, None, db_pokemon.name)])
+    return db_pokemon
+
+
+@_sync_fallback(crud.update_pokemon)
+async def update_pokemon(db: AsyncSession, pokemon_id: int, pokemon: schemas.PokemonUpdate):
+    db_pokemon = await _get_by_id(db, pokemon_id)
+    if db_pokemon:
+        old_name = db_pokemon.name
+        update_data = pokemon.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_pokemon, field, value)
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            return crud._stale_write(pokemon_id, (await db.execute(crud._exists_query(pokemon_id))).first() is not None)
+        await db.refresh(db_pokemon)
+        await crud._aafter_writes([(pokemon_id, old_name, db_pokemon.name)])
+    return db_pokemon
+
+
+@_sync_fallback(crud.delete_pokemon)
+async def delete_pokemon(db: AsyncSession, pokemon_id: int):
+    db_pokemon = await _get_by_id(db, pokemon_id)
+    if db_pokemon:
+        name = db_pokemon.name
+        await db.delete(db_pokemon)
+        try:
+            await db.commit()
+        except StaleDataError:
+            await db.rollback()
+            return crud._stale_write(pokemon_id, (await db.execute(crud._exists_query(pokemon_id))).first() is not None)
+        await crud._aafter_writes([(pokemon_id, name, None)])
+    return db_pokemon
+
+
+@_sync_fallback(crud.search_pokemon_by_type)
+async def search_pokemon_by_type(
+    db: AsyncSession, pokemon_type: str, skip: int = 0, limit: Optional[int] = None, fields=None
+):
+    query = crud._select_columns(fields).order_by(models.Pokemon.id)
+    if not type_index.enabled:
+        query = query.where(crud._type_filter(pokemon_type)).offset(skip).limit(limit)
+    else:
+        ids = type_index.lookup(pokemon_type)
+        if ids is None:
+            generation = type_index.generation
+            rows = (await db.execute(crud._type_index_query())).all()
+            ids = type_index.rebuild(rows, generation).get(normalize_type(pokemon_type), [])
+        page = ids[skip:skip + limit if limit is not None else None]
+        if not page:
+            return []
+        query = query.where(models.Pokemon.id.in_(page))
+    result = await db.execute(query)
+    return result.all() if fields is not None else result.scalars().all()
+
+
+# Las operaciones masivas usan sentencias Core; en modo asíncrono se ejecutan
+# con run_sync sobre la misma conexión asíncrona. La invalidación queda fuera
+# de run_sync para no bloquear el event loop con el backend compartido.
+@_sync_fallback(crud.bulk_create_pokemons)
+async def bulk_create_pokemons(db: AsyncSession, pokemons):
+    results, writes = await db.run_sync(crud._bulk_create, pokemons)
+    await crud._aafter_writes(writes)
+    return results
+
+
+@_sync_fallback(crud.bulk_update_pokemons)
+async def bulk_update_pokemons(db: AsyncSession, pokemons):
+    results, writes = await db.run_sync(crud._bulk_update, pokemons)
+    await crud._aafter_writes(writes)
+    return results
+
+
+@_sync_fallback(crud.bulk_delete_pokemons)
+async def bulk_delete_pokemons(db: AsyncSession, pokemon_ids):
+    results, writes = await db.run_sync(crud._bulk_delete, pokemon_ids)
+    await crud._aafter_writes(writes)
+    return results
@@ -1,11 +1,179 @@
-from sqlalchemy import create_engine
+import bisect
+import threading
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from .config import (
+    DATABASE_URL, DATABASE_ASYNC, ASYNC_DATABASE_URL, DATABASE_REPLICA_URLS,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, METRICS_ENABLED,
+    SLOW_QUERY_LOG_ENABLED, SLOW_QUERY_THRESHOLD_MS, SLOW_QUERY_EXPLAIN, PROFILING_ENABLED,
+)
+from . import metrics, profiling
 
-engine = create_engine(DATABASE_URL)
+# Drivers asíncronos equivalentes a los drivers síncronos soportados
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Convierte una URL síncrona (psycopg2/pysqlite) en su equivalente asíncrona"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para '{backend}'")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+class PoolMetrics:
+    """Tiempos de espera al obtener conexiones del pool (checkout)"""
+
+    # Límites superiores (ms) del histograma de espera
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.bucket_counts = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+            self.bucket_counts[bisect.bisect_left(self.BUCKETS_MS, wait_ms)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+                "wait_ms_total": round(self.wait_ms_total, 3),
+                "wait_ms_buckets": {
+                    **{str(le): count for le, count in zip(self.BUCKETS_MS, self.bucket_counts)},
+                    "+Inf": self.bucket_counts[-1],
+                },
+            }
+
+class _TimedCheckoutMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - started) * 1000)
+        return conn
+
+def _engine_options(url: str, base_pool, metrics: PoolMetrics) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # SQLite en memoria necesita su propio pool de una sola conexión
+        return options
+    # La métrica vive en la clase para sobrevivir a pool.recreate()
+    options["poolclass"] = type(f"Timed{base_pool.__name__}", (_TimedCheckoutMixin, base_pool), {"metrics": metrics})
+    options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+pool_metrics = {"primary": PoolMetrics()}
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, QueuePool, pool_metrics["primary"]))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _instrument(sync_engine):
+    if METRICS_ENABLED:
+        metrics.instrument_engine(sync_engine)
+    if SLOW_QUERY_LOG_ENABLED or PROFILING_ENABLED:
+        profiling.instrument_engine(
+            sync_engine, SLOW_QUERY_THRESHOLD_MS, explain=SLOW_QUERY_EXPLAIN, log_slow=SLOW_QUERY_LOG_ENABLED
+        )
+
+_instrument(engine)
+
+# Réplicas de solo lectura: un engine (y un pool) por URL, nombrados replica1, replica2...
+replica_engines = {}
+for _number, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    _name = f"replica{_number}"
+    pool_metrics[_name] = PoolMetrics()
+    replica_engines[_name] = create_engine(_url, **_engine_options(_url, QueuePool, pool_metrics[_name]))
+    _instrument(replica_engines[_name])
+# `info["replica"]` marca las sesiones de réplica (ver is_replica)
+ReplicaSessionLocals = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica, info={"replica": True})
+    for replica in replica_engines.values()
+]
+
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engines = {}
+AsyncReplicaSessionLocals = []
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+    pool_metrics["primary_async"] = PoolMetrics()
+    async_engine = create_async_engine(
+        _async_url, **_engine_options(_async_url, AsyncAdaptedQueuePool, pool_metrics["primary_async"])
+    )
+    _instrument(async_engine.sync_engine)
+    # Sin expire_on_commit: en modo asíncrono no se permite recargar atributos de forma implícita
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    for _number, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+        _name, _async_url = f"replica{_number}_async", to_async_url(_url)
+        pool_metrics[_name] = PoolMetrics()
+        async_replica_engines[_name] = create_async_engine(
+            _async_url, **_engine_options(_async_url, AsyncAdaptedQueuePool, pool_metrics[_name])
+        )
+        _instrument(async_replica_engines[_name].sync_engine)
+    AsyncReplicaSessionLocals = [
+        async_sessionmaker(replica, autoflush=False, expire_on_commit=False, info={"replica": True})
+        for replica in async_replica_engines.values()
+    ]
+
+def is_replica(db) -> bool:
+    """True si la sesión (síncrona o asíncrona) lee de una réplica"""
+    return bool(db.info.get("replica"))
+
+def pool_status() -> dict:
+    """Estado actual de cada pool: conexiones en uso, libres y en overflow"""
+    engines = {"primary": engine, **replica_engines}
+    if async_engine is not None:
+        engines["primary_async"] = async_engine.sync_engine
+    engines.update({name: replica.sync_engine for name, replica in async_replica_engines.items()})
+    status = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        entry = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+                timeout_seconds=pool.timeout(),
+            )
+        metrics = pool_metrics.get(name)
+        entry["checkout"] = metrics.snapshot() if metrics else None
+        status[name] = entry
+    return status
+
 Base = declarative_base()
 
 def get_db():
@@ -13,4 +181,11 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependencia usada por los endpoints CRUD: sesión asíncrona o síncrona según DATABASE_ASYNC
+get_session = get_async_db if DATABASE_ASYNC else get_db
@@ -0,0 +1,62 @@
+"""
+Exportación en streaming del catálogo completo (NDJSON o CSV).
+
+Las filas se leen con un cursor del lado del servidor (`stream_results` +
+`yield_per`) y se codifican por lotes, así que la memoria usada no depende del
+tamaño de la tabla y el primer byte se envía en cuanto llega el primer lote.
+"""
+import csv
+import io
+import json
+from typing import Callable, Iterator, Optional
+
+from . import crud, schemas
+from .replicas import read_sessionmaker
+
+# Mismo orden de campos que la respuesta de `schemas.Pokemon`
+EXPORT_FIELDS = list(schemas.Pokemon.model_fields)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _ndjson_chunks(batches) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False, separators=(",", ":")) + "\n"
+            for row in batch
+        ).encode()
+
+
+def _csv_chunks(batches) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_pokemons(fmt: str, batch_size: int = 1000, sessionmaker: Optional[Callable] = None) -> Iterator[bytes]:
+    """
+    Generador de bytes con todo el catálogo en el formato indicado.
+
+    Abre su propia sesión porque se consume después de que el endpoint
+    retorna; la sesión se cierra al terminar o si el cliente se desconecta.
+    `sessionmaker` es la fábrica elegida para la petición con
+    `read_sessionmaker(request)`, para respetar la ventana read-your-writes
+    del cliente; sin ella se usa una réplica si hay configuradas.
+    """
+    db = (sessionmaker or read_sessionmaker())()
+    try:
+        batches = crud.stream_pokemons(db, EXPORT_FIELDS, batch_size=batch_size)
+        chunks = _csv_chunks(batches) if fmt == "csv" else _ndjson_chunks(batches)
+        yield from chunks
+    finally:
+        db.close()
@@ -0,0 +1,51 @@
+"""
+Soporte para peticiones condicionales (ETag / If-None-Match) y Cache-Control.
+
+Los ETag se calculan a partir del `id` y la `version` de cada fila, así que
+comparar no requiere serializar la respuesta: si el cliente ya tiene la
+versión vigente se responde 304 sin cuerpo.
+"""
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+
+from .config import HTTP_CACHE_MAX_AGE
+
+
+def pokemon_etag(pokemon) -> str:
+    return f'"{pokemon.id}.{pokemon.version}"'
+
+
+def list_etag(pokemons: Iterable, variant: str = "") -> str:
+    # `variant` distingue representaciones de la misma página (p. ej. `fields=`)
+    digest = hashlib.sha1(variant.encode())
+    for pokemon in pokemons:
+        digest.update(f"{pokemon.id}.{pokemon.version};".encode())
+    return f'"l-{digest.hexdigest()[:24]}"'
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Agrega ETag y Cache-Control a la respuesta y devuelve una respuesta 304
+    si el cliente ya tiene la representación vigente; si no, devuelve None.
+    """
+    response.headers.update(cache_headers(etag))
+    if _matches(request.headers.get("if-none-match"), etag):
+        # Conserva las cabeceras ya agregadas por el endpoint (p. ej. X-Next-Cursor)
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,242 @@
+"""
+Importación masiva del catálogo desde CSV o NDJSON.
+
+El archivo se lee en streaming y se procesa por lotes de IMPORT_CHUNK_SIZE
+filas: cada lote se valida de una vez con `schemas.PokemonCreate` (un
+TypeAdapter de lista, mucho más rápido que validar fila por fila) y se
+escribe con `crud.import_rows` (COPY en PostgreSQL, executemany en SQLite).
+Los Pokémon se identifican por nombre: los nuevos se insertan y los
+existentes se actualizan (o se dejan como están con `on_conflict="skip"`).
+
+Toda la importación es una sola transacción; al confirmarla se invalidan
+las cachés de todos los nodos de una vez en lugar de fila por fila. Las
+filas inválidas se omiten y se reportan (las primeras IMPORT_MAX_ERRORS);
+con `strict=True` cualquier fila inválida cancela la importación.
+
+Acepta lo que produce `/pokemon/export`: las columnas extra (`id`) se
+ignoran. En CSV una celda vacía equivale a null.
+
+Uso:
+    python -m app.importer pokemon.csv
+    python -m app.importer pokemon.ndjson --on-conflict skip --chunk-size 20000
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.orm import Session
+
+from . import crud, schemas
+from .config import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+logger = logging.getLogger("app.importer")
+
+FORMATS = ("csv", "ndjson")
+ON_CONFLICT = ("update", "skip")
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+_CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+
+_ROWS = TypeAdapter(List[schemas.PokemonCreate])
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class InvalidRecord(str):
+    """Línea que no se pudo decodificar; se reporta como error de su fila"""
+
+
+def detect_format(filename: Optional[str] = None, content_type: Optional[str] = None) -> Optional[str]:
+    """Formato según la extensión del archivo o, si no la hay, su Content-Type"""
+    if filename:
+        for extension, fmt in _EXTENSIONS.items():
+            if filename.lower().endswith(extension):
+                return fmt
+    if content_type:
+        return _CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    return None
+
+
+def _csv_records(stream: BinaryIO) -> Iterator[object]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        for record in csv.DictReader(text):
+            yield {key: (value if value != "" else None) for key, value in record.items() if key is not None}
+    finally:
+        # Evita que el wrapper cierre el archivo original
+        text.detach()
+
+
+def _ndjson_records(stream: BinaryIO) -> Iterator[object]:
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = _json_loads(line)
+        except ValueError as e:
+            yield InvalidRecord(f"JSON inválido: {e}")
+            continue
+        yield record if isinstance(record, dict) else InvalidRecord("Se esperaba un objeto JSON")
+
+
+def read_records(stream: BinaryIO, fmt: str) -> Iterator[object]:
+    """Registros del archivo (dicts, o InvalidRecord si la línea no se pudo leer)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: '{fmt}'")
+    return _csv_records(stream) if fmt == "csv" else _ndjson_records(stream)
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'fila'}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def validate_chunk(records: List[object], first_row: int) -> Tuple[List[dict], List[dict]]:
+    """
+    Valida un lote y devuelve (filas válidas, errores). Si el lote completo
+    no pasa la validación se valida fila por fila para localizar los errores.
+    """
+    if not any(isinstance(record, InvalidRecord) for record in records):
+        try:
+            return _ROWS.dump_python(_ROWS.validate_python(records)), []
+        except ValidationError:
+            pass
+    rows: List[dict] = []
+    errors: List[dict] = []
+    for offset, record in enumerate(records):
+        if isinstance(record, InvalidRecord):
+            errors.append({"row": first_row + offset, "detail": str(record)})
+            continue
+        try:
+            rows.append(schemas.PokemonCreate.model_validate(record).model_dump())
+        except ValidationError as e:
+            errors.append({"row": first_row + offset, "detail": _describe(e)})
+    return rows, errors
+
+
+def _chunks(records: Iterator[object], size: int) -> Iterator[List[object]]:
+    chunk: List[object] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_stream(
+    db: Session,
+    stream: BinaryIO,
+    fmt: str,
+    on_conflict: str = "update",
+    strict: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    max_errors: int = IMPORT_MAX_ERRORS,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Importa el archivo completo en una transacción y devuelve el resumen.
+
+    `progress` se llama después de cada lote con el resumen parcial. Las
+    filas se numeran desde 1 sin contar la cabecera del CSV.
+    """
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict debe ser uno de {', '.join(ON_CONFLICT)}")
+    started = time.perf_counter()
+    summary = {
+        "format": fmt, "on_conflict": on_conflict, "committed": False,
+        "processed": 0, "inserted": 0, "updated": 0, "unchanged": 0, "invalid": 0, "errors": [],
+        "validation_seconds": 0.0, "database_seconds": 0.0, "elapsed_seconds": 0.0, "rows_per_second": 0.0,
+    }
+    try:
+        for chunk in _chunks(read_records(stream, fmt), max(chunk_size, 1)):
+            validating = time.perf_counter()
+            rows, errors = validate_chunk(chunk, summary["processed"] + 1)
+            writing = time.perf_counter()
+            summary["validation_seconds"] += writing - validating
+            summary["processed"] += len(chunk)
+            summary["invalid"] += len(errors)
+            summary["errors"].extend(errors[:max(max_errors - len(summary["errors"]), 0)])
+            # En modo estricto se sigue validando (para reportar los errores) pero ya no se escribe
+            if rows and not (strict and summary["invalid"]):
+                inserted, updated = crud.import_rows(db, rows, on_conflict)
+                summary["inserted"] += inserted
+                summary["updated"] += updated
+            summary["database_seconds"] += time.perf_counter() - writing
+            _finish(summary, started)
+            logger.info("Importación: %d filas procesadas (%d inválidas)", summary["processed"], summary["invalid"])
+            if progress is not None:
+                progress(summary)
+
+        if strict and summary["invalid"]:
+            db.rollback()
+            summary["inserted"] = summary["updated"] = 0
+        else:
+            committing = time.perf_counter()
+            db.commit()
+            summary["database_seconds"] += time.perf_counter() - committing
+            summary["committed"] = True
+            if summary["inserted"] or summary["updated"]:
+                crud.invalidate_everywhere()
+    except Exception:
+        db.rollback()
+        raise
+    summary["validation_seconds"] = round(summary["validation_seconds"], 3)
+    summary["database_seconds"] = round(summary["database_seconds"], 3)
+    return _finish(summary, started)
+
+
+def _finish(summary: dict, started: float) -> dict:
+    written = summary["inserted"] + summary["updated"]
+    summary["unchanged"] = max(summary["processed"] - summary["invalid"] - written, 0)
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["processed"] / elapsed, 1) if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa Pokémon desde un archivo CSV o NDJSON")
+    parser.add_argument("path", help="Archivo a importar ('-' para la entrada estándar)")
+    parser.add_argument("--format", choices=FORMATS, help="Por defecto según la extensión del archivo")
+    parser.add_argument("--on-conflict", choices=ON_CONFLICT, default="update",
+                        help="Qué hacer con los nombres que ya existen")
+    parser.add_argument("--strict", action="store_true", help="Cancelar la importación si hay filas inválidas")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("no se pudo deducir el formato; indique --format")
+
+    def report(summary: dict) -> None:
+        print(f"\r{summary['processed']} filas ({summary['rows_per_second']:.0f} filas/s, "
+              f"{summary['invalid']} inválidas)", end="", file=sys.stderr, flush=True)
+
+    from .database import SessionLocal
+    db = SessionLocal()
+    try:
+        stream = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+        with stream:
+            summary = import_stream(db, stream, fmt, args.on_conflict, args.strict, args.chunk_size, progress=report)
+    finally:
+        db.close()
+    print(file=sys.stderr)
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0 if summary["committed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
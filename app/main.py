@@ -1,12 +1,52 @@
-from fastapi import FastAPI, HTTPException, Depends, Query, Path
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, File, Query, Path, Request, Response, UploadFile
+from fastapi.exception_handlers import http_exception_handler, request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.orm import Session
-from typing import List
-from . import crud, models, schemas
-from .database import SessionLocal, engine, get_db
+from typing import Dict, List, Optional
+from . import crud, crud_async, models, schemas
+from .cache import pokemon_cache
+from .compression import CompressionMiddleware
+from .config import (
+    BULK_MAX_ITEMS, COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, MATCHUP_MAX_PAIRS, METRICS_ENABLED,
+    PROFILER, PROFILING_ENABLED, PROFILING_HEADER, PROFILING_TOKENS,
+)
+from .export import MEDIA_TYPES, export_pokemons
+from .importer import detect_format, import_stream
+from .http_cache import conditional_response, list_etag, pokemon_etag
+from .metrics import MetricsMiddleware, record_exception, registry, render_samples
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+from .profiling import ProfilingMiddleware
+from .replicas import ReadYourWritesMiddleware, get_read_session, read_sessionmaker, router as replica_router
+from .payload_cache import PAYLOAD_CODEC, EncodedPayload, payload_cache, shared_key
+from .serialization import encode_json, encode_rows
+from .shared_cache import shared_cache
+from .type_index import normalize_type
+from .database import (
+    SessionLocal, engine, async_engine, async_replica_engines, get_db, get_session, is_replica, pool_metrics,
+    pool_status, replica_engines,
+)
+
+# El esquema se crea con las migraciones de Alembic (`alembic upgrade head` o
+# `python -m app.server`), no al importar: así cada worker arranca sin consultar la base
 
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Escrituras hechas en otros nodos: vaciar las cachés e índices en memoria de este proceso
+    shared_cache.start(crud.apply_invalidation)
+    yield
+    shared_cache.close()
+    # Apagado ordenado: uvicorn ya esperó las peticiones en curso; se cierran los pools
+    for async_eng in [async_engine, *async_replica_engines.values()]:
+        if async_eng is not None:
+            await async_eng.dispose()
+    for eng in [engine, *replica_engines.values()]:
+        eng.dispose()
 
 app = FastAPI(
+    lifespan=lifespan,
     title="🐉 Pokemon API",
     description="""
     ## API CRUD completa para gestión de Pokémon
@@ -52,9 +92,39 @@ app = FastAPI(
             "name": "search",
             "description": "Funciones de búsqueda y filtrado de Pokémon.",
         },
+        {
+            "name": "matchups",
+            "description": "Efectividad de tipos y enfrentamientos entre Pokémon.",
+        },
+        {
+            "name": "monitoring",
+            "description": "Métricas internas del servicio.",
+        },
     ]
 )
 
+if replica_router.enabled and replica_router.window > 0:
+    app.add_middleware(ReadYourWritesMiddleware, read_only_paths=("/pokemon/batch", "/matchups"))
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+# Se agrega al final para quedar por fuera y medir también la compresión
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, header=PROFILING_HEADER, tokens=PROFILING_TOKENS, profiler=PROFILER)
+
+# Los endpoints convierten cualquier falla en un HTTPException genérico; estos
+# manejadores conservan la excepción original para clasificar el error en /metrics
+@app.exception_handler(StarletteHTTPException)
+async def _http_exception_handler(request: Request, exc: StarletteHTTPException):
+    record_exception(exc)
+    return await http_exception_handler(request, exc)
+
+@app.exception_handler(RequestValidationError)
+async def _validation_exception_handler(request: Request, exc: RequestValidationError):
+    record_exception(exc)
+    return await request_validation_exception_handler(request, exc)
+
 @app.get(
     "/",
     tags=["root"],
@@ -95,9 +165,9 @@ def read_root():
         422: {"description": "Error de validación de datos"}
     }
 )
-def create_pokemon(
+async def create_pokemon(
     pokemon: schemas.PokemonCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     ## Crear un nuevo Pokémon
@@ -117,18 +187,298 @@ def create_pokemon(
     Flying, Psychic, Bug, Rock, Ghost, Dragon, Dark, Steel, Fairy
     """
     try:
-        db_pokemon = crud.get_pokemon_by_name(db, name=pokemon.name)
+        db_pokemon = await crud_async.get_pokemon_by_name(db, name=pokemon.name)
         if db_pokemon:
             raise HTTPException(
                 status_code=400, 
                 detail=f"El Pokémon '{pokemon.name}' ya existe en la base de datos"
             )
-        return crud.create_pokemon(db=db, pokemon=pokemon)
+        return await crud_async.create_pokemon(db=db, pokemon=pokemon)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=400, detail=f"Error al crear Pokémon: {str(e)}")
 
+def _bulk_response(results: List[dict]) -> dict:
+    failed = sum(1 for result in results if result["status"] in ("conflict", "not_found"))
+    return {"total": len(results), "succeeded": len(results) - failed, "failed": failed, "results": results}
+
+def _check_bulk_size(items: list):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote tiene {len(items)} elementos; el máximo permitido es {BULK_MAX_ITEMS}"
+        )
+
+@app.post(
+    "/pokemon/bulk",
+    response_model=schemas.BulkResponse,
+    tags=["pokemon"],
+    summary="Crear varios Pokémon",
+    description="Crea un lote de Pokémon en una sola transacción",
+    responses={
+        200: {"description": "Lote procesado; revisa el estado de cada elemento"},
+        400: {"description": "Error al procesar el lote", "model": schemas.ErrorResponse},
+        413: {"description": "El lote supera el máximo permitido", "model": schemas.ErrorResponse},
+        422: {"description": "Error de validación de datos"}
+    }
+)
+async def bulk_create_pokemons(
+    pokemons: List[schemas.PokemonCreate],
+    db: Session = Depends(get_session)
+):
+    """
+    ## Crear varios Pokémon
+
+    Inserta todos los Pokémon del lote con sentencias `INSERT` multi-fila dentro
+    de una única transacción (`ON CONFLICT DO NOTHING` sobre el nombre).
+
+    Los nombres que ya existen no abortan el lote: se devuelven con estado
+    `conflict` en la misma posición en que se enviaron.
+
+    ### Estados por elemento:
+    - `created`: Pokémon creado (incluye su nuevo `id`)
+    - `conflict`: El nombre ya existe o se repite dentro del lote
+    """
+    _check_bulk_size(pokemons)
+    try:
+        results = await crud_async.bulk_create_pokemons(db, pokemons=pokemons)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error al crear Pokémon: {str(e)}")
+
+@app.put(
+    "/pokemon/bulk",
+    response_model=schemas.BulkResponse,
+    tags=["pokemon"],
+    summary="Actualizar varios Pokémon",
+    description="Actualiza parcialmente un lote de Pokémon en una sola transacción",
+    responses={
+        200: {"description": "Lote procesado; revisa el estado de cada elemento"},
+        400: {"description": "Error al procesar el lote; no se aplicó ningún cambio", "model": schemas.ErrorResponse},
+        413: {"description": "El lote supera el máximo permitido", "model": schemas.ErrorResponse},
+        422: {"description": "Datos inválidos"}
+    }
+)
+async def bulk_update_pokemons(
+    pokemons: List[schemas.PokemonBulkUpdate],
+    db: Session = Depends(get_session)
+):
+    """
+    ## Actualizar varios Pokémon
+
+    Cada elemento incluye el `id` del Pokémon y solo los campos a modificar.
+    Los elementos con los mismos campos se aplican juntos con `executemany`.
+
+    Si algún cambio viola una restricción (por ejemplo, un nombre duplicado),
+    se revierte todo el lote y se responde con 400.
+
+    ### Estados por elemento:
+    - `updated`: Cambios aplicados
+    - `unchanged`: No se envió ningún campo a modificar
+    - `not_found`: No existe un Pokémon con ese ID
+    - `conflict`: El ID se repite dentro del lote
+    """
+    _check_bulk_size(pokemons)
+    try:
+        results = await crud_async.bulk_update_pokemons(db, pokemons=pokemons)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error al actualizar Pokémon: {str(e)}")
+
+@app.post(
+    "/pokemon/bulk/delete",
+    response_model=schemas.BulkResponse,
+    tags=["pokemon"],
+    summary="Eliminar varios Pokémon",
+    description="Elimina un lote de Pokémon por ID en una sola transacción",
+    responses={
+        200: {"description": "Lote procesado; revisa el estado de cada elemento"},
+        413: {"description": "El lote supera el máximo permitido", "model": schemas.ErrorResponse},
+        422: {"description": "Datos inválidos"}
+    }
+)
+async def bulk_delete_pokemons(
+    request: schemas.PokemonBulkDelete,
+    db: Session = Depends(get_session)
+):
+    """
+    ## Eliminar varios Pokémon
+
+    Elimina todos los IDs recibidos con un único `DELETE ... WHERE id IN (...)`.
+
+    ### ⚠️ Advertencia:
+    Esta operación es **irreversible**.
+
+    ### Estados por elemento:
+    - `deleted`: Pokémon eliminado
+    - `not_found`: No existe un Pokémon con ese ID
+    - `conflict`: El ID se repite dentro del lote
+    """
+    _check_bulk_size(request.ids)
+    try:
+        results = await crud_async.bulk_delete_pokemons(db, pokemon_ids=request.ids)
+        return _bulk_response(results)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al eliminar Pokémon: {str(e)}")
+
+@app.post(
+    "/pokemon/batch",
+    response_model=schemas.PokemonBatchResponse,
+    tags=["search"],
+    summary="Obtener varios Pokémon por ID y nombre",
+    description="Obtiene muchos Pokémon por ID y/o nombre en una sola petición",
+    responses={
+        200: {"description": "Lote resuelto; las claves inexistentes se listan en `missing_ids` / `missing_names`"},
+        413: {"description": "El lote supera el máximo permitido", "model": schemas.ErrorResponse},
+        422: {"description": "Datos inválidos"}
+    }
+)
+async def read_pokemons_batch(
+    request: schemas.PokemonBatchRequest,
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Obtener varios Pokémon por ID y nombre
+
+    Reemplaza N llamadas a `GET /pokemon/{id}` o `GET /pokemon/name/{name}`
+    por una sola petición (hasta BULK_MAX_ITEMS claves entre IDs y nombres).
+    Las claves se buscan primero en la caché y el resto con una sola
+    consulta `WHERE id IN (...) OR name IN (...)`.
+
+    ### Respuesta:
+    - `ids` y `names` tienen un elemento por clave pedida, **en el mismo orden** (las repetidas se repiten)
+    - Las claves que no existen aparecen como `null` y se listan en `missing_ids` / `missing_names`; no hacen fallar el lote
+    - Los nombres son exactos (sensibles a mayúsculas/minúsculas), como en `GET /pokemon/name/{name}`
+
+    ### Ejemplo:
+    ```json
+    {"ids": [25, 6, 9999], "names": ["Mewtwo"]}
+    ```
+
+    Es un `POST` solo porque el cuerpo puede tener miles de claves: no modifica datos.
+    """
+    _check_bulk_size(request.ids + request.names)
+    try:
+        by_id, by_name = await crud_async.get_pokemons_batch(db, ids=request.ids, names=request.names)
+        return {
+            "ids": by_id,
+            "names": by_name,
+            "missing_ids": list(dict.fromkeys(key for key, pokemon in zip(request.ids, by_id) if pokemon is None)),
+            "missing_names": list(dict.fromkeys(key for key, pokemon in zip(request.names, by_name) if pokemon is None)),
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al obtener Pokémon: {str(e)}")
+
+@app.post(
+    "/matchups",
+    response_model=schemas.MatchupResponse,
+    tags=["matchups"],
+    summary="Calcular enfrentamientos por lotes",
+    description="Multiplicador de daño de cada atacante contra su defensor según la tabla de tipos",
+    responses={
+        200: {"description": "Enfrentamientos calculados; los IDs inexistentes se listan en `missing_ids`"},
+        413: {"description": "El lote supera el máximo permitido", "model": schemas.ErrorResponse},
+        422: {"description": "Datos inválidos o listas de distinto largo"}
+    }
+)
+async def calculate_matchups(
+    request: schemas.MatchupRequest,
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Calcular enfrentamientos por lotes
+
+    Para cada par `attackers[i]` → `defenders[i]` devuelve el multiplicador
+    de daño de un ataque con los tipos del atacante contra los tipos del
+    defensor (0, 0.25, 0.5, 1, 2 o 4), considerando los dos tipos del
+    defensor. Hasta MATCHUP_MAX_PAIRS pares por petición.
+
+    Los tipos salen del almacén de estadísticas en memoria y la tabla de
+    efectividad (18×18) se construye al arrancar, así que todo el lote se
+    resuelve en una sola operación vectorizada, sin consultas por par.
+
+    ### Respuesta (columnas alineadas con los pares pedidos):
+    - `multipliers`: El mejor de los dos tipos del atacante
+    - `by_type1` / `by_type2`: Con cada tipo del atacante (`by_type2` es null si no tiene tipo secundario)
+    - Si alguno de los dos IDs no existe el par es `null` y el ID se lista en `missing_ids`
+    - Un tipo que no está en la tabla es neutral en el defensor y no cuenta en el atacante
+
+    ### Ejemplo:
+    ```json
+    {"attackers": [25, 6], "defenders": [7, 3]}
+    ```
+
+    Es un `POST` solo porque el cuerpo puede tener miles de pares: no modifica datos.
+    """
+    if len(request.attackers) != len(request.defenders):
+        raise HTTPException(
+            status_code=422,
+            detail=f"attackers ({len(request.attackers)}) y defenders ({len(request.defenders)}) deben tener el mismo largo"
+        )
+    if len(request.attackers) > MATCHUP_MAX_PAIRS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote tiene {len(request.attackers)} pares; el máximo permitido es {MATCHUP_MAX_PAIRS}"
+        )
+    try:
+        result = await crud_async.matchups(db, attackers=request.attackers, defenders=request.defenders)
+        # Las columnas ya son tipos básicos: se codifican directamente, sin pasar por response_model
+        return Response(content=encode_json(result), media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al calcular enfrentamientos: {str(e)}")
+
+@app.post(
+    "/pokemon/import",
+    response_model=schemas.ImportSummary,
+    tags=["pokemon"],
+    summary="Importar Pokémon desde CSV o NDJSON",
+    description="Crea o actualiza Pokémon (por nombre) a partir de un archivo CSV o NDJSON",
+    responses={
+        200: {"description": "Importación confirmada; revisa `invalid` y `errors`"},
+        400: {"description": "No se pudo determinar el formato del archivo", "model": schemas.ErrorResponse},
+        422: {"description": "Parámetros inválidos, o filas inválidas con `strict=true` (se devuelve el resumen en `detail`)"}
+    }
+)
+def import_catalog(
+    file: UploadFile = File(..., description="Archivo CSV (con cabecera) o NDJSON (un objeto por línea)"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Formato del archivo; por defecto según su extensión o Content-Type"),
+    on_conflict: str = Query("update", pattern="^(update|skip)$", description="Nombres existentes: `update` los actualiza, `skip` los deja como están"),
+    strict: bool = Query(False, description="Cancelar toda la importación si alguna fila es inválida"),
+    db: Session = Depends(get_db)
+):
+    """
+    ## Importar Pokémon desde CSV o NDJSON
+
+    Procesa el archivo en streaming y por lotes: cada lote se valida con el
+    mismo esquema que `POST /pokemon/` y se escribe con `COPY` (PostgreSQL)
+    o un `INSERT ... ON CONFLICT` con executemany (SQLite). Toda la
+    importación es una sola transacción y al terminar se invalidan las
+    cachés de todos los nodos.
+
+    ### Reglas:
+    - Los Pokémon se identifican por **nombre**: los nuevos se crean y los existentes se actualizan
+    - Las filas idénticas a las guardadas no cambian de versión (su ETag se mantiene)
+    - Si un nombre se repite en el archivo, gana la última fila
+    - Las filas inválidas se omiten y se reportan en `errors`, salvo con `strict=true`
+    - Acepta los archivos de `GET /pokemon/export` (la columna `id` se ignora)
+
+    ### Ejemplo:
+    ```bash
+    curl -F "file=@pokemon.csv" "http://localhost:8001/pokemon/import?on_conflict=update"
+    ```
+    """
+    fmt = format or detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="No se pudo determinar el formato del archivo; usa ?format=csv o ?format=ndjson")
+    try:
+        summary = import_stream(db, file.file, fmt, on_conflict=on_conflict, strict=strict)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al importar Pokémon: {str(e)}")
+    if not summary["committed"]:
+        raise HTTPException(status_code=422, detail=summary)
+    return summary
+
 @app.get(
     "/pokemon/",
     response_model=List[schemas.Pokemon],
@@ -137,13 +487,18 @@ def create_pokemon(
     description="Obtiene una lista paginada de todos los Pokémon",
     responses={
         200: {"description": "Lista de Pokémon obtenida exitosamente"},
+        400: {"description": "Cursor o campos inválidos", "model": schemas.ErrorResponse},
         422: {"description": "Parámetros de paginación inválidos"}
     }
 )
-def read_pokemons(
+async def read_pokemons(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Número de registros a omitir para paginación"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a devolver"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto en `X-Next-Cursor` por la página anterior"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (el `id` siempre se incluye). Ej: `name,type1,type2,image_url`"),
+    db: Session = Depends(get_read_session)
 ):
     """
     ## Obtener lista de Pokémon
@@ -158,13 +513,252 @@ def read_pokemons(
     - Primeros 10 Pokémon: `skip=0&limit=10`
     - Pokémon 11-20: `skip=10&limit=10`
     - Pokémon 51-100: `skip=50&limit=50`
+
+    ### Paginación por cursor (recomendada para recorrer todo el catálogo):
+    Cada respuesta incluye la cabecera `X-Next-Cursor` cuando puede haber más
+    resultados. Envía ese valor en `cursor` para obtener la página siguiente;
+    el costo de cada página es constante sin importar qué tan profunda sea.
+    Cuando se envía `cursor`, el parámetro `skip` se ignora.
+
+    - Primera página: `limit=100`
+    - Siguientes páginas: `cursor=<X-Next-Cursor>&limit=100`
+
+    ### Proyección de campos:
+    `fields` limita la respuesta a las columnas indicadas; solo esas columnas
+    se leen de la base de datos. Útil para vistas de cuadrícula que no
+    necesitan la descripción:
+
+    - `fields=name,type1,type2,image_url&limit=1000`
     """
     try:
-        pokemons = crud.get_pokemons(db, skip=skip, limit=limit)
-        return pokemons
+        after_id = decode_cursor(cursor) if cursor is not None else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail=f"Cursor inválido: '{cursor}'")
+    try:
+        columns = crud.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Sin `fields` se seleccionan todas las columnas en el orden de schemas.Pokemon
+        variant = ",".join(columns) if columns is not None else ""
+        key = ("list", variant, limit, skip if after_id is None else 0, after_id)
+        payload = payload_cache.get(key)
+        if payload is None:
+            generation = payload_cache.generation
+            columns = columns or list(crud.LIST_FIELDS)
+
+            async def load():
+                rows = await crud_async.get_pokemon_rows(db, columns, skip=skip, limit=limit, after_id=after_id)
+                headers = {"X-Next-Cursor": encode_cursor(rows[-1].id)} if len(rows) == limit else {}
+                # Las tuplas se codifican directamente, sin pasar por response_model
+                return EncodedPayload(encode_rows(rows, columns), list_etag(rows, variant=variant), headers)
+
+            payload = payload_cache.put(
+                key, await shared_cache.aget_or_load(
+                    "lists", load, PAYLOAD_CODEC, key=shared_key(key), from_replica=is_replica(db)
+                ), generation
+            )
+        return payload.response(request, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al obtener Pokémon: {str(e)}")
 
+def _stat_ranges(
+    min_hp: Optional[int] = Query(None, ge=1, description="HP mínimo"),
+    max_hp: Optional[int] = Query(None, ge=1, description="HP máximo"),
+    min_attack: Optional[int] = Query(None, ge=1, description="Ataque mínimo"),
+    max_attack: Optional[int] = Query(None, ge=1, description="Ataque máximo"),
+    min_defense: Optional[int] = Query(None, ge=1, description="Defensa mínima"),
+    max_defense: Optional[int] = Query(None, ge=1, description="Defensa máxima"),
+    min_sp_attack: Optional[int] = Query(None, ge=1, description="Ataque especial mínimo"),
+    max_sp_attack: Optional[int] = Query(None, ge=1, description="Ataque especial máximo"),
+    min_sp_defense: Optional[int] = Query(None, ge=1, description="Defensa especial mínima"),
+    max_sp_defense: Optional[int] = Query(None, ge=1, description="Defensa especial máxima"),
+    min_speed: Optional[int] = Query(None, ge=1, description="Velocidad mínima"),
+    max_speed: Optional[int] = Query(None, ge=1, description="Velocidad máxima"),
+    min_height: Optional[float] = Query(None, gt=0, description="Altura mínima en metros"),
+    max_height: Optional[float] = Query(None, gt=0, description="Altura máxima en metros"),
+    min_weight: Optional[float] = Query(None, gt=0, description="Peso mínimo en kilogramos"),
+    max_weight: Optional[float] = Query(None, gt=0, description="Peso máximo en kilogramos"),
+):
+    values = locals()
+    return {
+        field: (values[f"min_{field}"], values[f"max_{field}"])
+        for field in crud.RANGE_FIELDS
+        if values[f"min_{field}"] is not None or values[f"max_{field}"] is not None
+    }
+
+@app.get(
+    "/pokemon/search",
+    response_model=List[schemas.Pokemon],
+    tags=["search"],
+    summary="Búsqueda avanzada de Pokémon",
+    description="Filtra por tipo y rangos de estadísticas y ordena por varios campos",
+    responses={
+        200: {"description": "Lista de Pokémon que cumplen los filtros (puede estar vacía)"},
+        400: {"description": "Campo de ordenamiento inválido", "model": schemas.ErrorResponse},
+        422: {"description": "Parámetros inválidos"}
+    }
+)
+async def search_pokemons(
+    type: Optional[str] = Query(None, description="Tipo principal o secundario (no distingue mayúsculas)"),
+    type1: Optional[str] = Query(None, description="Tipo principal"),
+    type2: Optional[str] = Query(None, description="Tipo secundario"),
+    sort: Optional[str] = Query(None, description="Campos de orden separados por coma; `-` para descendente. Ej: `-attack,speed`"),
+    skip: int = Query(0, ge=0, description="Número de registros a omitir para paginación"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros a devolver"),
+    ranges: dict = Depends(_stat_ranges),
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Búsqueda avanzada de Pokémon
+
+    Combina filtros de tipo, rangos de estadísticas y ordenamiento por varios
+    campos en una sola consulta, en lugar de descargar el catálogo y filtrar
+    del lado del cliente.
+
+    ### Filtros:
+    - **type**, **type1**, **type2**: Tipos (no distinguen mayúsculas)
+    - **min_<campo>** / **max_<campo>**: Rangos inclusivos para `hp`, `attack`,
+      `defense`, `sp_attack`, `sp_defense`, `speed`, `height` y `weight`
+
+    ### Ordenamiento:
+    `sort` acepta `id`, `name` y los campos anteriores; `-` indica orden
+    descendente. El `id` se usa siempre como desempate.
+
+    ### Ejemplos:
+    - Tipo Water con velocidad mayor a 90, ordenados por ataque:
+      `type=water&min_speed=91&sort=-attack`
+    - Los 10 Pokémon con más HP: `sort=-hp&limit=10`
+    """
+    try:
+        sort_keys = crud.parse_sort(sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return await crud_async.search_pokemons(
+            db, skip=skip, limit=limit,
+            pokemon_type=type, type1=type1, type2=type2, ranges=ranges, sort=sort_keys,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al buscar Pokémon: {str(e)}")
+
+@app.get(
+    "/pokemon/autocomplete",
+    response_model=List[schemas.AutocompleteMatch],
+    tags=["search"],
+    summary="Autocompletar nombres de Pokémon",
+    description="Sugiere nombres por prefijo y, opcionalmente, tolerando errores de tipeo",
+    responses={
+        200: {"description": "Sugerencias ordenadas por relevancia (puede estar vacía)"},
+        422: {"description": "Parámetros inválidos"}
+    }
+)
+async def autocomplete_pokemon(
+    q: str = Query(..., min_length=1, max_length=100, description="Texto escrito por el usuario"),
+    limit: int = Query(10, ge=1, le=50, description="Número máximo de sugerencias"),
+    fuzzy: bool = Query(True, description="Incluir coincidencias aproximadas si faltan resultados por prefijo"),
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Autocompletar nombres de Pokémon
+
+    Las búsquedas se resuelven con un índice en memoria (lista ordenada para
+    prefijos e índice de trigramas para errores de tipeo), sin consultar la
+    base de datos en cada tecla.
+
+    ### Normalización:
+    No distingue mayúsculas, acentos ni puntuación: `mr mi` encuentra
+    `Mr. Mime` y `nidoran` encuentra `Nidoran♀` y `Nidoran♂`.
+
+    ### Ejemplos:
+    - `q=pika` → Pikachu (prefijo)
+    - `q=charzard` → Charizard (aproximada)
+    """
+    try:
+        return await crud_async.autocomplete_pokemon(db, query=q, limit=limit, fuzzy=fuzzy)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al buscar sugerencias: {str(e)}")
+
+@app.get(
+    "/pokemon/stats/summary",
+    response_model=schemas.StatsSummary,
+    tags=["search"],
+    summary="Resumen de estadísticas",
+    description="Medias, percentiles y tabla de mayor BST, en todo el catálogo y por tipo",
+    responses={
+        200: {"description": "Resumen calculado exitosamente"},
+        422: {"description": "Parámetros inválidos"}
+    }
+)
+async def read_stats_summary(
+    top: int = Query(10, ge=1, le=100, description="Pokémon en cada tabla de mayor BST"),
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Resumen de estadísticas
+
+    Agregados de las seis estadísticas de combate (`hp` a `speed`) y del
+    **BST** (su suma), calculados de forma vectorizada sobre un almacén
+    columnar en memoria que se mantiene sincronizado con las escrituras.
+
+    ### Incluye, para todo el catálogo (`overall`) y para cada tipo (`by_type`):
+    - `count`: Número de Pokémon (un Pokémon de dos tipos cuenta en ambos)
+    - `mean`: Media de cada estadística
+    - `percentiles`: p25, p50, p75, p90 y p99 de cada estadística
+    - `leaderboard`: Los `top` Pokémon con mayor BST
+
+    El resultado se calcula una vez por versión de los datos y se reutiliza
+    hasta la siguiente escritura.
+    """
+    try:
+        return await crud_async.stats_summary(db, top=top)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error al calcular el resumen: {str(e)}")
+
+@app.get(
+    "/pokemon/export",
+    tags=["pokemon"],
+    summary="Exportar catálogo completo",
+    description="Descarga todos los Pokémon en streaming como NDJSON o CSV",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Catálogo completo en el formato solicitado",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        },
+        422: {"description": "Formato inválido"}
+    }
+)
+def export_catalog(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Formato de salida: `ndjson` o `csv`"),
+    batch_size: int = Query(1000, ge=100, le=10000, description="Filas leídas de la base de datos por lote")
+):
+    """
+    ## Exportar catálogo completo
+
+    Envía todos los Pokémon ordenados por ID sin pasar por la paginación de
+    `GET /pokemon/`. Las filas se leen con un cursor del servidor y se envían
+    a medida que llegan, así que la memoria del servidor no crece con el
+    tamaño de la tabla.
+
+    ### Formatos:
+    - `ndjson`: Un objeto JSON por línea, con los mismos campos que `GET /pokemon/{id}`
+    - `csv`: Encabezado con los nombres de los campos y una fila por Pokémon
+
+    ### Ejemplo:
+    ```bash
+    curl -N "http://localhost:8001/pokemon/export?format=ndjson" > pokemon.ndjson
+    ```
+    """
+    filename = f"pokemon.{format}"
+    return StreamingResponse(
+        # La sesión se elige ahora, con la cookie read-your-writes de la petición
+        export_pokemons(format, batch_size=batch_size, sessionmaker=read_sessionmaker(request)),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 @app.get(
     "/pokemon/{pokemon_id}",
     response_model=schemas.Pokemon,
@@ -177,9 +771,11 @@ def read_pokemons(
         422: {"description": "ID inválido"}
     }
 )
-def read_pokemon(
+async def read_pokemon(
+    request: Request,
+    response: Response,
     pokemon_id: int = Path(..., ge=1, description="ID único del Pokémon a buscar"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_session)
 ):
     """
     ## Obtener Pokémon por ID
@@ -195,13 +791,13 @@ def read_pokemon(
     - Buscar Charizard: `pokemon_id=6`
     """
     try:
-        db_pokemon = crud.get_pokemon(db, pokemon_id=pokemon_id)
+        db_pokemon = await crud_async.get_pokemon(db, pokemon_id=pokemon_id)
         if db_pokemon is None:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No se encontró ningún Pokémon con ID {pokemon_id}"
             )
-        return db_pokemon
+        return conditional_response(request, response, pokemon_etag(db_pokemon)) or db_pokemon
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -218,9 +814,11 @@ def read_pokemon(
         404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse}
     }
 )
-def read_pokemon_by_name(
+async def read_pokemon_by_name(
+    request: Request,
+    response: Response,
     pokemon_name: str = Path(..., min_length=1, description="Nombre del Pokémon a buscar"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_session)
 ):
     """
     ## Buscar Pokémon por nombre
@@ -240,18 +838,112 @@ def read_pokemon_by_name(
     **Nota**: El nombre debe coincidir exactamente con el almacenado en la base de datos.
     """
     try:
-        db_pokemon = crud.get_pokemon_by_name(db, name=pokemon_name)
+        db_pokemon = await crud_async.get_pokemon_by_name(db, name=pokemon_name)
         if db_pokemon is None:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No se encontró ningún Pokémon con el nombre '{pokemon_name}'"
             )
-        return db_pokemon
+        return conditional_response(request, response, pokemon_etag(db_pokemon)) or db_pokemon
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Error al buscar Pokémon: {str(e)}")
 
+@app.get(
+    "/pokemon/{pokemon_id}/similar",
+    response_model=schemas.SimilarResponse,
+    tags=["search"],
+    summary="Pokémon con estadísticas similares",
+    description="Los k Pokémon cuyas estadísticas de combate más se parecen a las del Pokémon indicado",
+    responses={
+        200: {"description": "Pokémon similares encontrados"},
+        404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse},
+        422: {"description": "Parámetros inválidos"}
+    }
+)
+async def read_similar_pokemon(
+    pokemon_id: int = Path(..., gt=0, description="ID del Pokémon de referencia"),
+    k: int = Query(10, ge=1, le=100, description="Número de Pokémon a devolver"),
+    metric: str = Query("euclidean", pattern="^(euclidean|cosine)$", description="Métrica: `euclidean` o `cosine`"),
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Pokémon con estadísticas similares
+
+    Compara el vector de estadísticas (`hp`, `attack`, `defense`,
+    `sp_attack`, `sp_defense`, `speed`) del Pokémon con el de todo el
+    catálogo en una sola operación vectorizada.
+
+    ### Métricas:
+    - `euclidean`: Distancia euclidiana; parecidos en magnitud y reparto
+    - `cosine`: 1 - similitud coseno; parecidos en el **reparto** de estadísticas sin importar su total (p. ej. un Pokémon y su evolución)
+
+    ### Ejemplo:
+    ```
+    GET /pokemon/25/similar?k=5&metric=cosine
+    ```
+    """
+    try:
+        results = await crud_async.similar_pokemons(db, pokemon_id=pokemon_id, k=k, metric=metric)
+        if results is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No se encontró ningún Pokémon con ID {pokemon_id}"
+            )
+        return {
+            "id": pokemon_id,
+            "metric": metric,
+            "results": [{"pokemon": pokemon, "distance": round(distance, 4)} for pokemon, distance in results],
+        }
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=f"Error al buscar Pokémon similares: {str(e)}")
+
+@app.get(
+    "/pokemon/{pokemon_id}/weaknesses",
+    response_model=schemas.TypeWeaknesses,
+    tags=["matchups"],
+    summary="Debilidades y resistencias de un Pokémon",
+    description="Multiplicador de daño de cada tipo de ataque contra el Pokémon según sus dos tipos",
+    responses={
+        200: {"description": "Tabla de efectividad del Pokémon"},
+        404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse},
+        422: {"description": "ID inválido"}
+    }
+)
+async def read_pokemon_weaknesses(
+    pokemon_id: int = Path(..., gt=0, description="ID del Pokémon"),
+    db: Session = Depends(get_read_session)
+):
+    """
+    ## Debilidades y resistencias de un Pokémon
+
+    Combina la efectividad de los 18 tipos de ataque contra el tipo
+    principal y el secundario del Pokémon (p. ej. `Grass`/`Poison` recibe
+    x0.25 de `Grass`). El resultado se calcula una vez por combinación de
+    tipos y se reutiliza para todos los Pokémon que la comparten.
+
+    ### Respuesta:
+    - `multipliers`: Multiplicador de cada tipo de ataque
+    - `weaknesses`: Tipos con multiplicador mayor a 1, del más al menos efectivo
+    - `resistances`: Tipos con multiplicador entre 0 y 1, del menos al más efectivo
+    - `immunities`: Tipos con multiplicador 0
+    """
+    try:
+        result = await crud_async.pokemon_weaknesses(db, pokemon_id=pokemon_id)
+        if result is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No se encontró ningún Pokémon con ID {pokemon_id}"
+            )
+        return result
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=f"Error al obtener debilidades: {str(e)}")
+
 @app.put(
     "/pokemon/{pokemon_id}",
     response_model=schemas.Pokemon,
@@ -262,13 +954,14 @@ def read_pokemon_by_name(
         200: {"description": "Pokémon actualizado exitosamente"},
         404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse},
         400: {"description": "Error de validación", "model": schemas.ErrorResponse},
+        409: {"description": "Otra petición modificó el Pokémon al mismo tiempo", "model": schemas.ErrorResponse},
         422: {"description": "Datos inválidos"}
     }
 )
-def update_pokemon(
+async def update_pokemon(
     pokemon_id: int = Path(..., ge=1, description="ID del Pokémon a actualizar"),
     pokemon: schemas.PokemonUpdate = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     ## Actualizar Pokémon existente
@@ -296,13 +989,15 @@ def update_pokemon(
     ```
     """
     try:
-        db_pokemon = crud.update_pokemon(db, pokemon_id=pokemon_id, pokemon=pokemon)
+        db_pokemon = await crud_async.update_pokemon(db, pokemon_id=pokemon_id, pokemon=pokemon)
         if db_pokemon is None:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No se encontró ningún Pokémon con ID {pokemon_id}"
             )
         return db_pokemon
+    except crud.ConcurrentModification as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -316,12 +1011,13 @@ def update_pokemon(
     description="Elimina permanentemente un Pokémon de la base de datos",
     responses={
         200: {"description": "Pokémon eliminado exitosamente"},
-        404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse}
+        404: {"description": "Pokémon no encontrado", "model": schemas.ErrorResponse},
+        409: {"description": "Otra petición modificó el Pokémon al mismo tiempo", "model": schemas.ErrorResponse}
     }
 )
-def delete_pokemon(
+async def delete_pokemon(
     pokemon_id: int = Path(..., ge=1, description="ID del Pokémon a eliminar"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_session)
 ):
     """
     ## Eliminar Pokémon
@@ -338,13 +1034,15 @@ def delete_pokemon(
     Devuelve un mensaje de confirmación cuando el Pokémon es eliminado correctamente.
     """
     try:
-        db_pokemon = crud.delete_pokemon(db, pokemon_id=pokemon_id)
+        db_pokemon = await crud_async.delete_pokemon(db, pokemon_id=pokemon_id)
         if db_pokemon is None:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No se encontró ningún Pokémon con ID {pokemon_id}"
             )
         return {"message": f"Pokémon '{db_pokemon.name}' (ID: {pokemon_id}) eliminado correctamente"}
+    except crud.ConcurrentModification as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -361,9 +1059,13 @@ def delete_pokemon(
         404: {"description": "No se encontraron Pokémon del tipo especificado"}
     }
 )
-def search_pokemon_by_type(
-    pokemon_type: str = Path(..., description="Tipo de Pokémon a buscar"),
-    db: Session = Depends(get_db)
+async def search_pokemon_by_type(
+    request: Request,
+    response: Response,
+    pokemon_type: str = Path(..., description="Tipo de Pokémon a buscar (no distingue mayúsculas)"),
+    skip: int = Query(0, ge=0, description="Número de registros a omitir para paginación"),
+    limit: int = Query(1000, ge=1, le=1000, description="Número máximo de registros a devolver"),
+    db: Session = Depends(get_read_session)
 ):
     """
     ## Buscar Pokémon por tipo
@@ -380,18 +1082,167 @@ def search_pokemon_by_type(
     - Buscar tipo `Electric`: Devuelve Pikachu, Raichu, Magnemite, etc.
     - Buscar tipo `Flying`: Devuelve tanto Pokémon Flying primarios como secundarios
     
+    - Buscar tipo `fire`: Igual que `Fire` (no distingue mayúsculas/minúsculas)
+
+    ### Paginación:
+    - **skip**: Número de registros a omitir
+    - **limit**: Número máximo de registros a devolver (máximo 1000)
+
     ### Nota:
     La búsqueda incluye tanto el tipo principal como el secundario del Pokémon.
+    Los resultados se ordenan por ID y se resuelven con un índice en memoria
+    tipo → IDs que se reconstruye después de cada escritura. La respuesta ya
+    codificada (y comprimida) se reutiliza hasta la siguiente escritura.
     """
     try:
-        pokemons = crud.search_pokemon_by_type(db, pokemon_type=pokemon_type)
-        if not pokemons:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No se encontraron Pokémon del tipo '{pokemon_type}'. Verifica que el tipo sea válido."
+        key = ("type", normalize_type(pokemon_type), skip, limit)
+        payload = payload_cache.get(key)
+        if payload is None:
+            generation = payload_cache.generation
+
+            async def load():
+                pokemons = await crud_async.search_pokemon_by_type(
+                    db, pokemon_type=pokemon_type, skip=skip, limit=limit, fields=list(crud.LIST_FIELDS)
+                )
+                if not pokemons and skip == 0:
+                    raise HTTPException(
+                        status_code=404,
+                        detail=f"No se encontraron Pokémon del tipo '{pokemon_type}'. Verifica que el tipo sea válido."
+                    )
+                return EncodedPayload(encode_rows(pokemons, crud.LIST_FIELDS), list_etag(pokemons))
+
+            payload = payload_cache.put(
+                key, await shared_cache.aget_or_load(
+                    "lists", load, PAYLOAD_CODEC, key=shared_key(key), from_replica=is_replica(db)
+                ), generation
             )
-        return pokemons
+        return payload.response(request, response)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
-        raise HTTPException(status_code=500, detail=f"Error al buscar Pokémon por tipo: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error al buscar Pokémon por tipo: {str(e)}")
+
+@app.get(
+    "/cache/stats",
+    response_model=schemas.CacheStats,
+    tags=["monitoring"],
+    summary="Métricas de la caché",
+    description="Devuelve los contadores de aciertos, fallos y expulsiones de la caché de Pokémon"
+)
+def read_cache_stats():
+    """
+    ## Métricas de la caché
+
+    Las lecturas por ID y por nombre pasan por una caché LRU en memoria con
+    expiración (TTL). Las operaciones de creación, actualización y eliminación
+    invalidan las entradas afectadas.
+
+    ### Configuración (variables de entorno):
+    - **CACHE_ENABLED**: Activa o desactiva la caché (por defecto `true`)
+    - **CACHE_MAX_SIZE**: Número máximo de entradas (por defecto `1024`)
+    - **CACHE_TTL_SECONDS**: Tiempo de vida de cada entrada (por defecto `300`)
+
+    **Nota**: La caché es local a cada proceso; con varios workers cada uno
+    mantiene sus propios contadores.
+    """
+    return pokemon_cache.stats()
+
+@app.get(
+    "/pool/stats",
+    response_model=Dict[str, schemas.PoolStatus],
+    tags=["monitoring"],
+    summary="Estado del pool de conexiones",
+    description="Devuelve las conexiones en uso, libres y en overflow, y los tiempos de espera del pool"
+)
+def read_pool_stats():
+    """
+    ## Estado del pool de conexiones
+
+    Útil para dimensionar el pool frente al número de workers de uvicorn:
+    si `checked_out` alcanza `size + max_overflow` y crecen `wait_ms_max` o
+    `timeouts`, las peticiones están esperando conexiones.
+
+    ### Configuración (variables de entorno):
+    - **DB_POOL_SIZE**: Conexiones permanentes por proceso (por defecto `5`)
+    - **DB_MAX_OVERFLOW**: Conexiones extra permitidas en picos (por defecto `10`)
+    - **DB_POOL_TIMEOUT**: Segundos de espera máxima por una conexión (por defecto `30`)
+    - **DB_POOL_RECYCLE**: Segundos tras los cuales se recicla una conexión (por defecto `1800`)
+    - **DB_POOL_PRE_PING**: Verifica la conexión antes de usarla (por defecto `true`)
+
+    **Nota**: Cada worker tiene su propio pool; el total de conexiones hacia
+    PostgreSQL es `workers × (DB_POOL_SIZE + DB_MAX_OVERFLOW)`.
+    """
+    return pool_status()
+
+def _monitoring_metrics():
+    """Estado del pool y de las cachés en el momento de exponer /metrics"""
+    status = pool_status()
+    lines = render_samples(
+        "db_pool_connections", "Conexiones del pool por estado", "gauge", ("pool", "state"),
+        {(name, state): entry[state] for name, entry in status.items()
+         for state in ("checked_out", "idle", "overflow") if entry.get(state) is not None},
+    )
+    snapshots = {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+    lines += render_samples(
+        "db_pool_checkout_timeouts_total", "Esperas por conexión que agotaron DB_POOL_TIMEOUT", "counter", ("pool",),
+        {(name,): snapshot["timeouts"] for name, snapshot in snapshots.items()},
+    )
+    lines += ["# HELP db_pool_checkout_wait_seconds Espera para obtener una conexión del pool",
+              "# TYPE db_pool_checkout_wait_seconds histogram"]
+    for name, snapshot in snapshots.items():
+        cumulative = 0
+        for bound, count in snapshot["wait_ms_buckets"].items():
+            cumulative += count
+            le = bound if bound == "+Inf" else repr(int(bound) / 1000)
+            lines.append(f'db_pool_checkout_wait_seconds_bucket{{pool="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'db_pool_checkout_wait_seconds_sum{{pool="{name}"}} {snapshot["wait_ms_total"] / 1000}')
+        lines.append(f'db_pool_checkout_wait_seconds_count{{pool="{name}"}} {cumulative}')
+    caches = {"pokemon": pokemon_cache.stats(), "payload": payload_cache.stats()}
+    shared = shared_cache.stats()
+    for counter in ("hits", "misses"):
+        lines += render_samples(
+            f"cache_{counter}_total", f"Lecturas de caché ({counter})", "counter", ("cache",),
+            {(name,): stats[counter] for name, stats in [*caches.items(), ("shared", shared)]},
+        )
+    lines += render_samples(
+        "shared_cache_events_total", "Eventos de la caché compartida", "counter", ("event",),
+        {(event,): shared[event] for event in ("coalesced", "errors", "invalidations_received")},
+    )
+    lines += render_samples(
+        "cache_entries", "Entradas almacenadas en caché", "gauge", ("cache",),
+        {(name,): stats["size"] for name, stats in caches.items()},
+    )
+    return lines
+
+registry.add_collector(_monitoring_metrics)
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["monitoring"],
+    summary="Métricas en formato Prometheus",
+    description="Latencia por ruta, peticiones en curso, consultas SQL por petición, errores, pool y cachés"
+)
+def read_metrics():
+    """
+    ## Métricas en formato Prometheus
+
+    Pensado para que Prometheus lo consulte periódicamente (`scrape`).
+
+    ### Métricas principales:
+    - **http_request_duration_seconds**: Histograma de latencia por método y ruta
+    - **http_requests_in_flight**: Peticiones en curso
+    - **http_errors_total**: Errores por ruta, estado y tipo (`validation`,
+      `client`, `database`, `pool_timeout`, `internal`, `unhandled`)
+    - **db_queries_per_request** / **db_time_per_request_seconds**: Consultas
+      SQL y tiempo en base de datos de cada petición
+    - **db_query_duration_seconds**: Duración de cada consulta por operación
+    - **db_pool_*** y **cache_***: Estado del pool de conexiones y de las cachés
+
+    ### Configuración (variables de entorno):
+    - **METRICS_ENABLED**: Activa la instrumentación (por defecto `true`)
+
+    **Nota**: Las métricas son locales a cada proceso; con varios workers
+    Prometheus debe consultar cada uno o agregarlas por instancia.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,302 @@
+"""
+Métricas del servicio en formato de texto de Prometheus.
+
+- Latencia por ruta (histograma) y peticiones en curso, medidas por
+  `MetricsMiddleware` sobre la plantilla de la ruta (`/pokemon/{pokemon_id}`),
+  no sobre la URL, para que el número de series no crezca con los IDs.
+- Número y duración de las consultas SQL por petición, capturados con los
+  eventos `before_cursor_execute` / `after_cursor_execute` del engine.
+- Errores clasificados por tipo (`validation`, `client`, `database`,
+  `pool_timeout`, `internal`, `unhandled`) usando la excepción original que
+  los endpoints envuelven en un HTTPException genérico.
+
+Las métricas son locales a cada proceso, como las de caché y pool.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, exc
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Etiqueta de las peticiones que no coinciden con ninguna ruta (evita una serie por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+# Rutas de Starlette que no dejan la ruta en el scope (documentación de FastAPI, con sus URL por defecto)
+FIXED_ROUTES = frozenset(("/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}" for values, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # etiquetas → [conteos por bucket (no acumulados) + Inf, suma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((values, (list(series[0]), series[1], series[2])) for values, series in self._series.items())
+        lines = self.header()
+        for values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, values, f'le="{_format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render_samples(name: str, help: str, kind: str, labels: Sequence[str], samples: Dict[Tuple, float]) -> List[str]:
+    """Líneas de una métrica cuyos valores se leen al exponerla (colectores)"""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for values, value in samples.items():
+        lines.append(f"{name}{_format_labels(labels, values)} {_format_value(value)}")
+    return lines
+
+
+class Registry:
+    """Métricas propias más colectores que generan líneas al momento de exponerlas"""
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "Peticiones HTTP atendidas", ("method", "route", "status")))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "Latencia de las peticiones HTTP", ("method", "route")))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Peticiones HTTP en curso"))
+http_errors = registry.register(Counter(
+    "http_errors_total", "Respuestas de error clasificadas por tipo", ("route", "status", "kind", "exception")))
+db_queries = registry.register(Histogram(
+    "db_queries_per_request", "Consultas SQL ejecutadas por petición", ("route",), buckets=QUERY_COUNT_BUCKETS))
+db_request_time = registry.register(Histogram(
+    "db_time_per_request_seconds", "Tiempo total en consultas SQL por petición", ("route",)))
+db_query_latency = registry.register(Histogram(
+    "db_query_duration_seconds", "Duración de cada consulta SQL", ("operation",)))
+db_errors = registry.register(Counter(
+    "db_errors_total", "Consultas SQL que terminaron en error", ("operation", "exception")))
+
+
+class RequestMetrics:
+    """Acumulador de la petición en curso (consultas SQL y error original)"""
+
+    __slots__ = ("queries", "query_seconds", "exception")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.exception: Optional[BaseException] = None
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def record_exception(error: BaseException) -> None:
+    """
+    Guarda la causa de un error de la petición en curso. Los endpoints lanzan
+    HTTPException dentro de `except Exception`, así que la excepción original
+    queda en `__context__`.
+    """
+    current = _current.get()
+    if current is not None:
+        current.exception = error.__cause__ or error.__context__ or error
+
+
+def classify_error(status: int, error: Optional[BaseException]) -> str:
+    if status == 422:
+        return "validation"
+    if isinstance(error, exc.TimeoutError):
+        return "pool_timeout"
+    if isinstance(error, exc.SQLAlchemyError):
+        return "database"
+    if status >= 500:
+        return "internal"
+    return "client"
+
+
+_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+def _operation(statement: str) -> str:
+    # Las sentencias compiladas por SQLAlchemy empiezan con la palabra clave
+    word = statement[:6].upper()
+    return word if word in _OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine) -> None:
+    """Registra los eventos que miden cada consulta ejecutada por `engine`"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # `context` es None en sentencias internas (p. ej. secuencias); no se miden
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        db_query_latency.observe(elapsed, _operation(statement))
+        current = _current.get()
+        if current is not None:
+            current.queries += 1
+            current.query_seconds += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        db_errors.inc(_operation(context.statement or ""), type(context.original_exception).__name__)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide cada petición HTTP"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        current = RequestMetrics()
+        token = _current.set(current)
+        status = 500
+        started = time.perf_counter()
+        http_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        unhandled = False
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as error:
+            current.exception = error
+            unhandled = True
+            raise
+        finally:
+            http_in_flight.dec()
+            _current.reset(token)
+            route = _route_label(scope)
+            method = scope["method"]
+            http_latency.observe(time.perf_counter() - started, method, route)
+            http_requests.inc(method, route, str(status))
+            db_queries.observe(current.queries, route)
+            db_request_time.observe(current.query_seconds, route)
+            if status >= 400:
+                error = current.exception
+                kind = "unhandled" if unhandled else classify_error(status, error)
+                http_errors.inc(route, str(status), kind, type(error).__name__ if error is not None else "")
+
+
+def _route_label(scope: Scope) -> str:
+    # FastAPI deja la ruta en el scope después del enrutamiento; las rutas de
+    # Starlette (docs, openapi) no, pero su ruta es fija. Cualquier otra ruta
+    # sin coincidencia (404, redirecciones por la barra final...) comparte una
+    # sola etiqueta: la URL la elige el cliente
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return scope["path"] if scope["path"] in FIXED_ROUTES else UNMATCHED_ROUTE
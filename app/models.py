@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, Integer, String, Float, Index, func
 from .database import Base
 
 class Pokemon(Base):
@@ -17,4 +17,21 @@ class Pokemon(Base):
     height = Column(Float, nullable=False)  # en metros
     weight = Column(Float, nullable=False)  # en kg
     description = Column(String, nullable=True)
-    image_url = Column(String, nullable=True)  # URL de la imagen del Pokémon 
\ No newline at end of file
+    image_url = Column(String, nullable=True)  # URL de la imagen del Pokémon
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # se incrementa en cada UPDATE
+
+    # El ORM incrementa `version` en cada UPDATE (y lo usa como control de concurrencia optimista)
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # Búsqueda por tipo sin distinguir mayúsculas (lower(type) = :tipo)
+        Index("ix_pokemon_type1_lower", func.lower(type1)),
+        Index("ix_pokemon_type2_lower", func.lower(type2)),
+        # Filtros por rango y ordenamiento en /pokemon/search (el id desempata)
+        Index("ix_pokemon_hp_id", hp, id),
+        Index("ix_pokemon_attack_id", attack, id),
+        Index("ix_pokemon_defense_id", defense, id),
+        Index("ix_pokemon_sp_attack_id", sp_attack, id),
+        Index("ix_pokemon_sp_defense_id", sp_defense, id),
+        Index("ix_pokemon_speed_id", speed, id),
+    )
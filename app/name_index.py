@@ -0,0 +1,175 @@
+import bisect
+import math
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .config import NAME_INDEX_TTL_SECONDS
+
+# Símbolos que forman parte del nombre y distinguen especies (Nidoran♀ / Nidoran♂)
+_KEPT_SYMBOLS = "♀♂"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Clave de búsqueda: sin acentos, sin mayúsculas y sin puntuación.
+
+    `Mr. Mime` → `mrmime`, `Flabébé` → `flabebe`, `Nidoran♀` → `nidoran♀`.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return "".join(
+        ch for ch in decomposed
+        if not unicodedata.combining(ch) and (ch.isalnum() or ch in _KEPT_SYMBOLS)
+    )
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Índice en memoria de nombres para autocompletado.
+
+    Combina una lista ordenada de claves (búsqueda por prefijo con bisect) y
+    un índice invertido de trigramas (coincidencias con errores de tipeo).
+    Se carga una vez desde la base de datos y luego se actualiza de forma
+    incremental en cada escritura de `crud`; el TTL obliga a recargarlo para
+    recoger cambios hechos por otros procesos.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._sorted: List[Tuple[str, int]] = []
+        # id → (nombre original, clave normalizada, número de trigramas)
+        self._names: Dict[int, Tuple[str, str, int]] = {}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._loaded_at: Optional[float] = None
+        self._stale = False
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None or self._stale:
+                return False
+            return time.monotonic() - self._loaded_at <= self.ttl
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def load(self, rows: Iterable[Tuple[int, str]], generation: int) -> None:
+        """Reconstruye el índice con filas (id, name) leídas en la generación indicada"""
+        with self._lock:
+            self._sorted = []
+            self._names = {}
+            self._postings = defaultdict(set)
+            for pokemon_id, name in rows:
+                self._add_locked(pokemon_id, name, keep_sorted=False)
+            self._sorted.sort()
+            self._loaded_at = time.monotonic()
+            # Si hubo escrituras durante la lectura, se usará ahora pero se recargará después
+            self._stale = generation != self._generation
+
+    def upsert(self, pokemon_id: int, name: str) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is None:
+                return
+            self._remove_locked(pokemon_id)
+            self._add_locked(pokemon_id, name)
+
+    def discard(self, pokemon_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._loaded_at is None:
+                return
+            self._remove_locked(pokemon_id)
+
+    def invalidate(self) -> None:
+        """Obliga a recargar el índice en la siguiente búsqueda (p. ej. tras una importación)"""
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def _add_locked(self, pokemon_id: int, name: str, keep_sorted: bool = True) -> None:
+        key = normalize_name(name)
+        grams = trigrams(key)
+        self._names[pokemon_id] = (name, key, len(grams))
+        if keep_sorted:
+            bisect.insort(self._sorted, (key, pokemon_id))
+        else:
+            self._sorted.append((key, pokemon_id))
+        for gram in grams:
+            self._postings[gram].add(pokemon_id)
+
+    def _remove_locked(self, pokemon_id: int) -> None:
+        entry = self._names.pop(pokemon_id, None)
+        if entry is None:
+            return
+        key = entry[1]
+        position = bisect.bisect_left(self._sorted, (key, pokemon_id))
+        if position < len(self._sorted) and self._sorted[position] == (key, pokemon_id):
+            del self._sorted[position]
+        for gram in trigrams(key):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(pokemon_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True, min_score: float = 0.3) -> List[dict]:
+        """
+        Coincidencias por prefijo (score 1.0, en orden alfabético) seguidas,
+        si faltan resultados, de coincidencias aproximadas por similitud de
+        trigramas (Jaccard) de mayor a menor.
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+        with self._lock:
+            results: List[dict] = []
+            seen: Set[int] = set()
+            position = bisect.bisect_left(self._sorted, (key, -1))
+            while position < len(self._sorted) and len(results) < limit:
+                entry_key, pokemon_id = self._sorted[position]
+                if not entry_key.startswith(key):
+                    break
+                results.append(self._match(pokemon_id, 1.0, "prefix"))
+                seen.add(pokemon_id)
+                position += 1
+            if not fuzzy or len(results) >= limit:
+                return results
+
+            query_grams = trigrams(key)
+            postings = sorted((self._postings.get(gram, set()) for gram in query_grams), key=len)
+            # Jaccard >= min_score exige compartir al menos ceil(min_score * |q|)
+            # trigramas, así que todo candidato aparece en alguna de las
+            # |q| - mínimo + 1 listas más cortas (filtrado por prefijo)
+            required = max(1, math.ceil(min_score * len(query_grams)))
+            candidates: Set[int] = set().union(*postings[:len(postings) - required + 1]) - seen
+            scored = []
+            for pokemon_id in candidates:
+                common = sum(1 for ids in postings if pokemon_id in ids)
+                _, candidate_key, candidate_grams = self._names[pokemon_id]
+                score = common / (len(query_grams) + candidate_grams - common)
+                if score >= min_score:
+                    scored.append((-score, candidate_key, pokemon_id))
+            scored.sort()
+            for negative_score, _, pokemon_id in scored[:limit - len(results)]:
+                results.append(self._match(pokemon_id, round(-negative_score, 3), "fuzzy"))
+            return results
+
+    def _match(self, pokemon_id: int, score: float, match: str) -> dict:
+        return {"id": pokemon_id, "name": self._names[pokemon_id][0], "score": score, "match": match}
+
+
+name_index = NameIndex(ttl=NAME_INDEX_TTL_SECONDS)
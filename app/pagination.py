@@ -0,0 +1,33 @@
+import base64
+import binascii
+
+# Prefijo de versión: permite cambiar el formato del cursor sin romper clientes
+_CURSOR_PREFIX = "v1:"
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no tiene un formato válido"""
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codifica el último ID entregado como un cursor opaco (base64 url-safe)"""
+    raw = f"{_CURSOR_PREFIX}{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Devuelve el último ID contenido en el cursor o lanza `InvalidCursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not raw.startswith(_CURSOR_PREFIX):
+        raise InvalidCursor(cursor)
+    try:
+        last_id = int(raw[len(_CURSOR_PREFIX):])
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if last_id < 0:
+        raise InvalidCursor(cursor)
+    return last_id
@@ -0,0 +1,144 @@
+"""
+Caché de cuerpos JSON ya codificados para los listados más consultados.
+
+Cada entrada guarda los bytes de la respuesta, su ETag y las cabeceras
+propias del listado (p. ej. X-Next-Cursor); las versiones comprimidas se
+generan la primera vez que un cliente las pide y se reutilizan. Una
+petición que acierta no consulta la base de datos ni vuelve a serializar.
+
+Toda escritura de `crud` vacía la caché; el TTL acota cuánto tiempo puede
+quedar desactualizada cuando la escritura ocurre en otro proceso.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+
+from .compression import is_compressible, mark_encoded, negotiate
+from .config import COMPRESSION_ENABLED, COMPRESSION_MIN_SIZE, PAYLOAD_CACHE_MAX_ENTRIES, PAYLOAD_CACHE_TTL_SECONDS
+from .http_cache import conditional_response
+from .shared_cache import Codec
+
+
+class EncodedPayload:
+    def __init__(self, body: bytes, etag: str, headers: Optional[Dict[str, str]] = None,
+                 media_type: str = "application/json"):
+        self.body = body
+        self.etag = etag
+        self.headers = headers or {}
+        self.media_type = media_type
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, codec) -> bytes:
+        """Cuerpo comprimido con `codec`, calculado una sola vez"""
+        body = self._encoded.get(codec.name)
+        if body is None:
+            with self._lock:
+                body = self._encoded.get(codec.name)
+                if body is None:
+                    body = self._encoded[codec.name] = codec.compress(self.body, static=True)
+        return body
+
+    def to_bytes(self) -> bytes:
+        """Serialización para la caché compartida: metadatos JSON, salto de línea y cuerpo"""
+        meta = {"etag": self.etag, "headers": self.headers, "media_type": self.media_type}
+        return json.dumps(meta, separators=(",", ":")).encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EncodedPayload":
+        meta, _, body = data.partition(b"\n")
+        return cls(body, **json.loads(meta))
+
+    def response(self, request: Request, response: Response) -> Response:
+        """304, respuesta comprimida según Accept-Encoding o el cuerpo tal cual"""
+        response.headers.update(self.headers)
+        not_modified = conditional_response(request, response, self.etag)
+        if not_modified is not None:
+            return not_modified
+        headers = MutableHeaders(headers=dict(response.headers))
+        body = self.body
+        codec = negotiate(request.headers.get("accept-encoding")) if COMPRESSION_ENABLED else None
+        if codec is not None and is_compressible(self.media_type) and len(body) >= COMPRESSION_MIN_SIZE:
+            body = self.encoded(codec)
+            mark_encoded(headers, codec)
+        return Response(content=body, media_type=self.media_type, headers=dict(headers))
+
+
+# Listados guardados en la caché compartida
+PAYLOAD_CODEC = Codec(EncodedPayload.to_bytes, EncodedPayload.from_bytes)
+
+
+def shared_key(key: tuple) -> str:
+    """Clave de texto para la caché compartida a partir de la clave local"""
+    return "|".join("" if part is None else str(part) for part in key)
+
+
+class PayloadCache:
+    """LRU con TTL de `EncodedPayload` por clave (ruta y parámetros normalizados)"""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = max_entries > 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[EncodedPayload]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, payload: EncodedPayload, generation: int) -> EncodedPayload:
+        """
+        Guarda `payload` si no hubo escrituras desde `generation` (leída antes
+        de consultar la base de datos). Devuelve el mismo payload para usarlo
+        de inmediato.
+        """
+        if not self.enabled:
+            return payload
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, payload)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+payload_cache = PayloadCache(max_entries=PAYLOAD_CACHE_MAX_ENTRIES, ttl=PAYLOAD_CACHE_TTL_SECONDS)
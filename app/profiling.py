@@ -0,0 +1,208 @@
+"""
+Herramientas de diagnóstico de latencia, desactivadas por defecto.
+
+- Registro de consultas lentas: toda sentencia que tarde más de
+  SLOW_QUERY_THRESHOLD_MS se escribe en el logger `app.slow_query` junto con
+  su plan (EXPLAIN), para distinguir un índice faltante de otras causas.
+- Perfil de una petición: si la petición trae PROFILING_HEADER con uno de
+  los PROFILING_TOKENS, la respuesta se reemplaza por un informe en texto
+  con el tiempo total, cada consulta SQL ejecutada (un N+1 se ve como
+  muchas consultas parecidas) y el perfil de pyinstrument o cProfile.
+
+El perfilador cubre el hilo del event loop (enrutamiento, validación y
+serialización); el trabajo que corre en el threadpool aparece como espera,
+pero sus consultas SQL sí se listan.
+"""
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # pragma: no cover - dependencia opcional
+    Profiler = None
+
+logger = logging.getLogger("app.slow_query")
+
+# Prefijo de EXPLAIN por dialecto (sin ANALYZE: no vuelve a ejecutar la sentencia)
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN ",
+}
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+# Dialectos donde un error aborta la transacción en curso: EXPLAIN va dentro de un SAVEPOINT
+_SAVEPOINT_DIALECTS = ("postgresql",)
+_SAVEPOINT = "profiling_explain"
+# Longitud máxima de una sentencia en el informe de perfil
+_STATEMENT_PREVIEW = 300
+
+# Consultas (sentencia, ms) de la petición que se está perfilando
+_profiled_queries: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("profiled_queries", default=None)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None or not statement.lstrip()[:6].upper().startswith(_EXPLAINABLE):
+        return "(EXPLAIN no disponible para esta sentencia)"
+    # Cursor DBAPI directo: no dispara de nuevo los eventos del engine. Corre en
+    # la transacción de la petición, así que si falla no debe dejarla abortada
+    savepoint = conn.dialect.name in _SAVEPOINT_DIALECTS and conn.in_transaction()
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return "\n".join(" | ".join(str(column) for column in row) for row in cursor.fetchall())
+        except Exception:
+            if savepoint:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_SAVEPOINT}")
+            raise
+        finally:
+            if savepoint:
+                cursor.execute(f"RELEASE SAVEPOINT {_SAVEPOINT}")
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine, threshold_ms: float, explain: bool = True, log_slow: bool = True) -> None:
+    """
+    Mide cada sentencia de `engine`: registra las que superan `threshold_ms`
+    (si `log_slow`) y las agrega al informe de la petición perfilada.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._profiling_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_profiling_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        queries = _profiled_queries.get()
+        if queries is not None:
+            queries.append((statement, elapsed_ms))
+        if not log_slow or elapsed_ms < threshold_ms:
+            return
+        plan = ""
+        if explain and not executemany:
+            try:
+                plan = _explain(conn, statement, parameters)
+            except Exception as e:
+                plan = f"(EXPLAIN falló: {e})"
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s\nParámetros: %r\nPlan:\n%s",
+            elapsed_ms, statement, parameters if not executemany else f"{len(parameters)} filas", plan,
+        )
+
+
+def _profiler_kind(preference: str) -> str:
+    if preference == "pyinstrument" or (preference == "auto" and Profiler is not None):
+        if Profiler is None:
+            raise RuntimeError("PROFILER=pyinstrument requiere instalar pyinstrument")
+        return "pyinstrument"
+    return "cprofile"
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila las peticiones autorizadas y devuelve el
+    informe en lugar del cuerpo original (el estado original va en
+    `X-Profiled-Status`).
+    """
+
+    def __init__(self, app: ASGIApp, header: str, tokens: Sequence[str], profiler: str = "auto"):
+        self.app = app
+        self.header = header.lower()
+        self.tokens = [token.encode() for token in tokens]
+        self.profiler = _profiler_kind(profiler)
+
+    def _authorized(self, scope: Scope) -> bool:
+        value = Headers(scope=scope).get(self.header)
+        if not value or not self.tokens:
+            return False
+        return any(hmac.compare_digest(value.encode(), token) for token in self.tokens)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._authorized(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        body_size = 0
+
+        async def discard(message: Message) -> None:
+            nonlocal status, body_size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+
+        queries: List[Tuple[str, float]] = []
+        token = _profiled_queries.set(queries)
+        started = time.perf_counter()
+        if self.profiler == "pyinstrument":
+            profiler = Profiler(interval=0.0005, async_mode="enabled")
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            if self.profiler == "pyinstrument":
+                profiler.stop()
+            else:
+                profiler.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            _profiled_queries.reset(token)
+
+        report = self._report(scope, status, body_size, elapsed_ms, queries, profiler).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(report)).encode()),
+                (b"cache-control", b"no-store"),
+                (b"x-profiled-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": report})
+
+    def _report(self, scope: Scope, status: int, body_size: int, elapsed_ms: float,
+                queries: List[Tuple[str, float]], profiler) -> str:
+        path = scope["path"] + (f"?{scope['query_string'].decode()}" if scope.get("query_string") else "")
+        sql_ms = sum(ms for _, ms in queries)
+        lines = [
+            f"Perfil de {scope['method']} {path}",
+            f"Estado: {status} | Cuerpo: {body_size} bytes | Total: {elapsed_ms:.1f} ms",
+            f"SQL: {len(queries)} consultas, {sql_ms:.1f} ms ({sql_ms / max(elapsed_ms, 1e-9):.0%} del total)",
+            "",
+        ]
+        for statement, ms in queries:
+            preview = " ".join(statement.split())
+            if len(preview) > _STATEMENT_PREVIEW:
+                preview = preview[:_STATEMENT_PREVIEW] + "..."
+            lines.append(f"  {ms:8.2f} ms  {preview}")
+        lines.append("")
+        if self.profiler == "pyinstrument":
+            lines.append(profiler.output_text(unicode=True, color=False))
+        else:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(40)
+            lines.append(output.getvalue())
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+"""
+Enrutamiento de lecturas a réplicas de solo lectura.
+
+Con DATABASE_REPLICA_URLS configurado, los endpoints de lectura reciben una
+sesión de `get_read_session`, que reparte las consultas entre las réplicas
+en round-robin; las escrituras siguen usando `get_session` (primario).
+
+Ventana read-your-writes (READ_YOUR_WRITES_SECONDS > 0): después de una
+escritura exitosa las lecturas van al primario durante la ventana, para no
+leer de una réplica que todavía no recibió el cambio. Se aplica en dos
+niveles:
+
+- Por cliente: la respuesta a la escritura incluye la cookie
+  `READ_YOUR_WRITES_COOKIE` con el instante en que vence la ventana, que
+  cualquier worker respeta.
+- Por proceso: el worker que atendió la escritura también lee del primario
+  durante la ventana, así sus cachés en memoria (vaciadas por la escritura)
+  no se vuelven a llenar con datos de una réplica atrasada.
+"""
+import itertools
+import math
+import time
+from typing import Iterable, Optional
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import DATABASE_ASYNC, READ_YOUR_WRITES_SECONDS
+from .database import AsyncReplicaSessionLocals, AsyncSessionLocal, ReplicaSessionLocals, SessionLocal
+
+READ_YOUR_WRITES_COOKIE = "pokemon_primary_until"
+_READ_ONLY_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class ReplicaRouter:
+    """Elige el destino de cada lectura: una réplica en round-robin o el primario"""
+
+    def __init__(self, replicas: int, window: float = 0.0):
+        self.replicas = replicas
+        self.window = window
+        self._next = itertools.count()
+        self._last_write = float("-inf")
+
+    @property
+    def enabled(self) -> bool:
+        return self.replicas > 0
+
+    def record_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    def primary_until(self) -> float:
+        """Instante (epoch) hasta el que un cliente que acaba de escribir debe leer del primario"""
+        return time.time() + self.window
+
+    def choose(self, client_primary_until: Optional[float] = None) -> Optional[int]:
+        """Índice de la réplica a usar, o None para leer del primario"""
+        if not self.replicas:
+            return None
+        if self.window > 0:
+            if time.monotonic() - self._last_write < self.window:
+                return None
+            if client_primary_until is not None and client_primary_until > time.time():
+                return None
+        return next(self._next) % self.replicas
+
+
+router = ReplicaRouter(len(ReplicaSessionLocals), READ_YOUR_WRITES_SECONDS)
+
+
+def _client_primary_until(request: Optional[Request]) -> Optional[float]:
+    if request is None or router.window <= 0:
+        return None
+    try:
+        return float(request.cookies[READ_YOUR_WRITES_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+def read_sessionmaker(request: Optional[Request] = None):
+    """Fábrica de sesiones síncronas para una lectura (réplica o primario)"""
+    index = router.choose(_client_primary_until(request))
+    return SessionLocal if index is None else ReplicaSessionLocals[index]
+
+
+def get_read_db(request: Request):
+    db = read_sessionmaker(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    index = router.choose(_client_primary_until(request))
+    factory = AsyncSessionLocal if index is None else AsyncReplicaSessionLocals[index]
+    async with factory() as db:
+        yield db
+
+
+# Dependencia de los endpoints de lectura: como get_session, pero enrutada a réplicas
+get_read_session = get_async_read_db if DATABASE_ASYNC else get_read_db
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que, tras cada petición de escritura exitosa, abre la
+    ventana read-your-writes del proceso y envía la cookie al cliente.
+    `read_only_paths` son rutas POST que solo leen (p. ej. `/pokemon/batch`).
+    """
+
+    def __init__(self, app: ASGIApp, router: ReplicaRouter = router, read_only_paths: Iterable[str] = ()):
+        self.app = app
+        self.router = router
+        self.read_only_paths = frozenset(read_only_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (scope["type"] != "http" or scope["method"] in _READ_ONLY_METHODS
+                or scope["path"] in self.read_only_paths):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.router.record_write()
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={self.router.primary_until():.3f}; "
+                    f"Max-Age={math.ceil(self.router.window)}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
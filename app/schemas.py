@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 
 class PokemonBase(BaseModel):
     name: str = Field(..., description="Nombre del Pokémon", example="Pikachu")
@@ -66,6 +66,14 @@ class PokemonUpdate(BaseModel):
             }
         }
 
+class PokemonBulkUpdate(PokemonUpdate):
+    """Esquema para actualizar un Pokémon dentro de una operación masiva"""
+    id: int = Field(..., ge=1, description="ID del Pokémon a actualizar", example=25)
+
+class PokemonBulkDelete(BaseModel):
+    """Esquema para eliminar varios Pokémon en una sola operación"""
+    ids: List[int] = Field(..., min_length=1, description="IDs de los Pokémon a eliminar", example=[151, 152, 153])
+
 class Pokemon(PokemonBase):
     """Esquema de respuesta con información completa del Pokémon"""
     id: int = Field(..., description="ID único del Pokémon", example=25)
@@ -91,10 +99,163 @@ class Pokemon(PokemonBase):
             }
         }
 
+class PokemonRecord(Pokemon):
+    """Copia interna de un Pokémon con su versión (no forma parte de las respuestas)"""
+    version: int = Field(..., description="Versión de la fila, usada para calcular el ETag")
+
 class ErrorResponse(BaseModel):
     """Esquema de respuesta para errores"""
     detail: str = Field(..., description="Descripción del error", example="Pokemon no encontrado")
 
 class SuccessResponse(BaseModel):
     """Esquema de respuesta para operaciones exitosas"""
-    message: str = Field(..., description="Mensaje de éxito", example="Pokemon eliminado correctamente") 
\ No newline at end of file
+    message: str = Field(..., description="Mensaje de éxito", example="Pokemon eliminado correctamente")
+
+class AutocompleteMatch(BaseModel):
+    """Sugerencia de nombre para autocompletado"""
+    id: int = Field(..., description="ID único del Pokémon", example=122)
+    name: str = Field(..., description="Nombre del Pokémon", example="Mr. Mime")
+    score: float = Field(..., description="Similitud con la consulta (1.0 para coincidencias por prefijo)", example=1.0)
+    match: str = Field(..., description="Tipo de coincidencia: `prefix` o `fuzzy`", example="prefix")
+
+class BulkItemResult(BaseModel):
+    """Resultado de un elemento dentro de una operación masiva"""
+    index: int = Field(..., description="Posición del elemento en el lote recibido", example=0)
+    id: Optional[int] = Field(None, description="ID del Pokémon afectado", example=152)
+    status: str = Field(..., description="created, updated, unchanged, deleted, conflict o not_found", example="created")
+    detail: Optional[str] = Field(None, description="Motivo cuando el elemento no se aplicó")
+
+class BulkResponse(BaseModel):
+    """Esquema de respuesta para operaciones masivas"""
+    total: int = Field(..., description="Elementos recibidos", example=3)
+    succeeded: int = Field(..., description="Elementos aplicados", example=2)
+    failed: int = Field(..., description="Elementos no aplicados (conflict o not_found)", example=1)
+    results: List[BulkItemResult] = Field(..., description="Resultado de cada elemento, en el orden recibido")
+
+class PokemonBatchRequest(BaseModel):
+    """Esquema para obtener varios Pokémon por ID y/o por nombre en una sola petición"""
+    ids: List[int] = Field(default_factory=list, description="IDs a obtener", example=[25, 6, 150])
+    names: List[str] = Field(default_factory=list, description="Nombres exactos a obtener", example=["Pikachu", "Mew"])
+
+class PokemonBatchResponse(BaseModel):
+    """Esquema de respuesta de la consulta por lotes"""
+    ids: List[Optional[Pokemon]] = Field(..., description="Un elemento por ID pedido, en el mismo orden (null si no existe)")
+    names: List[Optional[Pokemon]] = Field(..., description="Un elemento por nombre pedido, en el mismo orden (null si no existe)")
+    missing_ids: List[int] = Field(..., description="IDs que no existen", example=[9999])
+    missing_names: List[str] = Field(..., description="Nombres que no existen", example=[])
+
+class SimilarPokemon(BaseModel):
+    """Pokémon parecido y su distancia al de referencia"""
+    pokemon: Pokemon = Field(..., description="Pokémon encontrado")
+    distance: float = Field(..., description="Distancia entre los vectores de estadísticas (menor = más parecido)", example=12.4)
+
+class SimilarResponse(BaseModel):
+    """Esquema de respuesta de la búsqueda de Pokémon similares"""
+    id: int = Field(..., description="ID del Pokémon de referencia", example=25)
+    metric: str = Field(..., description="Métrica usada: `euclidean` o `cosine`", example="euclidean")
+    results: List[SimilarPokemon] = Field(..., description="Pokémon más parecidos, del más al menos parecido")
+
+class StatValues(BaseModel):
+    """Valor de cada estadística de combate y del BST (suma de las seis)"""
+    hp: float = Field(..., example=68.9)
+    attack: float = Field(..., example=79.2)
+    defense: float = Field(..., example=74.1)
+    sp_attack: float = Field(..., example=72.8)
+    sp_defense: float = Field(..., example=71.9)
+    speed: float = Field(..., example=68.4)
+    bst: float = Field(..., description="Total de estadísticas base", example=435.3)
+
+class StatLeader(BaseModel):
+    """Posición en la tabla de mayor BST"""
+    id: int = Field(..., description="ID único del Pokémon", example=150)
+    name: Optional[str] = Field(None, description="Nombre del Pokémon", example="Mewtwo")
+    bst: int = Field(..., description="Total de estadísticas base", example=680)
+
+class StatGroupSummary(BaseModel):
+    """Agregados de un grupo de Pokémon (todo el catálogo o un tipo)"""
+    type: Optional[str] = Field(None, description="Tipo (principal o secundario); null para todo el catálogo", example="Fire")
+    count: int = Field(..., description="Pokémon en el grupo", example=64)
+    mean: Optional[StatValues] = Field(None, description="Media de cada estadística")
+    percentiles: Dict[str, StatValues] = Field(..., description="Percentiles (p25, p50, p75, p90, p99) de cada estadística")
+    leaderboard: List[StatLeader] = Field(..., description="Pokémon con mayor BST, de mayor a menor")
+
+class StatsSummary(BaseModel):
+    """Esquema de respuesta del resumen de estadísticas"""
+    count: int = Field(..., description="Pokémon en el catálogo", example=1025)
+    overall: StatGroupSummary = Field(..., description="Agregados de todo el catálogo")
+    by_type: List[StatGroupSummary] = Field(..., description="Agregados por tipo, en orden alfabético")
+
+class MatchupRequest(BaseModel):
+    """Esquema para calcular enfrentamientos: `attackers[i]` ataca a `defenders[i]`"""
+    attackers: List[int] = Field(..., description="IDs de los Pokémon atacantes", example=[25, 6, 150])
+    defenders: List[int] = Field(..., description="IDs de los Pokémon defensores, uno por atacante", example=[7, 3, 94])
+
+class MatchupResponse(BaseModel):
+    """Esquema de respuesta de los enfrentamientos, en columnas alineadas con los pares pedidos"""
+    count: int = Field(..., description="Número de pares", example=3)
+    multipliers: List[Optional[float]] = Field(..., description="Mejor multiplicador del atacante con cualquiera de sus tipos (null si falta alguno de los dos Pokémon o ninguno de los tipos del atacante está en la tabla)", example=[2.0, 2.0, 1.0])
+    by_type1: List[Optional[float]] = Field(..., description="Multiplicador con el tipo principal del atacante", example=[2.0, 1.0, 1.0])
+    by_type2: List[Optional[float]] = Field(..., description="Multiplicador con el tipo secundario del atacante (null si no tiene)", example=[None, 2.0, None])
+    missing_ids: List[int] = Field(..., description="IDs que no existen", example=[])
+
+class TypeWeaknesses(BaseModel):
+    """Efectividad de cada tipo de ataque contra un Pokémon"""
+    id: int = Field(..., description="ID único del Pokémon", example=1)
+    name: str = Field(..., description="Nombre del Pokémon", example="Bulbasaur")
+    type1: str = Field(..., description="Tipo principal", example="Grass")
+    type2: Optional[str] = Field(None, description="Tipo secundario", example="Poison")
+    multipliers: Dict[str, float] = Field(..., description="Multiplicador de daño de cada tipo de ataque", example={"Fire": 2.0, "Grass": 0.25})
+    weaknesses: List[str] = Field(..., description="Tipos que hacen más daño de lo normal, del más al menos efectivo", example=["Fire", "Ice", "Flying", "Psychic"])
+    resistances: List[str] = Field(..., description="Tipos que hacen menos daño de lo normal, del menos al más efectivo", example=["Grass", "Water", "Electric", "Fighting", "Fairy"])
+    immunities: List[str] = Field(..., description="Tipos que no le hacen daño", example=[])
+
+class ImportRowError(BaseModel):
+    """Fila de un archivo de importación que no pasó la validación"""
+    row: int = Field(..., description="Número de fila (desde 1, sin contar la cabecera del CSV)", example=42)
+    detail: str = Field(..., description="Campos inválidos y motivo", example="hp: Input should be greater than or equal to 1")
+
+class ImportSummary(BaseModel):
+    """Esquema de respuesta de una importación masiva"""
+    format: str = Field(..., description="Formato del archivo: `csv` o `ndjson`", example="csv")
+    on_conflict: str = Field(..., description="Tratamiento de los nombres existentes: `update` o `skip`", example="update")
+    committed: bool = Field(..., description="Indica si los cambios se confirmaron", example=True)
+    processed: int = Field(..., description="Filas leídas del archivo", example=1000000)
+    inserted: int = Field(..., description="Pokémon creados", example=999000)
+    updated: int = Field(..., description="Pokémon existentes actualizados", example=500)
+    unchanged: int = Field(..., description="Filas válidas sin cambios (idénticas, omitidas o repetidas)", example=499)
+    invalid: int = Field(..., description="Filas que no pasaron la validación", example=1)
+    errors: List[ImportRowError] = Field(..., description="Detalle de las primeras filas inválidas (IMPORT_MAX_ERRORS)")
+    validation_seconds: float = Field(..., description="Tiempo dedicado a validar", example=4.1)
+    database_seconds: float = Field(..., description="Tiempo dedicado a escribir en la base de datos", example=6.3)
+    elapsed_seconds: float = Field(..., description="Duración total", example=11.2)
+    rows_per_second: float = Field(..., description="Filas procesadas por segundo", example=89285.7)
+
+class CacheStats(BaseModel):
+    """Esquema de respuesta con las métricas de la caché de Pokémon"""
+    enabled: bool = Field(..., description="Indica si la caché está activa", example=True)
+    size: int = Field(..., description="Número de entradas almacenadas", example=150)
+    max_size: int = Field(..., description="Capacidad máxima de la caché", example=1024)
+    ttl_seconds: float = Field(..., description="Tiempo de vida de cada entrada en segundos", example=300.0)
+    hits: int = Field(..., description="Lecturas servidas desde la caché", example=9500)
+    misses: int = Field(..., description="Lecturas que tuvieron que ir a la base de datos", example=500)
+    evictions: int = Field(..., description="Entradas expulsadas por falta de espacio", example=0)
+
+class PoolCheckoutStats(BaseModel):
+    """Esquema con los tiempos de espera para obtener una conexión del pool"""
+    checkouts: int = Field(..., description="Conexiones entregadas por el pool", example=12000)
+    timeouts: int = Field(..., description="Esperas que superaron DB_POOL_TIMEOUT", example=0)
+    wait_ms_avg: float = Field(..., description="Espera promedio en milisegundos", example=0.05)
+    wait_ms_max: float = Field(..., description="Espera máxima en milisegundos", example=12.3)
+    wait_ms_total: float = Field(..., description="Suma de las esperas en milisegundos", example=600.0)
+    wait_ms_buckets: Dict[str, int] = Field(..., description="Histograma de esperas (límite superior en ms → conteo)")
+
+class PoolStatus(BaseModel):
+    """Esquema con el estado de un pool de conexiones"""
+    pool_class: str = Field(..., description="Clase del pool de SQLAlchemy", example="TimedQueuePool")
+    size: Optional[int] = Field(None, description="Tamaño base del pool (DB_POOL_SIZE)", example=5)
+    checked_out: Optional[int] = Field(None, description="Conexiones en uso", example=3)
+    idle: Optional[int] = Field(None, description="Conexiones libres en el pool", example=2)
+    overflow: Optional[int] = Field(None, description="Conexiones extra abiertas por encima de `size`", example=0)
+    max_overflow: Optional[int] = Field(None, description="Máximo de conexiones extra (DB_MAX_OVERFLOW)", example=10)
+    timeout_seconds: Optional[float] = Field(None, description="Espera máxima por una conexión (DB_POOL_TIMEOUT)", example=30.0)
+    checkout: Optional[PoolCheckoutStats] = Field(None, description="Tiempos de espera al obtener conexiones")
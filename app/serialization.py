@@ -0,0 +1,32 @@
+"""
+Serialización directa de filas a JSON para los listados.
+
+El camino por defecto de FastAPI convierte cada objeto ORM en un modelo
+Pydantic, luego en tipos básicos con `jsonable_encoder` y por último en
+texto con `json.dumps`. Para listados grandes los endpoints seleccionan
+tuplas de columnas y las codifican aquí en un solo paso, con `orjson` si
+está instalado.
+
+La salida es idéntica byte a byte a la de `JSONResponse` (mismo orden de
+campos que `schemas.Pokemon`, sin espacios y UTF-8 sin escapar).
+"""
+import json
+from typing import Iterable, Sequence
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+def encode_json(value) -> bytes:
+    """Codifica tipos básicos de Python (dicts, listas, números, textos) como JSON compacto"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_rows(rows: Iterable[Sequence], fields: Sequence[str]) -> bytes:
+    """Codifica filas como una lista de objetos con las claves `fields`; columnas extra se ignoran"""
+    return encode_json([dict(zip(fields, row)) for row in rows])
+
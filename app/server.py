@@ -0,0 +1,71 @@
+"""
+Punto de entrada de producción: `python -m app.server`.
+
+- Aplica las migraciones pendientes (`alembic upgrade head`) una sola vez,
+  en el proceso principal y antes de crear los workers; la aplicación ya no
+  consulta el esquema al importarse, así que cada worker arranca sin ir a
+  la base de datos.
+- Levanta WEB_CONCURRENCY workers de uvicorn (uno por núcleo por defecto)
+  con uvloop y httptools cuando están instalados.
+- Ante SIGTERM/SIGINT cada worker deja de aceptar conexiones, espera hasta
+  GRACEFUL_SHUTDOWN_TIMEOUT segundos a que terminen las peticiones en curso
+  y cierra sus pools de conexiones (lifespan de `app.main`).
+"""
+import argparse
+import importlib.util
+import os
+import sys
+
+import uvicorn
+
+from .config import (
+    ACCESS_LOG, FORWARDED_ALLOW_IPS, GRACEFUL_SHUTDOWN_TIMEOUT, HOST, PORT, RUN_MIGRATIONS, WEB_CONCURRENCY,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_migrations(revision: str = "head") -> None:
+    """Aplica las migraciones de Alembic sobre DATABASE_URL"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    command.upgrade(config, revision)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de producción de la Pokemon API")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-migrate", action="store_true", help="No aplicar migraciones al arrancar")
+    args = parser.parse_args(argv)
+
+    if RUN_MIGRATIONS and not args.no_migrate:
+        run_migrations()
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=max(args.workers, 1),
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        lifespan="on",
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        access_log=ACCESS_LOG,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,525 @@
+"""
+Caché compartida entre workers y nodos (cache-aside).
+
+Las cachés en memoria (`pokemon_cache`, `payload_cache`) son locales a cada
+proceso: con varios contenedores detrás de nginx cada uno empieza frío. Esta
+capa se consulta cuando la caché local falla y antes de ir a la base de
+datos; guarda los Pokémon serializados y las páginas de listados ya
+codificadas en un backend compartido (Redis, o un fake en memoria para
+pruebas y desarrollo).
+
+- Claves versionadas: cada clave incluye la versión de su espacio de nombres
+  (`id:25`, `name:Pikachu`, `lists`). Una escritura incrementa la versión en
+  lugar de borrar claves, así una carga que leyó la base de datos antes de
+  la escritura guarda su resultado bajo la versión vieja y nadie lo vuelve a
+  leer (las entradas huérfanas vencen por TTL). `CACHE_SCHEMA_VERSION` entra
+  en el prefijo para que un despliegue que cambie el formato no lea entradas
+  del anterior. Una versión global (`invalidate_all`) descarta todo a la vez,
+  p. ej. después de una importación masiva.
+- Single-flight: ante un fallo, solo quien obtiene el candado de la clave
+  consulta la base de datos; el resto espera su resultado hasta
+  SHARED_CACHE_LOCK_WAIT_SECONDS y después carga por su cuenta.
+- Réplicas atrasadas: una carga que leyó de una réplica no se guarda si su
+  espacio de nombres se invalidó hace menos de `replica_lag` segundos
+  (READ_YOUR_WRITES_SECONDS); la réplica podría no tener aún la escritura y
+  su resultado quedaría guardado bajo la versión nueva. Cada invalidación
+  deja para eso una marca que vence a los `replica_lag` segundos.
+- Invalidación entre nodos: cada escritura (o lote masivo) publica un mensaje; los demás
+  procesos lo reciben y vacían sus cachés e índices en memoria.
+
+Cualquier error del backend se cuenta y se trata como un fallo de caché: la
+petición sigue contra la base de datos.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import (
+    READ_YOUR_WRITES_SECONDS, SHARED_CACHE_BACKEND, SHARED_CACHE_LOCK_TTL_SECONDS, SHARED_CACHE_LOCK_WAIT_SECONDS, SHARED_CACHE_PREFIX,
+    SHARED_CACHE_TTL_SECONDS, SHARED_CACHE_URL,
+)
+
+# Se incrementa cuando cambia el formato de los valores guardados
+CACHE_SCHEMA_VERSION = 1
+# Intervalo con el que se consulta la clave mientras otro proceso la carga
+_LOCK_POLL_SECONDS = 0.01
+
+
+class Codec(NamedTuple):
+    encode: Callable[[object], bytes]
+    decode: Callable[[bytes], object]
+
+
+class CacheBackend:
+    """Operaciones que necesita `SharedCache` (un subconjunto de Redis)"""
+
+    # True si cada operación hace E/S de red (en código async se ejecuta en el threadpool)
+    blocking = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def mget(self, *keys: str) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def mset(self, items: Dict[str, bytes], ttl: float) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Guarda la clave solo si no existe (SET NX); True si la guardó"""
+        raise NotImplementedError
+
+    def delete_if_equals(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+    def incr(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: bytes) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> Callable[[], None]:
+        """Llama a `callback` con cada mensaje del canal; devuelve la función para cancelar"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Backend en memoria con la misma semántica que Redis. Varias instancias de
+    `SharedCache` que comparten un `MemoryBackend` se comportan como nodos
+    distintos conectados al mismo servidor.
+    """
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, bytes]] = {}
+        self._subscribers: Dict[str, List[Callable[[bytes], None]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_locked(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._values[key]
+            return None
+        return entry[1]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get_locked(key)
+
+    def mget(self, *keys: str) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._get_locked(key) for key in keys]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def mset(self, items: Dict[str, bytes], ttl: float) -> None:
+        with self._lock:
+            expires = time.monotonic() + ttl
+            for key, value in items.items():
+                self._values[key] = (expires, value)
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        with self._lock:
+            if self._get_locked(key) is not None:
+                return False
+            self._values[key] = (time.monotonic() + ttl, value)
+            return True
+
+    def delete_if_equals(self, key: str, value: bytes) -> None:
+        with self._lock:
+            if self._get_locked(key) == value:
+                del self._values[key]
+
+    def incr(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                current = self._get_locked(key)
+                self._values[key] = (float("inf"), str(int(current or 0) + 1).encode())
+
+    def publish(self, channel: str, message: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> Callable[[], None]:
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers.get(channel, []).remove(callback)
+        return unsubscribe
+
+
+class RedisBackend(CacheBackend):
+    """Backend sobre Redis (o un servidor compatible: Valkey, KeyDB, Dragonfly)"""
+
+    blocking = True
+
+    # Borra el candado solo si sigue siendo nuestro (pudo vencer y tomarlo otro)
+    _DELETE_IF_EQUALS = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:  # pragma: no cover - dependencia opcional
+            raise RuntimeError("SHARED_CACHE_BACKEND=redis requiere instalar el paquete redis") from e
+        self.client = redis.Redis.from_url(url)
+        self._delete_if_equals = self.client.register_script(self._DELETE_IF_EQUALS)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def mget(self, *keys: str) -> List[Optional[bytes]]:
+        return self.client.mget(keys)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def mset(self, items: Dict[str, bytes], ttl: float) -> None:
+        # MSET no admite TTL: un SET PX por clave en un solo pipeline
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipeline.set(key, value, px=int(ttl * 1000))
+        pipeline.execute()
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self.client.set(key, value, px=int(ttl * 1000), nx=True))
+
+    def delete_if_equals(self, key: str, value: bytes) -> None:
+        self._delete_if_equals(keys=[key], args=[value])
+
+    def incr(self, *keys: str) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.incr(key)
+        pipeline.execute()
+
+    def publish(self, channel: str, message: bytes) -> None:
+        self.client.publish(channel, message)
+
+    def subscribe(self, channel: str, callback: Callable[[bytes], None]) -> Callable[[], None]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: lambda message: callback(message["data"])})
+        thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+        def unsubscribe():
+            thread.stop()
+            pubsub.close()
+        return unsubscribe
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def create_backend(kind: str, url: str) -> Optional[CacheBackend]:
+    if kind in ("", "none"):
+        return None
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "redis":
+        return RedisBackend(url)
+    raise ValueError(f"SHARED_CACHE_BACKEND desconocido: '{kind}' (valores válidos: none, memory, redis)")
+
+
+class SharedCache:
+    def __init__(self, backend: Optional[CacheBackend], prefix: str = "pokemon", ttl: float = 300.0,
+                 lock_ttl: float = 5.0, lock_wait: float = 1.0, replica_lag: float = 0.0):
+        self.backend = backend
+        self.enabled = backend is not None
+        self.prefix = f"{prefix}:v{CACHE_SCHEMA_VERSION}"
+        self.channel = f"{self.prefix}:invalidate"
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.replica_lag = replica_lag
+        # Identifica los mensajes propios para no procesarlos dos veces
+        self.node_id = uuid.uuid4().hex
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0, "invalidations_received": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _call(self, operation: str, *args, default=None):
+        try:
+            return getattr(self.backend, operation)(*args)
+        except Exception:
+            self._count("errors")
+            return default
+
+    async def _acall(self, operation: str, *args, default=None):
+        if self.backend.blocking:
+            return await run_in_threadpool(self._call, operation, *args, default=default)
+        return self._call(operation, *args, default=default)
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:ver:{namespace}"
+
+    def _versions_keys(self, namespace: str) -> Tuple[str, str]:
+        # Versión global (invalidate_all) y versión del espacio de nombres
+        return self._version_key("*"), self._version_key(namespace)
+
+    def _data_key(self, namespace: str, versions: List[Optional[bytes]], key: str) -> str:
+        epoch, version = (int(value or 0) for value in versions)
+        return f"{self.prefix}:{namespace}@{epoch}.{version}:{key}"
+
+    def _recent_key(self, namespace: str) -> str:
+        # Existe mientras una réplica podría no tener la última escritura del espacio de nombres
+        return f"{self.prefix}:recent:{namespace}"
+
+    def _checks_recent(self, from_replica: bool) -> bool:
+        return from_replica and self.replica_lag > 0
+
+    def _recent_keys(self, namespaces: List[str]) -> List[str]:
+        return [self._recent_key("*"), *(self._recent_key(namespace) for namespace in namespaces)]
+
+    @staticmethod
+    def _storable(namespaces: List[str], marks: Optional[List[Optional[bytes]]]) -> List[str]:
+        """Espacios de nombres sin invalidación reciente (ninguno si el backend falló)"""
+        if marks is None or marks[0] is not None:
+            return []
+        return [namespace for namespace, mark in zip(namespaces, marks[1:]) if mark is None]
+
+    def _may_store(self, namespace: str, from_replica: bool) -> bool:
+        if not self._checks_recent(from_replica):
+            return True
+        return bool(self._storable([namespace], self._call("mget", *self._recent_keys([namespace]))))
+
+    async def _amay_store(self, namespace: str, from_replica: bool) -> bool:
+        if not self._checks_recent(from_replica):
+            return True
+        return bool(self._storable([namespace], await self._acall("mget", *self._recent_keys([namespace]))))
+
+    # --- Lecturas ---
+
+    def get_or_load(self, namespace: str, loader: Callable[[], Optional[object]], codec: Codec, key: str = "",
+                    from_replica: bool = False):
+        """
+        Valor de la caché o, si falta, el resultado de `loader()` (que se guarda
+        si no es None). `from_replica` indica que `loader` lee de una réplica.
+        """
+        if not self.enabled:
+            return loader()
+        versions = self._call("mget", *self._versions_keys(namespace))
+        if versions is None:
+            return loader()
+        data_key = self._data_key(namespace, versions, key)
+        cached = self._call("get", data_key)
+        if cached is not None:
+            self._count("hits")
+            return codec.decode(cached)
+        self._count("misses")
+
+        lock_key, token = data_key + ":lock", os.urandom(8)
+        if not self._call("add", lock_key, token, self.lock_ttl, default=True):
+            # Otro proceso está cargando la misma clave: se espera su resultado
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(_LOCK_POLL_SECONDS)
+                cached = self._call("get", data_key)
+                if cached is not None:
+                    self._count("coalesced")
+                    return codec.decode(cached)
+            token = None
+        try:
+            value = loader()
+            if value is not None and self._may_store(namespace, from_replica):
+                self._call("set", data_key, codec.encode(value), self.ttl)
+            return value
+        finally:
+            if token is not None:
+                self._call("delete_if_equals", lock_key, token)
+
+    async def aget_or_load(self, namespace: str, loader: Callable[[], Awaitable[Optional[object]]], codec: Codec,
+                           key: str = "", from_replica: bool = False):
+        """Versión para código asíncrono de `get_or_load` (`loader` es una corrutina)"""
+        if not self.enabled:
+            return await loader()
+        versions = await self._acall("mget", *self._versions_keys(namespace))
+        if versions is None:
+            return await loader()
+        data_key = self._data_key(namespace, versions, key)
+        cached = await self._acall("get", data_key)
+        if cached is not None:
+            self._count("hits")
+            return codec.decode(cached)
+        self._count("misses")
+
+        lock_key, token = data_key + ":lock", os.urandom(8)
+        if not await self._acall("add", lock_key, token, self.lock_ttl, default=True):
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(_LOCK_POLL_SECONDS)
+                cached = await self._acall("get", data_key)
+                if cached is not None:
+                    self._count("coalesced")
+                    return codec.decode(cached)
+            token = None
+        try:
+            value = await loader()
+            if value is not None and await self._amay_store(namespace, from_replica):
+                await self._acall("set", data_key, codec.encode(value), self.ttl)
+            return value
+        finally:
+            if token is not None:
+                await self._acall("delete_if_equals", lock_key, token)
+
+    def _batch_keys(self, namespaces: List[str], versions: List[Optional[bytes]]) -> Dict[str, str]:
+        epoch = versions[0]
+        return {namespace: self._data_key(namespace, [epoch, version], "")
+                for namespace, version in zip(namespaces, versions[1:])}
+
+    def _batch_hits(self, keys: Dict[str, str], cached: Optional[List[Optional[bytes]]],
+                    codec: Codec) -> Tuple[Dict[str, object], List[str]]:
+        values: Dict[str, object] = {}
+        missing: List[str] = []
+        for namespace, raw in zip(keys, cached or [None] * len(keys)):
+            if raw is None:
+                missing.append(namespace)
+            else:
+                values[namespace] = codec.decode(raw)
+        with self._lock:
+            self._counters["hits"] += len(values)
+            self._counters["misses"] += len(missing)
+        return values, missing
+
+    def _batch_entries(self, keys: Dict[str, str], loaded: Dict[str, object], codec: Codec) -> Dict[str, bytes]:
+        return {keys[namespace]: codec.encode(value) for namespace, value in loaded.items()
+                if value is not None and namespace in keys}
+
+    def get_many_or_load(self, namespaces: List[str], loader: Callable[[List[str]], Dict[str, object]],
+                         codec: Codec, from_replica: bool = False) -> Dict[str, object]:
+        """
+        `get_or_load` para varias entradas a la vez (la clave de cada una es su
+        espacio de nombres, p. ej. `id:25`): dos MGET al backend y una sola
+        llamada a `loader(faltantes)`, que devuelve {espacio de nombres: valor}
+        solo con lo que encontró. Sin single-flight: cada lote es distinto.
+        """
+        if not self.enabled or not namespaces:
+            return loader(namespaces) if namespaces else {}
+        versions = self._call("mget", self._version_key("*"), *(self._version_key(ns) for ns in namespaces))
+        if versions is None:
+            return loader(namespaces)
+        keys = self._batch_keys(namespaces, versions)
+        values, missing = self._batch_hits(keys, self._call("mget", *keys.values()), codec)
+        if missing:
+            loaded = loader(missing)
+            values.update(loaded)
+            if self._checks_recent(from_replica):
+                fetched = list(loaded)
+                marks = self._call("mget", *self._recent_keys(fetched))
+                loaded = {namespace: loaded[namespace] for namespace in self._storable(fetched, marks)}
+            entries = self._batch_entries(keys, loaded, codec)
+            if entries:
+                self._call("mset", entries, self.ttl)
+        return values
+
+    async def aget_many_or_load(self, namespaces: List[str],
+                                loader: Callable[[List[str]], Awaitable[Dict[str, object]]],
+                                codec: Codec, from_replica: bool = False) -> Dict[str, object]:
+        """Versión para código asíncrono de `get_many_or_load` (`loader` es una corrutina)"""
+        if not self.enabled or not namespaces:
+            return await loader(namespaces) if namespaces else {}
+        versions = await self._acall("mget", self._version_key("*"), *(self._version_key(ns) for ns in namespaces))
+        if versions is None:
+            return await loader(namespaces)
+        keys = self._batch_keys(namespaces, versions)
+        values, missing = self._batch_hits(keys, await self._acall("mget", *keys.values()), codec)
+        if missing:
+            loaded = await loader(missing)
+            values.update(loaded)
+            if self._checks_recent(from_replica):
+                fetched = list(loaded)
+                marks = await self._acall("mget", *self._recent_keys(fetched))
+                loaded = {namespace: loaded[namespace] for namespace in self._storable(fetched, marks)}
+            entries = self._batch_entries(keys, loaded, codec)
+            if entries:
+                await self._acall("mset", entries, self.ttl)
+        return values
+
+    # --- Invalidación ---
+
+    def _recent_marks(self, namespaces: List[str]) -> Dict[str, bytes]:
+        return {self._recent_key(namespace): b"1" for namespace in namespaces}
+
+    def invalidate(self, namespaces: Iterable[str], message: dict) -> None:
+        """Incrementa la versión de `namespaces` y avisa a los demás nodos con `message`"""
+        if not self.enabled:
+            return
+        namespaces = list(namespaces)
+        if self.replica_lag > 0:
+            # La marca va antes que la versión: quien lea la versión nueva ya la encuentra
+            self._call("mset", self._recent_marks(namespaces), self.replica_lag)
+        self._call("incr", *(self._version_key(namespace) for namespace in namespaces))
+        self._call("publish", self.channel, json.dumps({**message, "origin": self.node_id}).encode())
+
+    async def ainvalidate(self, namespaces: Iterable[str], message: dict) -> None:
+        """Versión para código asíncrono de `invalidate`"""
+        if not self.enabled:
+            return
+        namespaces = list(namespaces)
+        if self.replica_lag > 0:
+            # La marca va antes que la versión: quien lea la versión nueva ya la encuentra
+            await self._acall("mset", self._recent_marks(namespaces), self.replica_lag)
+        await self._acall("incr", *(self._version_key(namespace) for namespace in namespaces))
+        await self._acall("publish", self.channel, json.dumps({**message, "origin": self.node_id}).encode())
+
+    def invalidate_all(self, message: dict) -> None:
+        """Descarta todas las entradas de todos los nodos incrementando la versión global"""
+        self.invalidate(["*"], message)
+
+    def start(self, on_invalidate: Callable[[dict], None]) -> None:
+        """Se suscribe a las invalidaciones de otros nodos (al arrancar la aplicación)"""
+        if not self.enabled or self._unsubscribe is not None:
+            return
+
+        def handle(raw: bytes) -> None:
+            message = json.loads(raw)
+            if message.pop("origin", None) == self.node_id:
+                return
+            self._count("invalidations_received")
+            on_invalidate(message)
+
+        self._unsubscribe = self.backend.subscribe(self.channel, handle)
+
+    def close(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self.backend is not None:
+            self.backend.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"enabled": self.enabled, "backend": type(self.backend).__name__ if self.backend else None,
+                    "ttl_seconds": self.ttl, **self._counters}
+
+
+shared_cache = SharedCache(
+    create_backend(SHARED_CACHE_BACKEND, SHARED_CACHE_URL),
+    prefix=SHARED_CACHE_PREFIX,
+    ttl=SHARED_CACHE_TTL_SECONDS,
+    lock_ttl=SHARED_CACHE_LOCK_TTL_SECONDS,
+    lock_wait=SHARED_CACHE_LOCK_WAIT_SECONDS,
+    replica_lag=READ_YOUR_WRITES_SECONDS,
+)
@@ -0,0 +1,371 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .config import STAT_STORE_TTL_SECONDS
+from .type_index import normalize_type
+
+# Estadísticas de combate, en el orden de las columnas de la matriz
+STAT_FIELDS = ("hp", "attack", "defense", "sp_attack", "sp_defense", "speed")
+# Percentiles que reporta el resumen
+SUMMARY_PERCENTILES = (25, 50, 75, 90, 99)
+METRICS = ("euclidean", "cosine")
+
+_NO_TYPE = -1
+_INITIAL_CAPACITY = 1024
+
+
+class StatStore:
+    """
+    Almacén columnar en memoria (NumPy) de las estadísticas de combate.
+
+    Guarda una fila por Pokémon, ordenada por ID: la matriz de estadísticas
+    (float64, N×6), la norma de cada vector y los tipos codificados como
+    enteros. Con eso las búsquedas de similares y los agregados por tipo son
+    operaciones vectorizadas sobre toda la tabla.
+
+    Se carga una vez desde la base de datos. Las escrituras (propias o
+    anunciadas por otros nodos) solo marcan el ID como pendiente y la
+    siguiente lectura relee esas filas con una consulta `IN`. Un borrado deja
+    la fila como inactiva hasta la próxima carga completa. El TTL obliga a
+    recargar para recoger cambios de otros procesos cuando no hay caché
+    compartida.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._stats = np.empty((0, len(STAT_FIELDS)), dtype=np.float64)
+        self._norms = np.empty(0, dtype=np.float64)
+        self._type1 = np.empty(0, dtype=np.int16)
+        self._type2 = np.empty(0, dtype=np.int16)
+        self._alive = np.empty(0, dtype=bool)
+        # Vocabulario de tipos: clave normalizada → código, y nombre a mostrar por código
+        self._type_codes: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._dirty: Set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._stale = False
+        # Cambia con cada invalidate(): una carga que empezó antes queda obsoleta
+        self._generation = 0
+        # Cambia con cada modificación de los datos (clave de los resúmenes calculados)
+        self._version = 0
+        self._summaries: Dict[int, Tuple[int, dict]] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            if self._loaded_at is None or self._stale:
+                return False
+            return time.monotonic() - self._loaded_at <= self.ttl
+
+    def __len__(self) -> int:
+        return int(self._alive[:self._size].sum())
+
+    # --- Sincronización con la base de datos ---
+
+    def mark_dirty(self, pokemon_id: int) -> None:
+        """El Pokémon cambió o se eliminó: se releerá en la siguiente lectura"""
+        with self._lock:
+            # También durante la primera carga: la consulta pudo leer la fila antes de la escritura
+            self._dirty.add(pokemon_id)
+
+    def take_dirty(self) -> List[int]:
+        """IDs pendientes de releer (y los olvida)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return sorted(dirty)
+
+    def invalidate(self) -> None:
+        """Obliga a una carga completa en la siguiente lectura (p. ej. tras una importación)"""
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def load(self, rows: Iterable[Sequence], generation: int) -> None:
+        """
+        Reemplaza el contenido con filas (id, type1, type2, hp, ..., speed)
+        ordenadas por ID, leídas en la generación indicada. Los IDs marcados
+        durante la lectura siguen pendientes y se releen en la siguiente.
+        """
+        columns = list(zip(*rows))
+        with self._lock:
+            self._type_codes = {}
+            self._type_names = []
+            size = len(columns[0]) if columns else 0
+            self._allocate(max(size, _INITIAL_CAPACITY))
+            if size:
+                # Columna por columna: una conversión de NumPy por columna en lugar de una por fila
+                self._ids[:size] = columns[0]
+                for target, values in ((self._type1, columns[1]), (self._type2, columns[2])):
+                    # En orden para que el nombre mostrado no dependa del orden de las filas
+                    codes = {value: self._type_code(value) for value in sorted(set(values), key=lambda v: v or "")}
+                    target[:size] = [codes[value] for value in values]
+                for column, values in enumerate(columns[3:]):
+                    self._stats[:size, column] = values
+            self._size = size
+            self._alive[:size] = True
+            self._refresh_derived(slice(0, size))
+            self._loaded_at = time.monotonic()
+            # Si hubo un invalidate() durante la lectura, se usará ahora pero se recargará después
+            self._stale = generation != self._generation
+            self._changed()
+
+    def apply(self, rows: Iterable[Sequence], requested_ids: Iterable[int]) -> None:
+        """
+        Aplica las filas releídas para `requested_ids`; los IDs pedidos que no
+        vinieron en `rows` se eliminaron.
+        """
+        with self._lock:
+            found = set()
+            for row in rows:
+                found.add(row[0])
+                self._upsert_locked(row)
+            for pokemon_id in requested_ids:
+                if pokemon_id not in found:
+                    position = self._position(pokemon_id)
+                    if position is not None:
+                        self._alive[position] = False
+            self._changed()
+
+    def _allocate(self, capacity: int) -> None:
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._stats = np.zeros((capacity, len(STAT_FIELDS)), dtype=np.float64)
+        self._norms = np.zeros(capacity, dtype=np.float64)
+        self._type1 = np.full(capacity, _NO_TYPE, dtype=np.int16)
+        self._type2 = np.full(capacity, _NO_TYPE, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+
+    def _grow(self) -> None:
+        capacity = max(len(self._ids) * 2, _INITIAL_CAPACITY)
+        for name in ("_ids", "_stats", "_norms", "_type1", "_type2", "_alive"):
+            current = getattr(self, name)
+            grown = np.full((capacity,) + current.shape[1:], _NO_TYPE if name.startswith("_type") else 0,
+                            dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    def _type_code(self, pokemon_type: Optional[str]) -> int:
+        if not pokemon_type:
+            return _NO_TYPE
+        key = normalize_type(pokemon_type)
+        code = self._type_codes.get(key)
+        if code is None:
+            code = self._type_codes[key] = len(self._type_names)
+            self._type_names.append(pokemon_type.strip())
+        return code
+
+    def _position(self, pokemon_id: int) -> Optional[int]:
+        position = int(np.searchsorted(self._ids[:self._size], pokemon_id))
+        if position < self._size and self._ids[position] == pokemon_id:
+            return position
+        return None
+
+    def _upsert_locked(self, row: Sequence) -> None:
+        pokemon_id = row[0]
+        position = self._position(pokemon_id)
+        if position is None:
+            if self._size == len(self._ids):
+                self._grow()
+            position = int(np.searchsorted(self._ids[:self._size], pokemon_id))
+            if position < self._size:
+                # ID menor que el último (poco común): se desplazan las filas siguientes
+                for array in (self._ids, self._stats, self._norms, self._type1, self._type2, self._alive):
+                    array[position + 1:self._size + 1] = array[position:self._size].copy()
+            self._size += 1
+            self._ids[position] = pokemon_id
+        self._type1[position] = self._type_code(row[1])
+        self._type2[position] = self._type_code(row[2])
+        self._stats[position] = row[3:]
+        self._alive[position] = True
+        self._refresh_derived(slice(position, position + 1))
+
+    def _refresh_derived(self, rows: slice) -> None:
+        stats = self._stats[rows]
+        self._norms[rows] = np.sqrt(np.einsum("ij,ij->i", stats, stats))
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._summaries.clear()
+
+    # --- Consultas ---
+
+    def similar(self, pokemon_id: int, k: int = 10, metric: str = "euclidean") -> Optional[List[Tuple[int, float]]]:
+        """
+        Los `k` Pokémon con el vector de estadísticas más cercano al de
+        `pokemon_id` (excluido él mismo), como (id, distancia) de menor a
+        mayor. Con `cosine` la distancia es 1 - similitud coseno, así que
+        compara la forma del reparto de estadísticas y no su magnitud. None
+        si el ID no existe.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Métrica no soportada: '{metric}'")
+        with self._lock:
+            position = self._position(pokemon_id)
+            if position is None or not self._alive[position]:
+                return None
+            size = self._size
+            stats, norms = self._stats[:size], self._norms[:size]
+            vector = self._stats[position]
+            dots = stats @ vector
+            if metric == "euclidean":
+                # |x - v|² = |x|² - 2·x·v + |v|², sin materializar la matriz de diferencias
+                distances = norms * norms - 2 * dots + float(vector @ vector)
+                np.maximum(distances, 0, out=distances)
+            else:
+                distances = 1 - dots / np.maximum(norms * self._norms[position], 1e-12)
+            distances[~self._alive[:size]] = np.inf
+            distances[position] = np.inf
+            k = min(k, len(self) - 1)
+            if k <= 0:
+                return []
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.lexsort((self._ids[nearest], distances[nearest]))]
+            if metric == "euclidean":
+                values = np.sqrt(distances[nearest])
+            else:
+                values = distances[nearest]
+            return [(int(self._ids[i]), float(value)) for i, value in zip(nearest, values)]
+
+    def types(self, ids: np.ndarray, vocabulary: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tipos de muchos Pokémon a la vez, traducidos a los códigos de
+        `vocabulary` (tipo normalizado → código; -1 si no lo tiene o no está
+        en el vocabulario). Devuelve (type1, type2, encontrado), alineados
+        con `ids`.
+        """
+        with self._lock:
+            size = self._size
+            if not size:
+                missing = np.full(len(ids), _NO_TYPE, dtype=np.intp)
+                return missing, missing.copy(), np.zeros(len(ids), dtype=bool)
+            # Con las claves ordenadas la búsqueda recorre la tabla en orden: varias
+            # veces más rápida que con un lote grande desordenado
+            order = np.argsort(ids)
+            positions = np.empty(len(ids), dtype=np.intp)
+            positions[order] = np.minimum(np.searchsorted(self._ids[:size], ids[order]), size - 1)
+            found = (self._ids[positions] == ids) & self._alive[positions]
+            # El último elemento traduce _NO_TYPE (-1) a -1
+            codes = np.array([vocabulary.get(key, -1) for key in self._type_codes] + [-1], dtype=np.intp)
+            type1 = np.where(found, codes[self._type1[positions]], -1)
+            type2 = np.where(found, codes[self._type2[positions]], -1)
+            return type1, type2, found
+
+    def summary(self, top: int = 10) -> dict:
+        """
+        Agregados globales y por tipo (principal o secundario): número de
+        Pokémon, media y percentiles (por rango más cercano) de cada
+        estadística y del BST, e IDs con mayor BST. Se calcula una vez por
+        versión de los datos.
+
+        Todo sale de histogramas por grupo (`bincount`), así que cada
+        estadística es una pasada sobre la tabla sin importar cuántos tipos
+        haya; la tabla de mayor BST usa el histograma para obtener el umbral
+        de cada grupo y solo ordena las filas que lo superan.
+        """
+        with self._lock:
+            cached = self._summaries.get(top)
+            if cached is not None and cached[0] == self._version:
+                return cached[1]
+            result = self._summarize(top)
+            self._summaries[top] = (self._version, result)
+            return result
+
+    def _summarize(self, top: int) -> dict:
+        alive = self._alive[:self._size] & (self._type1[:self._size] != _NO_TYPE)
+        ids = self._ids[:self._size][alive]
+        stats = self._stats[:self._size][alive].astype(np.intp)
+        type1 = self._type1[:self._size][alive].astype(np.intp)
+        type2 = self._type2[:self._size][alive].astype(np.intp)
+        count = len(ids)
+        groups = Groups(len(self._type_names), type1, type2)
+
+        columns = STAT_FIELDS + ("bst",)
+        means, percentiles = {}, {}
+        needed = np.maximum(np.ceil(np.outer(SUMMARY_PERCENTILES, groups.sizes) / 100), 1)
+        for name, values in zip(columns, (*np.ascontiguousarray(stats.T), stats.sum(axis=1))):
+            histogram = groups.histogram(values)
+            cumulative = histogram.cumsum(axis=1)
+            means[name] = histogram @ np.arange(histogram.shape[1]) / np.maximum(groups.sizes, 1)
+            # Percentil q = primer valor cuyo acumulado alcanza ceil(q% del grupo)
+            percentiles[name] = [(cumulative < rank[:, None]).sum(axis=1) for rank in needed]
+        # El último histograma es el del BST
+        leaders = groups.leaders(ids, values, histogram, cumulative, top)
+
+        names = [None] + self._type_names
+        summary_groups = []
+        for group in [0] + sorted(range(1, len(names)), key=lambda g: names[g]):
+            size = int(groups.sizes[group])
+            if group and not size:
+                continue
+            summary_groups.append({
+                "type": names[group],
+                "count": size,
+                "mean": {name: round(float(means[name][group]), 2) for name in columns} if size else None,
+                "percentiles": {
+                    f"p{q}": {name: float(percentiles[name][index][group]) for name in columns}
+                    for index, q in enumerate(SUMMARY_PERCENTILES)
+                } if size else {},
+                "leaderboard": leaders.get(group, []),
+            })
+        return {"count": count, "groups": summary_groups}
+
+
+class Groups:
+    """
+    Pertenencia de cada fila a los grupos del resumen: todo el catálogo (0),
+    su tipo principal y, si lo tiene y es distinto, su tipo secundario
+    (código del tipo + 1).
+    """
+
+    def __init__(self, type_count: int, type1: np.ndarray, type2: np.ndarray):
+        self.count = type_count + 1
+        self.type1 = type1
+        # Filas con un tipo secundario distinto del principal, y ese tipo
+        self.second_rows = np.flatnonzero((type2 != _NO_TYPE) & (type2 != type1))
+        self.type2 = type2[self.second_rows]
+        self.sizes = np.zeros(self.count, dtype=np.intp)
+        self.sizes[0] = len(type1)
+        self.sizes[1:] = np.bincount(type1, minlength=type_count) + np.bincount(self.type2, minlength=type_count)
+
+    def histogram(self, values: np.ndarray) -> np.ndarray:
+        """Conteo de cada valor entero (columnas) en cada grupo (filas)"""
+        width = int(values.max()) + 1 if len(values) else 1
+        types = (self.count - 1) * width
+        histogram = np.empty((self.count, width), dtype=np.intp)
+        histogram[0] = np.bincount(values, minlength=width)
+        histogram[1:] = np.bincount(self.type1 * width + values, minlength=types).reshape(-1, width)
+        histogram[1:] += np.bincount(self.type2 * width + values[self.second_rows], minlength=types).reshape(-1, width)
+        return histogram
+
+    def leaders(self, ids: np.ndarray, bst: np.ndarray, histogram: np.ndarray, cumulative: np.ndarray,
+                top: int) -> Dict[int, List[Tuple[int, int]]]:
+        """Las `top` filas de mayor BST de cada grupo, como (id, bst), a partir del histograma del BST"""
+        # Filas con BST >= v en cada grupo; el umbral es el mayor v con al menos `top` filas
+        at_least = self.sizes[:, None] - (cumulative - histogram)
+        needed = np.maximum(np.minimum(self.sizes, top), 1)[:, None]
+        thresholds = (at_least >= needed).sum(axis=1) - 1
+        # Solo se ordenan las filas que superan el umbral de alguno de sus grupos
+        overall = np.flatnonzero(bst >= thresholds[0])
+        primary = np.flatnonzero(bst >= thresholds[self.type1 + 1])
+        secondary = bst[self.second_rows] >= thresholds[self.type2 + 1]
+        rows = np.concatenate((overall, primary, self.second_rows[secondary]))
+        groups = np.concatenate((np.zeros(len(overall), dtype=np.intp), self.type1[primary] + 1,
+                                 self.type2[secondary] + 1))
+        order = np.lexsort((ids[rows], -bst[rows], groups))
+        leaders: Dict[int, List[Tuple[int, int]]] = {}
+        for group, row in zip(groups[order].tolist(), rows[order].tolist()):
+            board = leaders.setdefault(group, [])
+            if len(board) < top:
+                board.append((int(ids[row]), int(bst[row])))
+        return leaders
+
+stat_store = StatStore(ttl=STAT_STORE_TTL_SECONDS)
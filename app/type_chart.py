@@ -0,0 +1,124 @@
+"""
+Tabla de efectividad de tipos (18×18) y cálculo vectorizado de multiplicadores.
+
+`CHART[atacante, defensor]` es el multiplicador de daño de un ataque de un
+tipo contra un defensor de un tipo (reglas de la 6.ª generación en adelante).
+Se construye una sola vez al importar el módulo, con los tipos documentados
+en la API y en ese orden.
+
+Los tipos se manejan como códigos enteros (`type_code`); -1 es "sin tipo" o
+un tipo que no está en la tabla. La matriz interna tiene una fila y una
+columna extra en la última posición, así que el índice -1 cae en ellas: un
+defensor sin segundo tipo multiplica por 1 y un ataque sin tipo da NaN, sin
+máscaras adicionales.
+"""
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .type_index import normalize_type
+
+TYPES = (
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison", "Ground",
+    "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark", "Steel", "Fairy",
+)
+TYPE_CODES: Dict[str, int] = {normalize_type(name): code for code, name in enumerate(TYPES)}
+NO_TYPE = -1
+
+# Solo las combinaciones distintas de 1: atacante → {defensor: multiplicador}
+_EFFECTIVENESS = {
+    "Normal": {"Rock": 0.5, "Ghost": 0, "Steel": 0.5},
+    "Fire": {"Fire": 0.5, "Water": 0.5, "Grass": 2, "Ice": 2, "Bug": 2, "Rock": 0.5, "Dragon": 0.5, "Steel": 2},
+    "Water": {"Fire": 2, "Water": 0.5, "Grass": 0.5, "Ground": 2, "Rock": 2, "Dragon": 0.5},
+    "Electric": {"Water": 2, "Electric": 0.5, "Grass": 0.5, "Ground": 0, "Flying": 2, "Dragon": 0.5},
+    "Grass": {"Fire": 0.5, "Water": 2, "Grass": 0.5, "Poison": 0.5, "Ground": 2, "Flying": 0.5, "Bug": 0.5,
+              "Rock": 2, "Dragon": 0.5, "Steel": 0.5},
+    "Ice": {"Fire": 0.5, "Water": 0.5, "Grass": 2, "Ice": 0.5, "Ground": 2, "Flying": 2, "Dragon": 2, "Steel": 0.5},
+    "Fighting": {"Normal": 2, "Ice": 2, "Poison": 0.5, "Flying": 0.5, "Psychic": 0.5, "Bug": 0.5, "Rock": 2,
+                 "Ghost": 0, "Dark": 2, "Steel": 2, "Fairy": 0.5},
+    "Poison": {"Grass": 2, "Poison": 0.5, "Ground": 0.5, "Rock": 0.5, "Ghost": 0.5, "Steel": 0, "Fairy": 2},
+    "Ground": {"Fire": 2, "Electric": 2, "Grass": 0.5, "Poison": 2, "Flying": 0, "Bug": 0.5, "Rock": 2, "Steel": 2},
+    "Flying": {"Electric": 0.5, "Grass": 2, "Fighting": 2, "Bug": 2, "Rock": 0.5, "Steel": 0.5},
+    "Psychic": {"Fighting": 2, "Poison": 2, "Psychic": 0.5, "Dark": 0, "Steel": 0.5},
+    "Bug": {"Fire": 0.5, "Grass": 2, "Fighting": 0.5, "Poison": 0.5, "Flying": 0.5, "Psychic": 2, "Ghost": 0.5,
+            "Dark": 2, "Steel": 0.5, "Fairy": 0.5},
+    "Rock": {"Fire": 2, "Ice": 2, "Fighting": 0.5, "Ground": 0.5, "Flying": 2, "Bug": 2, "Steel": 0.5},
+    "Ghost": {"Normal": 0, "Psychic": 2, "Ghost": 2, "Dark": 0.5},
+    "Dragon": {"Dragon": 2, "Steel": 0.5, "Fairy": 0},
+    "Dark": {"Fighting": 0.5, "Psychic": 2, "Ghost": 2, "Dark": 0.5, "Fairy": 0.5},
+    "Steel": {"Fire": 0.5, "Water": 0.5, "Electric": 0.5, "Ice": 2, "Rock": 2, "Steel": 0.5, "Fairy": 2},
+    "Fairy": {"Fire": 0.5, "Fighting": 2, "Poison": 0.5, "Dragon": 2, "Dark": 2, "Steel": 0.5},
+}
+
+
+def _build_chart() -> np.ndarray:
+    size = len(TYPES)
+    chart = np.ones((size + 1, size + 1), dtype=np.float64)
+    # Fila extra: ataque sin tipo (sin resultado); columna extra: defensor sin tipo (neutral)
+    chart[size, :] = np.nan
+    for attacker, row in _EFFECTIVENESS.items():
+        for defender, multiplier in row.items():
+            chart[TYPE_CODES[normalize_type(attacker)], TYPE_CODES[normalize_type(defender)]] = multiplier
+    chart.flags.writeable = False
+    return chart
+
+
+_PADDED = _build_chart()
+# Vista 18×18 sin la fila y columna extra
+CHART = _PADDED[:-1, :-1]
+
+
+def type_code(pokemon_type: Optional[str]) -> int:
+    """Código del tipo en la tabla, o NO_TYPE si no tiene o no es un tipo conocido"""
+    if not pokemon_type:
+        return NO_TYPE
+    return TYPE_CODES.get(normalize_type(pokemon_type), NO_TYPE)
+
+
+def multipliers(attack: np.ndarray, defense1: np.ndarray, defense2: np.ndarray) -> np.ndarray:
+    """
+    Multiplicador de un ataque de tipo `attack[i]` contra un defensor de
+    tipos (`defense1[i]`, `defense2[i]`), para todos los `i` de una vez.
+    Un segundo tipo igual al primero no vuelve a multiplicar.
+    """
+    defense2 = np.where(defense2 == defense1, NO_TYPE, defense2)
+    return _PADDED[attack, defense1] * _PADDED[attack, defense2]
+
+
+def matchups(
+    attack1: np.ndarray, attack2: np.ndarray, defense1: np.ndarray, defense2: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Multiplicadores de cada atacante (tipos `attack1`, `attack2`) contra
+    cada defensor, usando el primer tipo, el segundo (NaN si no tiene) y el
+    mejor de los dos.
+    """
+    by_type1 = multipliers(attack1, defense1, defense2)
+    by_type2 = multipliers(np.where(attack2 == attack1, NO_TYPE, attack2), defense1, defense2)
+    return by_type1, by_type2, np.fmax(by_type1, by_type2)
+
+
+@lru_cache(maxsize=None)
+def _defense_profile(codes: Tuple[int, int]) -> dict:
+    attack = np.arange(len(TYPES))
+    values = multipliers(attack, np.full_like(attack, codes[0]), np.full_like(attack, codes[1])).tolist()
+    by_type = dict(zip(TYPES, values))
+    return {
+        "multipliers": by_type,
+        "weaknesses": sorted((name for name in TYPES if by_type[name] > 1), key=lambda name: -by_type[name]),
+        "resistances": sorted((name for name in TYPES if 0 < by_type[name] < 1), key=lambda name: by_type[name]),
+        "immunities": [name for name in TYPES if by_type[name] == 0],
+    }
+
+
+def defense_profile(type1: Optional[str], type2: Optional[str] = None) -> dict:
+    """
+    Multiplicador de cada tipo de ataque contra un defensor con esos tipos y
+    los tipos a los que es débil (de mayor a menor), que resiste (de mayor a
+    menor resistencia) o inmune. Se calcula una vez por combinación (el orden
+    de los tipos no importa) y el resultado es compartido: no modificarlo.
+    Los tipos desconocidos se tratan como neutrales.
+    """
+    codes = tuple(sorted((type_code(type1), type_code(type2)), reverse=True))
+    return _defense_profile(codes)
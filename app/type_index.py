@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import TYPE_INDEX_ENABLED, TYPE_INDEX_TTL_SECONDS
+
+
+def normalize_type(pokemon_type: str) -> str:
+    return pokemon_type.strip().lower()
+
+
+class TypeIndex:
+    """
+    Mapa en memoria tipo → IDs ordenados (tipo principal o secundario).
+
+    Se construye a partir de una sola consulta (id, type1, type2) y se marca
+    como inválido en cada escritura; la siguiente búsqueda lo reconstruye.
+    El TTL acota cuánto tiempo puede quedar desactualizado cuando la escritura
+    ocurre en otro proceso o contenedor.
+    """
+
+    def __init__(self, ttl: float = 60.0, enabled: bool = True):
+        self.ttl = ttl
+        self.enabled = enabled
+        self._buckets: Dict[str, List[int]] = {}
+        self._built_at: Optional[float] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def lookup(self, pokemon_type: str) -> Optional[List[int]]:
+        """IDs del tipo indicado, o None si el índice debe reconstruirse"""
+        with self._lock:
+            if self._built_at is None or time.monotonic() - self._built_at > self.ttl:
+                return None
+            return self._buckets.get(normalize_type(pokemon_type), [])
+
+    def rebuild(self, rows: Iterable[Tuple[int, str, Optional[str]]], generation: int) -> Dict[str, List[int]]:
+        """
+        Reemplaza el índice con las filas (id, type1, type2) recibidas.
+
+        `generation` es el valor leído antes de consultar la base de datos; si
+        hubo una escritura mientras tanto, el índice construido ya está
+        desactualizado y no se marca como válido. Devuelve los buckets
+        construidos para que quien reconstruyó pueda usarlos de inmediato.
+        """
+        buckets: Dict[str, List[int]] = defaultdict(list)
+        for pokemon_id, type1, type2 in rows:
+            buckets[normalize_type(type1)].append(pokemon_id)
+            if type2 and normalize_type(type2) != normalize_type(type1):
+                buckets[normalize_type(type2)].append(pokemon_id)
+        for ids in buckets.values():
+            ids.sort()
+        with self._lock:
+            self._buckets = dict(buckets)
+            self._built_at = time.monotonic() if generation == self._generation else None
+        return buckets
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._built_at = None
+
+
+type_index = TypeIndex(ttl=TYPE_INDEX_TTL_SECONDS, enabled=TYPE_INDEX_ENABLED)
@@ -0,0 +1,69 @@
+"""
+Latencia de /pokemon/autocomplete con un índice de 100k nombres.
+
+Mide el índice en memoria directamente (carga, búsquedas por prefijo,
+búsquedas aproximadas y actualizaciones incrementales) sin base de datos.
+
+Uso:
+    python -m benchmarks.bench_autocomplete --names 100000
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import measure
+from app.name_index import NameIndex
+
+REAL_NAMES = [
+    "Bulbasaur", "Charizard", "Pikachu", "Nidoran♀", "Nidoran♂", "Mr. Mime",
+    "Farfetch'd", "Flabébé", "Porygon-Z", "Type: Null", "Jangmo-o", "Ho-Oh",
+]
+
+QUERIES = {
+    "prefix_short": ("ch", False),
+    "prefix_long": ("charizar", False),
+    "prefix_symbol": ("nidoran♀", False),
+    "prefix_punctuation": ("mr mi", False),
+    "fuzzy_typo": ("pikahcu", True),
+    "fuzzy_synthetic": ("montel-00488", True),
+    "no_match": ("zzzzzz", True),
+}
+
+
+def synthetic_names(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    syllables = ["char", "bul", "pi", "ka", "saur", "mon", "zard", "dra", "gon", "chu", "lee", "tle", "nido", "ran"]
+    for i in range(n):
+        yield f"{''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()}-{i:05d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = list(enumerate(REAL_NAMES + list(synthetic_names(args.names - len(REAL_NAMES))), start=1))
+    index = NameIndex(ttl=3600)
+    started = time.perf_counter()
+    index.load(rows, index.generation)
+    load_seconds = time.perf_counter() - started
+
+    report = {"names": len(index), "load_seconds": round(load_seconds, 3), "queries": {}}
+    for name, (query, fuzzy) in QUERIES.items():
+        report["queries"][name] = {
+            "query": query,
+            "top": [match["name"] for match in index.search(query, limit=3, fuzzy=fuzzy)],
+            **measure(lambda: index.search(query, limit=10, fuzzy=fuzzy), repeat=args.repeat),
+        }
+
+    next_id = len(rows) + 1
+    counter = iter(range(next_id, next_id + 10 * args.repeat))
+    report["upsert"] = measure(lambda: index.upsert(next(counter), "Newmon"), repeat=args.repeat)
+    report["discard"] = measure(lambda: index.discard(next_id), repeat=args.repeat)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compara obtener N Pokémon con una petición por elemento contra una sola
+petición a POST /pokemon/batch.
+
+Para cada tamaño de lote se mide:
+
+- `per_item`: N peticiones GET /pokemon/{id} (o /pokemon/name/{name}).
+- `batch`: una petición POST /pokemon/batch con las mismas claves.
+
+Ambos casos con la caché de Pokémon fría (vaciada antes de cada repetición,
+así cada clave va a la base de datos) y caliente. Las peticiones pasan por la
+aplicación completa con el cliente de pruebas de FastAPI (requiere `httpx`);
+la latencia de red real de las N peticiones no está incluida, así que el
+ahorro en producción es mayor que el medido.
+
+Uso:
+    python -m benchmarks.bench_batch --rows 100000 --sizes 6,100,1000
+"""
+import argparse
+import json
+import random
+
+from benchmarks.common import get_engine, measure, seed
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app import models
+from app.cache import pokemon_cache
+from app.main import app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sizes", default="6,100,1000", help="Tamaños de lote separados por comas")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--by", choices=["id", "name"], default="id")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    total = seed(engine, args.rows)
+    with engine.connect() as conn:
+        keys = conn.execute(select(models.Pokemon.id, models.Pokemon.name).limit(args.rows)).all()
+    rng = random.Random(7)
+    client = TestClient(app)
+
+    results = {}
+    for size in (int(value) for value in args.sizes.split(",")):
+        sample = rng.sample(keys, size)
+        if args.by == "id":
+            paths = [f"/pokemon/{pokemon_id}" for pokemon_id, _ in sample]
+            body = {"ids": [pokemon_id for pokemon_id, _ in sample]}
+        else:
+            paths = [f"/pokemon/name/{name}" for _, name in sample]
+            body = {"names": [name for _, name in sample]}
+
+        def per_item():
+            for path in paths:
+                client.get(path).raise_for_status()
+
+        def batch():
+            client.post("/pokemon/batch", json=body).raise_for_status()
+
+        def cold(fn):
+            def run():
+                pokemon_cache.clear()
+                fn()
+            return run
+
+        result = {
+            "per_item_cold": measure(cold(per_item), repeat=args.repeat),
+            "batch_cold": measure(cold(batch), repeat=args.repeat),
+            "per_item_warm": measure(per_item, repeat=args.repeat),
+            "batch_warm": measure(batch, repeat=args.repeat),
+        }
+        for state in ("cold", "warm"):
+            result[f"p50_speedup_{state}"] = round(
+                result[f"per_item_{state}"]["p50_ms"] / result[f"batch_{state}"]["p50_ms"], 1
+            )
+        results[size] = result
+
+    print(json.dumps({"rows": total, "by": args.by, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara la creación fila por fila (como POST /pokemon/) con la creación masiva.
+
+Uso:
+    python -m benchmarks.bench_bulk --rows 5000
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import get_engine, iter_synthetic
+from app import crud, models, schemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    Session = sessionmaker(bind=engine)
+    # Nombres fuera del rango usado por common.seed para no chocar con la tabla sembrada
+    payload = [schemas.PokemonCreate(**row) for row in iter_synthetic(args.rows, start=50_000_000)]
+    names = [pokemon.name for pokemon in payload]
+
+    def cleanup():
+        with engine.begin() as conn:
+            conn.execute(delete(models.Pokemon.__table__).where(models.Pokemon.name.in_(names)))
+
+    cleanup()
+    with Session() as db:
+        started = time.perf_counter()
+        for pokemon in payload:
+            # Mismo recorrido que el endpoint individual: verificación + INSERT + commit + refresh
+            if crud.get_pokemon_by_name(db, name=pokemon.name) is None:
+                crud.create_pokemon(db, pokemon=pokemon)
+        per_row = time.perf_counter() - started
+
+    cleanup()
+    with Session() as db:
+        started = time.perf_counter()
+        results = crud.bulk_create_pokemons(db, payload)
+        bulk = time.perf_counter() - started
+    assert all(result["status"] == "created" for result in results)
+    cleanup()
+
+    print(json.dumps({
+        "rows": args.rows,
+        "per_row_seconds": round(per_row, 3),
+        "bulk_seconds": round(bulk, 3),
+        "per_row_rows_per_second": round(args.rows / per_row),
+        "bulk_rows_per_second": round(args.rows / bulk),
+        "speedup": round(per_row / bulk, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
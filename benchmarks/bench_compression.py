@@ -0,0 +1,56 @@
+"""
+Tamaño y latencia de los listados grandes según Accept-Encoding, con la
+caché de cuerpos precodificados fría (se vacía antes de cada petición) y
+caliente.
+
+Requiere `httpx` (cliente de pruebas de FastAPI); `br` y `zstd` solo se
+miden si `brotli` y `zstandard` están instalados.
+
+Uso:
+    python -m benchmarks.bench_compression --rows 10000
+"""
+import argparse
+import json
+
+from benchmarks.common import get_engine, measure, seed
+from fastapi.testclient import TestClient
+
+from app.compression import CODECS
+from app.main import app
+from app.payload_cache import payload_cache
+
+PATHS = ("/pokemon/?limit=1000", "/pokemon/type/water")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    total = seed(get_engine(), args.rows)
+    client = TestClient(app)
+
+    results = {}
+    for path in PATHS:
+        results[path] = {}
+        for encoding in ("identity", *CODECS):
+            headers = {"Accept-Encoding": encoding}
+            response = client.get(path, headers=headers)
+            response.raise_for_status()
+
+            def cold():
+                payload_cache.invalidate()
+                client.get(path, headers=headers)
+
+            results[path][encoding] = {
+                "bytes": int(response.headers["content-length"]),
+                "cold": measure(cold, repeat=args.repeat),
+                "warm": measure(lambda: client.get(path, headers=headers), repeat=args.repeat),
+            }
+
+    print(json.dumps({"rows": total, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Mide memoria pico y tiempo al primer byte de la exportación en streaming.
+
+Consume el mismo generador que entrega `/pokemon/export` y reporta cuánto
+creció el RSS máximo del proceso. Con streaming el crecimiento debe
+mantenerse acotado (unos pocos MB) sin importar el número de filas; como
+referencia también se mide cargar la tabla completa como hace `GET /pokemon/`
+(opcional con --compare-full, usa mucha memoria).
+
+Uso:
+    python -m benchmarks.bench_export --rows 1000000 --format ndjson
+"""
+import argparse
+import json
+import resource
+import time
+
+from benchmarks.common import get_engine, seed
+from app.export import export_pokemons
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--compare-full", action="store_true")
+    args = parser.parse_args()
+
+    total = seed(get_engine(), args.rows)
+    # Calienta imports y el pool de conexiones sin recorrer la tabla
+    next(export_pokemons(args.format, batch_size=100))
+
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    first_byte = None
+    size = 0
+    for chunk in export_pokemons(args.format, batch_size=args.batch_size):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    report = {
+        "rows": total,
+        "format": args.format,
+        "bytes": size,
+        "time_to_first_byte_ms": round(first_byte * 1000, 1),
+        "total_seconds": round(elapsed, 2),
+        "rss_before_mb": round(rss_before, 1),
+        "rss_growth_mb": round(max_rss_mb() - rss_before, 1),
+    }
+
+    if args.compare_full:
+        # Referencia: materializar todo el cuerpo en memoria antes de enviarlo
+        rss_before = max_rss_mb()
+        body = b"".join(export_pokemons(args.format, batch_size=args.batch_size))
+        report["full_body_rss_growth_mb"] = round(max_rss_mb() - rss_before, 1)
+        del body
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Mide el throughput de la importación masiva (`app.importer`).
+
+Genera un archivo CSV o NDJSON con N Pokémon sintéticos y lo importa tres
+veces sobre una tabla vacía:
+
+1. `fresh`: todas las filas son nuevas (INSERT).
+2. `reimport`: el mismo archivo otra vez; ninguna fila cambia, así que el
+   upsert no reescribe nada.
+3. `modified`: el archivo con las estadísticas cambiadas; todas se actualizan.
+
+Como referencia mide también `crud.bulk_create_pokemons` (lo que hace
+`POST /pokemon/bulk`) en lotes de BULK_MAX_ITEMS sobre `--baseline-rows`.
+
+Usa su propia base de datos (`--database-url`) porque vacía la tabla.
+
+Uso:
+    python -m benchmarks.bench_import --rows 1000000 --format csv
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import get_engine, iter_synthetic
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.config import BULK_MAX_ITEMS
+from app.importer import import_stream
+
+FIELDS = list(schemas.PokemonCreate.model_fields)
+
+
+def write_file(path: str, fmt: str, rows: int, stat_offset: int = 0) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+        for pokemon in iter_synthetic(rows):
+            pokemon["hp"] = min(pokemon["hp"] + stat_offset, 999)
+            if fmt == "csv":
+                writer.writerow([pokemon[field] for field in FIELDS])
+            else:
+                f.write(json.dumps(pokemon, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def clear(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(delete(models.Pokemon.__table__))
+
+
+def run_import(engine, path: str, fmt: str, chunk_size: int) -> dict:
+    with Session(engine) as db, open(path, "rb") as f:
+        summary = import_stream(db, f, fmt, chunk_size=chunk_size)
+    summary.pop("errors")
+    return summary
+
+
+def run_baseline(engine, rows: int) -> dict:
+    pokemons = [schemas.PokemonCreate(**pokemon) for pokemon in iter_synthetic(rows)]
+    started = time.perf_counter()
+    with Session(engine) as db:
+        for start in range(0, len(pokemons), BULK_MAX_ITEMS):
+            crud.bulk_create_pokemons(db, pokemons[start:start + BULK_MAX_ITEMS])
+    elapsed = time.perf_counter() - started
+    return {"rows": rows, "elapsed_seconds": round(elapsed, 3), "rows_per_second": round(rows / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--baseline-rows", type=int, default=100_000, help="0 para omitir la referencia")
+    parser.add_argument("--database-url", default="sqlite:///./benchmarks/import_bench.db")
+    args = parser.parse_args()
+
+    engine = get_engine(args.database_url)
+    report = {"rows": args.rows, "format": args.format, "chunk_size": args.chunk_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"pokemon.{args.format}")
+        modified = os.path.join(tmp, f"modified.{args.format}")
+        write_file(path, args.format, args.rows)
+        write_file(modified, args.format, args.rows, stat_offset=1)
+        report["file_mb"] = round(os.path.getsize(path) / 1e6, 1)
+
+        clear(engine)
+        report["fresh"] = run_import(engine, path, args.format, args.chunk_size)
+        report["reimport"] = run_import(engine, path, args.format, args.chunk_size)
+        report["modified"] = run_import(engine, modified, args.format, args.chunk_size)
+
+    if args.baseline_rows:
+        clear(engine)
+        report["baseline_bulk_create"] = run_baseline(engine, args.baseline_rows)
+    clear(engine)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
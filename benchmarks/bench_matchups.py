@@ -0,0 +1,89 @@
+"""
+Mide el throughput de POST /matchups con lotes de 100k enfrentamientos.
+
+- `endpoint`: la petición completa (validación del cuerpo, tipos desde el
+  almacén en memoria, cálculo vectorizado y codificación de la respuesta)
+  con el cliente de pruebas de FastAPI (requiere `httpx`).
+- `engine`: solo el cálculo (`crud._matchup_result`), sin HTTP.
+- `python_loop`: lo que hacía el simulador del lado del cliente: leer los
+  tipos de los IDs con una consulta y evaluar cada par en un bucle de Python
+  con la tabla como diccionario.
+
+Además mide GET /pokemon/{id}/weaknesses (una petición por Pokémon, con la
+tabla de cada combinación de tipos ya calculada).
+
+Uso:
+    python -m benchmarks.bench_matchups --rows 100000 --pairs 100000
+"""
+import argparse
+import json
+import random
+
+from benchmarks.common import get_engine, measure, seed
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.main import app
+from app.type_chart import CHART, TYPES, type_code
+
+
+def python_loop(db: Session, attackers, defenders):
+    chart = {(attacker, defender): float(CHART[type_code(attacker), type_code(defender)])
+             for attacker in TYPES for defender in TYPES}
+    ids = list(set(attackers) | set(defenders))
+    types = {}
+    query = select(models.Pokemon.id, models.Pokemon.type1, models.Pokemon.type2)
+    for start in range(0, len(ids), crud._LOOKUP_CHUNK):
+        chunk = ids[start:start + crud._LOOKUP_CHUNK]
+        types.update((row[0], [name for name in row[1:] if name]) for row in db.execute(query.where(models.Pokemon.id.in_(chunk))))
+    results = []
+    for attacker, defender in zip(attackers, defenders):
+        best = None
+        for attack in types[attacker]:
+            multiplier = 1.0
+            for defense in types[defender]:
+                multiplier *= chart[(attack, defense)]
+            best = multiplier if best is None else max(best, multiplier)
+        results.append(best)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--pairs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--naive-repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    total = seed(engine, args.rows)
+    with engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(select(models.Pokemon.id).limit(args.rows))]
+    rng = random.Random(11)
+    attackers = [rng.choice(ids) for _ in range(args.pairs)]
+    defenders = [rng.choice(ids) for _ in range(args.pairs)]
+    body = {"attackers": attackers, "defenders": defenders}
+    results = {"rows": total, "pairs": args.pairs}
+
+    with TestClient(app) as client, Session(engine) as db:
+        crud._sync_stat_store(db)
+        results["endpoint"] = measure(lambda: client.post("/matchups", json=body).raise_for_status(), repeat=args.repeat)
+        results["engine"] = measure(lambda: crud._matchup_result(attackers, defenders), repeat=args.repeat)
+        results["python_loop"] = measure(lambda: python_loop(db, attackers, defenders),
+                                         repeat=args.naive_repeat, warmup=0)
+        sample = rng.sample(ids, min(len(ids), 200))
+        weaknesses = measure(lambda: [client.get(f"/pokemon/{pokemon_id}/weaknesses").raise_for_status()
+                                      for pokemon_id in sample], repeat=3)
+        results["weaknesses_per_request_ms"] = round(weaknesses["p50_ms"] / len(sample), 3)
+
+    for name in ("endpoint", "engine", "python_loop"):
+        results[name]["pairs_per_second"] = round(args.pairs / results[name]["p50_ms"] * 1000)
+    results["p50_speedup"] = round(results["python_loop"]["p50_ms"] / results["endpoint"]["p50_ms"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Costo de la instrumentación de /metrics.
+
+Mide por separado las dos piezas que se ejecutan en cada petición:
+
+- `MetricsMiddleware` alrededor de una aplicación ASGI vacía (costo fijo por
+  petición, sin red ni enrutamiento).
+- Los eventos before/after_cursor_execute sobre un `SELECT 1` en SQLite en
+  memoria (costo por consulta), comparando un engine instrumentado con uno
+  sin instrumentar y con uno que tiene listeners vacíos (el costo propio del
+  despacho de eventos de SQLAlchemy).
+
+Cada medición se repite varias veces y se reporta la mejor, para reducir el
+ruido de la máquina.
+
+Uso:
+    python -m benchmarks.bench_metrics --requests 20000 --queries 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import create_engine, event, text
+
+from benchmarks.common import measure  # noqa: F401  (configura sys.path y DATABASE_URL)
+from app.metrics import MetricsMiddleware, instrument_engine
+
+SCOPE = {"type": "http", "method": "GET", "path": "/pokemon/1", "headers": []}
+
+
+async def _empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+def _per_request_us(app, n: int) -> float:
+    async def run():
+        started = time.perf_counter()
+        for _ in range(n):
+            await app(dict(SCOPE), _receive, _send)
+        return (time.perf_counter() - started) / n * 1_000_000
+    return asyncio.run(run())
+
+
+def _per_query_us(engine, n: int) -> float:
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        conn.execute(statement)
+        started = time.perf_counter()
+        for _ in range(n):
+            conn.execute(statement)
+        return (time.perf_counter() - started) / n * 1_000_000
+
+
+def _best_of(rounds: int, fn, *args) -> float:
+    return min(fn(*args) for _ in range(rounds))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    bare = _best_of(args.rounds, _per_request_us, _empty_app, args.requests)
+    instrumented = _best_of(args.rounds, _per_request_us, MetricsMiddleware(_empty_app), args.requests)
+
+    plain_engine = create_engine("sqlite://")
+    noop_engine = create_engine("sqlite://")
+    for name in ("before_cursor_execute", "after_cursor_execute", "handle_error"):
+        event.listen(noop_engine, name, lambda *args: None)
+    traced_engine = create_engine("sqlite://")
+    instrument_engine(traced_engine)
+    plain_query = _best_of(args.rounds, _per_query_us, plain_engine, args.queries)
+    noop_query = _best_of(args.rounds, _per_query_us, noop_engine, args.queries)
+    traced_query = _best_of(args.rounds, _per_query_us, traced_engine, args.queries)
+
+    print(json.dumps({
+        "middleware_us_per_request": {
+            "bare": round(bare, 2),
+            "instrumented": round(instrumented, 2),
+            "overhead": round(instrumented - bare, 2),
+        },
+        "query_events_us_per_query": {
+            "bare": round(plain_query, 2),
+            "empty_listeners": round(noop_query, 2),
+            "instrumented": round(traced_query, 2),
+            "overhead": round(traced_query - plain_query, 2),
+        },
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Tamaño de respuesta y latencia de GET /pokemon/ con y sin `fields=`.
+
+Las peticiones pasan por la aplicación completa (validación, serialización y
+middlewares) con el cliente de pruebas de FastAPI, que requiere `httpx`.
+
+Uso:
+    python -m benchmarks.bench_projection --rows 10000 --limit 1000
+"""
+import argparse
+import json
+
+from benchmarks.common import get_engine, measure, seed
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+GRID_FIELDS = "name,type1,type2,image_url"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--fields", default=GRID_FIELDS)
+    args = parser.parse_args()
+
+    total = seed(get_engine(), args.rows)
+    client = TestClient(app)
+
+    results = {}
+    for label, params in (
+        ("full", {"limit": args.limit}),
+        ("fields", {"limit": args.limit, "fields": args.fields}),
+    ):
+        response = client.get("/pokemon/", params=params)
+        response.raise_for_status()
+        results[label] = {
+            "bytes": len(response.content),
+            "latency": measure(lambda: client.get("/pokemon/", params=params), repeat=args.repeat),
+        }
+    results["bytes_ratio"] = round(results["fields"]["bytes"] / results["full"]["bytes"], 3)
+    results["p50_speedup"] = round(results["full"]["latency"]["p50_ms"] / results["fields"]["latency"]["p50_ms"], 2)
+
+    print(json.dumps({"rows": total, "limit": args.limit, "fields": args.fields, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
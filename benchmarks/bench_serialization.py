@@ -0,0 +1,86 @@
+"""
+Compara la serialización de listados: objetos ORM → response_model →
+JSONResponse (camino por defecto de FastAPI) contra tuplas de columnas
+codificadas directamente con `app.serialization` (orjson si está instalado).
+
+Verifica además que ambos caminos produzcan exactamente los mismos bytes.
+
+Uso:
+    python -m benchmarks.bench_serialization --rows 10000 --limit 1000
+"""
+import argparse
+import asyncio
+import json
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import get_engine, measure, seed
+from app import crud, serialization
+from app.main import app
+
+
+def _response_field():
+    for route in app.routes:
+        if getattr(route, "path", None) == "/pokemon/" and "GET" in route.methods:
+            return route.response_field
+    raise RuntimeError("No se encontró la ruta GET /pokemon/")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    total = seed(engine, args.rows)
+    Session = sessionmaker(bind=engine)
+    field = _response_field()
+    fields: List[str] = list(crud.LIST_FIELDS)
+    loop = asyncio.new_event_loop()
+
+    def legacy() -> bytes:
+        with Session() as db:
+            pokemons = crud.get_pokemons(db, limit=args.limit)
+            content = loop.run_until_complete(serialize_response(field=field, response_content=pokemons))
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        with Session() as db:
+            rows = crud.get_pokemon_rows(db, fields, limit=args.limit)
+        return serialization.encode_rows(rows, fields)
+
+    def encode_only_legacy(pokemons):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=pokemons))
+        return JSONResponse(content).body
+
+    identical = legacy() == fast()
+    with Session() as db:
+        pokemons = crud.get_pokemons(db, limit=args.limit)
+        rows = crud.get_pokemon_rows(db, fields, limit=args.limit)
+
+    results = {
+        "identical_bytes": identical,
+        "encoder": "orjson" if serialization.orjson is not None else "json",
+        "end_to_end": {
+            "orm_pydantic_json": measure(legacy, repeat=args.repeat),
+            "rows_direct": measure(fast, repeat=args.repeat),
+        },
+        # Sin la consulta: sólo el costo de convertir a bytes
+        "encode_only": {
+            "orm_pydantic_json": measure(lambda: encode_only_legacy(pokemons), repeat=args.repeat),
+            "rows_direct": measure(lambda: serialization.encode_rows(rows, fields), repeat=args.repeat),
+        },
+    }
+    loop.close()
+    print(json.dumps({"rows": total, "limit": args.limit, "results": results}, indent=2))
+    if not identical:
+        raise SystemExit("La salida de ambos caminos no es idéntica")
+
+
+if __name__ == "__main__":
+    main()
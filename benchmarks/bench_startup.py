@@ -0,0 +1,123 @@
+"""
+Arranque en frío y escalado por núcleo del servidor de producción.
+
+- Importación: tiempo de `import app.main` en un intérprete nuevo (lo que
+  paga cada worker al arrancar) y costo del `create_all` que antes se hacía
+  al importar, medido aparte sobre la base ya creada.
+- Arranque en frío: tiempo desde lanzar `python -m app.server` hasta la
+  primera respuesta, y duración del apagado ordenado tras SIGTERM, para cada
+  número de workers.
+- Escalado: peticiones por segundo con una mezcla de solo lectura para cada
+  número de workers, y eficiencia frente a un worker (1.0 = lineal).
+
+Uso:
+    python -m benchmarks.bench_startup --rows 10000 --workers 1,2,4 --requests 3000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.common import BENCH_DATABASE_URL, get_engine, seed
+from benchmarks.load_test import ROOT, UvicornServer, Workload, run_workload
+from app import models
+
+READ_MIX = {"get_by_id": 10, "get_by_name": 4, "list_cursor": 3, "by_type": 2, "autocomplete": 4}
+
+_IMPORT_SNIPPET = "import time; s = time.perf_counter(); import app.main; print(time.perf_counter() - s)"
+
+
+def import_seconds(runs: int) -> float:
+    env = {**os.environ, "DATABASE_URL": BENCH_DATABASE_URL}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET], cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def create_all_seconds(engine, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        engine.dispose()  # conexión nueva, como en un worker recién creado
+        started = time.perf_counter()
+        models.Base.metadata.create_all(bind=engine)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+async def _throughput(server: UvicornServer, workload: Workload, requests: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=server.base_url, limits=limits, timeout=120) as client:
+        # Calentamiento: cachés e índices en memoria de cada worker
+        await run_workload(client, workload, READ_MIX, requests // 5, concurrency, 0)
+        return await run_workload(client, workload, READ_MIX, requests, concurrency, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--workers", default=None, help="Lista de workers a probar (por defecto 1, 2, 4... hasta los núcleos)")
+    parser.add_argument("--requests", type=int, default=3000, help="Peticiones por número de workers")
+    parser.add_argument("--concurrency", type=int, default=16, help="Conexiones por worker")
+    parser.add_argument("--runs", type=int, default=5, help="Repeticiones de las mediciones de arranque")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = sorted({1, 2} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores} | {cores})
+
+    engine = get_engine()
+    seed(engine, args.rows)
+    with engine.connect() as conn:
+        id_range = conn.execute(select(func.min(models.Pokemon.id), func.max(models.Pokemon.id))).one()
+
+    results = {
+        "cores": cores,
+        "database": engine.dialect.name,
+        "import_app_ms": round(import_seconds(args.runs) * 1000, 1),
+        "create_all_at_import_ms": round(create_all_seconds(engine, args.runs) * 1000, 2),
+        "workers": {},
+    }
+    baseline_rps = None
+    for workers in worker_counts:
+        startups, shutdowns = [], []
+        for _ in range(args.runs):
+            with UvicornServer(workers=workers) as server:
+                pass
+            startups.append(server.startup_s)
+            shutdowns.append(server.shutdown_s)
+        print(f"  {workers} worker(s): carga de solo lectura...", file=sys.stderr)
+        with UvicornServer(workers=workers) as server:
+            run = asyncio.run(_throughput(
+                server, Workload(id_range, f"s{workers}"), args.requests, args.concurrency * workers,
+            ))
+        baseline_rps = baseline_rps or run["throughput_rps"] / workers
+        results["workers"][workers] = {
+            "cold_start_ms": round(statistics.median(startups) * 1000, 1),
+            "shutdown_ms": round(statistics.median(s for s in shutdowns if s is not None) * 1000, 1),
+            "throughput_rps": run["throughput_rps"],
+            "rps_per_worker": round(run["throughput_rps"] / workers, 1),
+            "scaling_efficiency": round(run["throughput_rps"] / (baseline_rps * workers), 2),
+            "p50_ms": run["latency"]["p50_ms"],
+            "p99_ms": run["latency"]["p99_ms"],
+            "errors": run["errors"],
+        }
+    if cores < max(worker_counts):
+        results["note"] = f"Solo hay {cores} núcleo(s): con más workers que núcleos no se espera escalado"
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compara el almacén NumPy de estadísticas (`app.stat_store`) con calcular lo
+mismo leyendo la tabla desde SQL y recorriéndola en Python.
+
+- `load`: carga completa del almacén desde la base de datos (ocurre una vez
+  por proceso y después de una importación masiva).
+- `similar`: los k vecinos más cercanos de IDs al azar (euclidiana y coseno)
+  contra leer todas las filas y calcular distancias en un bucle de Python.
+- `summary`: medias, percentiles y tabla de mayor BST por tipo, recalculado
+  (como tras una escritura) y reutilizado; la referencia son las mismas cifras
+  con consultas SQL (AVG por tipo, ORDER BY BST) y percentiles en Python.
+
+Uso:
+    python -m benchmarks.bench_stats --rows 1000000
+"""
+import argparse
+import heapq
+import json
+import math
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from benchmarks.common import get_engine, measure, seed
+from sqlalchemy import desc, func, select, union_all
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.stat_store import STAT_FIELDS, SUMMARY_PERCENTILES, stat_store
+
+STAT_COLUMNS = [getattr(models.Pokemon, field) for field in STAT_FIELDS]
+
+
+def naive_similar(db: Session, pokemon_id: int, k: int, metric: str):
+    rows = db.execute(select(models.Pokemon.id, *STAT_COLUMNS)).all()
+    target = next(row[1:] for row in rows if row[0] == pokemon_id)
+    target_norm = math.sqrt(sum(value * value for value in target))
+    scored = []
+    for row in rows:
+        if row[0] == pokemon_id:
+            continue
+        stats = row[1:]
+        if metric == "euclidean":
+            distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(stats, target)))
+        else:
+            norm = math.sqrt(sum(value * value for value in stats))
+            distance = 1 - sum(a * b for a, b in zip(stats, target)) / (norm * target_norm)
+        scored.append((distance, row[0]))
+    return heapq.nsmallest(k, scored)
+
+
+def naive_summary(db: Session, top: int):
+    bst = sum(STAT_COLUMNS[1:], STAT_COLUMNS[0])
+    typed = union_all(
+        select(models.Pokemon.id, models.Pokemon.type1.label("type"), *STAT_COLUMNS),
+        select(models.Pokemon.id, models.Pokemon.type2.label("type"), *STAT_COLUMNS)
+        .where(models.Pokemon.type2.is_not(None), models.Pokemon.type2 != models.Pokemon.type1),
+    ).subquery()
+    stat_columns = [typed.c[field] for field in STAT_FIELDS]
+    typed_bst = sum(stat_columns[1:], stat_columns[0])
+    means = db.execute(
+        select(typed.c.type, func.count(), *(func.avg(column) for column in stat_columns), func.avg(typed_bst))
+        .group_by(typed.c.type)
+    ).all()
+    leaders = {}
+    for pokemon_type, *_ in means:
+        leaders[pokemon_type] = db.execute(
+            select(typed.c.id, typed_bst).where(typed.c.type == pokemon_type).order_by(desc(typed_bst)).limit(top)
+        ).all()
+    leaders[None] = db.execute(select(models.Pokemon.id, bst).order_by(desc(bst)).limit(top)).all()
+    # Percentiles: SQLite no tiene percentile_cont, se calculan en Python
+    values = defaultdict(list)
+    for row in db.execute(select(typed.c.type, *stat_columns)):
+        values[row[0]].append(row[1:] + (sum(row[1:]),))
+    percentiles = {
+        pokemon_type: [statistics.quantiles(column, n=100)[q - 1] for column in zip(*rows) for q in SUMMARY_PERCENTILES]
+        for pokemon_type, rows in values.items()
+    }
+    return means, leaders, percentiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--naive-repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    total = seed(engine, args.rows)
+    rng = random.Random(3)
+    results = {"rows": total}
+
+    with Session(engine) as db:
+        ids = [row[0] for row in db.execute(select(models.Pokemon.id).order_by(func.random()).limit(100))]
+
+        started = time.perf_counter()
+        stat_store.invalidate()
+        crud._sync_stat_store(db)
+        results["load_seconds"] = round(time.perf_counter() - started, 2)
+
+        for metric in ("euclidean", "cosine"):
+            results[f"similar_{metric}"] = {
+                "store": measure(lambda: stat_store.similar(rng.choice(ids), args.k, metric), repeat=args.repeat),
+                "naive": measure(lambda: naive_similar(db, rng.choice(ids), args.k, metric),
+                                 repeat=args.naive_repeat, warmup=0),
+            }
+
+        def recompute():
+            # Una escritura invalida el resumen calculado
+            stat_store._changed()
+            stat_store.summary(args.top)
+
+        results["summary"] = {
+            "store_recompute": measure(recompute, repeat=max(args.repeat // 4, 3)),
+            "store_cached": measure(lambda: crud.stats_summary(db, top=args.top), repeat=args.repeat),
+            "naive": measure(lambda: naive_summary(db, args.top), repeat=args.naive_repeat, warmup=0),
+        }
+
+    for name, result in results.items():
+        if isinstance(result, dict) and "naive" in result:
+            fastest = min(value["p50_ms"] for key, value in result.items() if key.startswith("store"))
+            result["p50_speedup"] = round(result["naive"]["p50_ms"] / fastest, 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
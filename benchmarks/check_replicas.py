@@ -0,0 +1,111 @@
+"""
+Comprueba el enrutamiento de lecturas a réplicas y la ventana
+read-your-writes con dos archivos SQLite locales como réplicas de un
+primario (copias tomadas antes de escribir, es decir, réplicas atrasadas).
+
+- `round_robin`: las lecturas se reparten entre las réplicas en orden.
+- `cookie`: una escritura devuelve la cookie con el fin de la ventana y con
+  ella otro worker lee del primario (también en /pokemon/export).
+- `process_window`: sin cookie, el worker que escribió lee del primario.
+- `window_expired`: sin ventana (o con la cookie vencida) se lee de una
+  réplica y la escritura todavía no se ve.
+- `read_only_paths`: POST /pokemon/batch no abre la ventana.
+
+Muestra el resultado de cada comprobación en JSON y termina con código 1 si
+alguna falla. No usa `BENCH_DATABASE_URL`: crea sus bases en un directorio
+temporal.
+
+Uso:
+    python -m benchmarks.check_replicas
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+_DIRECTORY = tempfile.mkdtemp(prefix="check_replicas-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_DIRECTORY}/primary.db",
+    DATABASE_REPLICA_URLS=f"sqlite:///{_DIRECTORY}/replica1.db,sqlite:///{_DIRECTORY}/replica2.db",
+    READ_YOUR_WRITES_SECONDS="30",
+    SHARED_CACHE_BACKEND="none",
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import crud, database, models  # noqa: E402
+from app.main import app  # noqa: E402
+from app.replicas import READ_YOUR_WRITES_COOKIE, read_sessionmaker, router  # noqa: E402
+
+PIKACHU = {"name": "Pikachu", "type1": "Electric", "type2": None, "hp": 35, "attack": 55, "defense": 40,
+           "sp_attack": 50, "sp_defense": 50, "speed": 90, "height": 0.4, "weight": 6.0}
+results = {}
+
+
+def check(name: str, condition: bool, detail=None) -> None:
+    results[name] = "ok" if condition else f"FAIL: {detail}"
+
+
+def other_worker() -> None:
+    """Simula que la siguiente petición la atiende otro worker: sin ventana de proceso ni cachés en memoria"""
+    router._last_write = float("-inf")
+    crud.invalidate_all_local()
+
+
+def run_checks(client: TestClient) -> None:
+    chosen = [read_sessionmaker() for _ in range(4)]
+    expected = database.ReplicaSessionLocals * 2
+    check("round_robin", chosen == expected, [database.ReplicaSessionLocals.index(factory) for factory in chosen])
+
+    response = client.post("/pokemon/", json=PIKACHU)
+    pokemon_id = response.json()["id"]
+    primary_until = float(client.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+
+    other_worker()
+    status = client.get(f"/pokemon/{pokemon_id}").status_code
+    other_worker()
+    export = client.get("/pokemon/export").text
+    check("cookie", response.status_code == 201 and 25 < primary_until - time.time() <= 30
+          and status == 200 and "Pikachu" in export,
+          {"create": response.status_code, "primary_until": primary_until, "get": status, "export": export[:40]})
+
+    update = client.put(f"/pokemon/{pokemon_id}", json={"hp": 36}).status_code
+    client.cookies.clear()
+    crud.invalidate_all_local()
+    status = client.get(f"/pokemon/{pokemon_id}").status_code
+    check("process_window", (update, status) == (200, 200), {"update": update, "get": status})
+
+    other_worker()
+    without_cookie = client.get(f"/pokemon/{pokemon_id}").status_code
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, f"{time.time() - 1:.3f}")
+    expired = client.get(f"/pokemon/{pokemon_id}").status_code
+    check("window_expired", (without_cookie, expired) == (404, 404),
+          {"without_cookie": without_cookie, "expired_cookie": expired})
+
+    client.cookies.clear()
+    response = client.post("/pokemon/batch", json={"ids": [pokemon_id]})
+    check("read_only_paths", response.status_code == 200 and READ_YOUR_WRITES_COOKIE not in response.cookies
+          and router._last_write == float("-inf"), {"status": response.status_code, "cookies": dict(response.cookies)})
+
+
+def main():
+    try:
+        models.Base.metadata.create_all(bind=database.engine)
+        for replica in ("replica1", "replica2"):
+            shutil.copy(f"{_DIRECTORY}/primary.db", f"{_DIRECTORY}/{replica}.db")
+        with TestClient(app) as client:
+            run_checks(client)
+    finally:
+        database.engine.dispose()
+        for replica in database.replica_engines.values():
+            replica.dispose()
+        shutil.rmtree(_DIRECTORY, ignore_errors=True)
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(result == "ok" for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Comprueba el comportamiento de la caché compartida con el backend en memoria
+(sin Redis): varias instancias de `SharedCache` sobre el mismo
+`MemoryBackend` hacen de nodos distintos.
+
+- `cross_node`: una escritura en un nodo invalida la entrada del otro y le
+  llega el mensaje de invalidación.
+- `bulk_invalidation`: una operación masiva de `crud` hace un solo INCR y
+  un solo PUBLISH, y el otro nodo la aplica completa.
+- `single_flight`: con 20 peticiones concurrentes (hilos y corrutinas) a la
+  misma clave fría, solo una consulta la base de datos.
+- `backend_failure`: si el backend falla, las lecturas y las
+  invalidaciones siguen funcionando contra la base de datos.
+- `replica_lag`: una carga desde una réplica no se guarda mientras la clave
+  tiene una invalidación reciente.
+
+Muestra el resultado de cada comprobación en JSON y termina con código 1 si
+alguna falla.
+
+Uso:
+    python -m benchmarks.check_shared_cache
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ["SHARED_CACHE_BACKEND"] = "memory"
+
+from benchmarks.common import get_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import crud, schemas  # noqa: E402
+from app.shared_cache import Codec, MemoryBackend, SharedCache, shared_cache  # noqa: E402
+
+TEXT = Codec(lambda value: value.encode(), lambda raw: raw.decode())
+results = {}
+
+
+def check(name: str, condition: bool, detail=None) -> None:
+    results[name] = "ok" if condition else f"FAIL: {detail}"
+
+
+def check_cross_node():
+    backend = MemoryBackend()
+    node_a, node_b = SharedCache(backend), SharedCache(backend)
+    received = []
+    node_b.start(received.append)
+    node_a.get_or_load("id:1", lambda: "v1", TEXT)
+    cached = node_b.get_or_load("id:1", lambda: "db", TEXT)
+    node_a.invalidate(["id:1"], {"writes": [[1, "Pikachu", "Raichu"]]})
+    fresh = node_b.get_or_load("id:1", lambda: "v2", TEXT)
+    check("cross_node", (cached, fresh, received) == ("v1", "v2", [{"writes": [[1, "Pikachu", "Raichu"]]}]),
+          {"cached": cached, "fresh": fresh, "received": received})
+
+
+def check_bulk_invalidation():
+    calls = {"incr": 0, "publish": 0}
+    for operation in calls:
+        original = getattr(shared_cache.backend, operation)
+
+        def counted(*args, _operation=operation, _original=original):
+            calls[_operation] += 1
+            return _original(*args)
+        setattr(shared_cache.backend, operation, counted)
+    peer = SharedCache(shared_cache.backend)
+    received = []
+    peer.start(received.append)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_engine(f"sqlite:///{directory}/check.db")
+        with Session(engine) as db:
+            pokemons = [schemas.PokemonCreate(name=f"Checkmon-{i}", type1="Fire", hp=1, attack=1, defense=1,
+                                              sp_attack=1, sp_defense=1, speed=1, height=1, weight=1)
+                        for i in range(50)]
+            created = crud.bulk_create_pokemons(db, pokemons)
+        engine.dispose()
+    writes = received[0]["writes"] if len(received) == 1 else []
+    check("bulk_invalidation",
+          calls == {"incr": 1, "publish": 1} and len(writes) == len(created) == 50,
+          {"calls": calls, "messages": len(received), "writes": len(writes)})
+
+
+def check_single_flight():
+    cache = SharedCache(MemoryBackend())
+    loads = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.05)
+        return "value"
+    threads = [threading.Thread(target=cache.get_or_load, args=("id:1", load, TEXT)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sync_loads = len(loads)
+
+    async def aload():
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def concurrent():
+        return await asyncio.gather(*(cache.aget_or_load("lists", aload, TEXT, key="page") for _ in range(20)))
+    values = set(asyncio.run(concurrent()))
+    check("single_flight", sync_loads == 1 and len(loads) == 2 and values == {"value"},
+          {"sync_loads": sync_loads, "async_loads": len(loads) - sync_loads, "values": sorted(values)})
+
+
+def check_backend_failure():
+    class BrokenBackend(MemoryBackend):
+        def _get_locked(self, key):
+            raise ConnectionError("backend caído")
+
+        def incr(self, *keys):
+            raise ConnectionError("backend caído")
+
+    cache = SharedCache(BrokenBackend())
+    value = cache.get_or_load("id:1", lambda: "db", TEXT)
+    many = cache.get_many_or_load(["id:1", "id:2"], lambda keys: {key: "db" for key in keys}, TEXT)
+    cache.invalidate(["id:1"], {"writes": [[1, None, None]]})
+    errors = cache.stats()["errors"]
+    check("backend_failure", value == "db" and many == {"id:1": "db", "id:2": "db"} and errors > 0,
+          {"value": value, "many": many, "errors": errors})
+
+
+def check_replica_lag():
+    cache = SharedCache(MemoryBackend(), replica_lag=0.2)
+    cache.invalidate(["id:1"], {})
+    cache.get_or_load("id:1", lambda: "replica", TEXT, from_replica=True)
+    during = cache.get_or_load("id:1", lambda: "primary", TEXT)
+    cache.invalidate(["id:1"], {})
+    time.sleep(0.25)
+    cache.get_or_load("id:1", lambda: "settled", TEXT, from_replica=True)
+    after = cache.get_or_load("id:1", lambda: "db", TEXT)
+    check("replica_lag", (during, after) == ("primary", "settled"), {"during": during, "after": after})
+
+
+def main():
+    check_cross_node()
+    check_bulk_invalidation()
+    check_single_flight()
+    check_backend_failure()
+    check_replica_lag()
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(result == "ok" for result in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Los benchmarks usan la base de datos indicada en `BENCH_DATABASE_URL`
+(por defecto un archivo SQLite local) y nunca la de `DATABASE_URL`, para no
+sembrar datos sintéticos en la base de datos de la aplicación por accidente.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite:///./benchmarks/bench.db")
+# La aplicación importada por los benchmarks usa la misma base de datos sembrada
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.schema import CreateIndex, DropIndex  # noqa: E402
+
+from app import models  # noqa: E402
+
+TYPES = [
+    "Normal", "Fire", "Water", "Electric", "Grass", "Ice", "Fighting", "Poison",
+    "Ground", "Flying", "Psychic", "Bug", "Rock", "Ghost", "Dragon", "Dark",
+    "Steel", "Fairy",
+]
+
+
+def get_engine(url: str = BENCH_DATABASE_URL) -> Engine:
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    # create_all no agrega índices nuevos a una tabla sembrada en una corrida anterior
+    set_indexes(engine, models.Pokemon.__table__.indexes, present=True)
+    return engine
+
+
+def set_indexes(engine: Engine, indexes, present: bool) -> None:
+    """Crea (present=True) o elimina los índices indicados si hace falta"""
+    with engine.begin() as conn:
+        for index in indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True) if present else DropIndex(index, if_exists=True))
+    # Descarta conexiones con sentencias preparadas (y planes) anteriores al cambio
+    engine.dispose()
+
+
+def synthetic_pokemon(i: int, rng: random.Random) -> Dict:
+    """Genera un Pokémon sintético con la misma forma que `models.Pokemon`"""
+    type1 = rng.choice(TYPES)
+    type2 = rng.choice(TYPES) if rng.random() < 0.5 else None
+    return {
+        "name": f"Synthmon-{i:07d}",
+        "type1": type1,
+        "type2": type2 if type2 != type1 else None,
+        "hp": rng.randint(1, 255),
+        "attack": rng.randint(5, 190),
+        "defense": rng.randint(5, 230),
+        "sp_attack": rng.randint(10, 194),
+        "sp_defense": rng.randint(20, 230),
+        "speed": rng.randint(5, 180),
+        "height": round(rng.uniform(0.1, 14.5), 1),
+        "weight": round(rng.uniform(0.1, 999.9), 1),
+        "description": f"Pokémon sintético número {i} generado para benchmarks.",
+        "image_url": f"https://example.com/sprites/{i}.png",
+    }
+
+
+def iter_synthetic(n: int, start: int = 0, seed: int = 42) -> Iterator[Dict]:
+    rng = random.Random(seed + start)
+    for i in range(start, start + n):
+        yield synthetic_pokemon(i, rng)
+
+
+def seed(engine: Engine, n: int, batch_size: int = 10_000) -> int:
+    """
+    Asegura que la tabla tenga al menos `n` filas sintéticas.
+
+    Solo inserta las filas que faltan, así que ejecutar varios benchmarks
+    seguidos reutiliza la misma tabla sembrada.
+    """
+    table = models.Pokemon.__table__
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(table)).scalar_one()
+    missing = n - existing
+    if missing <= 0:
+        return existing
+    started = time.perf_counter()
+    rows = iter_synthetic(missing, start=existing)
+    inserted = 0
+    while inserted < missing:
+        batch = [next(rows) for _ in range(min(batch_size, missing - inserted))]
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        inserted += len(batch)
+        print(f"  sembrando... {existing + inserted}/{n}", end="\r", file=sys.stderr)
+    print(f"  {inserted} filas sembradas en {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return n
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Resumen de latencias en ms (p50/p95/p99 por rango más cercano)"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int = 20, warmup: int = 2) -> Dict[str, float]:
+    """Ejecuta `fn` varias veces y devuelve estadísticas de latencia en ms"""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
@@ -0,0 +1,365 @@
+"""
+Prueba de carga reproducible con una mezcla de lecturas y escrituras.
+
+Siembra la base de datos de `BENCH_DATABASE_URL` con `--rows` Pokémon
+sintéticos y reproduce una carga mixta sobre todas las rutas de la API,
+dentro del proceso (ASGI con httpx) y/o contra un servidor uvicorn real.
+El resultado (rendimiento y p50/p95/p99 por operación) se imprime como JSON;
+con `--baseline` se compara contra una corrida anterior y el proceso termina
+con código 1 si alguna métrica empeoró más que `--tolerance`.
+
+La secuencia de operaciones depende solo de `--seed`, así que dos corridas
+con los mismos parámetros ejecutan la misma carga.
+
+Uso:
+    python -m benchmarks.load_test --rows 10000 --requests 5000 --concurrency 16 \\
+        --target both --output resultados.json
+    python -m benchmarks.load_test --rows 10000 --baseline resultados.json
+    python -m benchmarks.load_test --mix "get_by_id=10,export=0"
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.common import BENCH_DATABASE_URL, TYPES, get_engine, percentiles, seed, synthetic_pokemon
+from app import models
+from app.pagination import encode_cursor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Peso relativo de cada operación en la mezcla (se pueden cambiar con --mix)
+DEFAULT_MIX: Dict[str, float] = {
+    "root": 1,
+    "list_offset": 6,
+    "list_cursor": 6,
+    "list_fields": 4,
+    "get_by_id": 20,
+    "get_by_name": 10,
+    "by_type": 8,
+    "search": 8,
+    "autocomplete": 12,
+    "export": 0.05,
+    "create": 3,
+    "update": 3,
+    "delete": 1,
+    "bulk_create": 0.5,
+    "bulk_update": 0.5,
+    "bulk_delete": 0.5,
+    "cache_stats": 0.5,
+    "pool_stats": 0.5,
+    "metrics": 0.5,
+}
+
+
+class Workload:
+    """Genera las peticiones de la mezcla; cada worker tiene su propio generador aleatorio"""
+
+    def __init__(self, id_range: Tuple[int, int], run_id: str):
+        self.min_id, self.max_id = id_range
+        self.run_id = run_id
+        # IDs creados por la prueba: los únicos que se eliminan
+        self.created: List[int] = []
+        self._names = itertools.count()
+
+    def _synthetic_name(self, rng: random.Random) -> str:
+        return f"Synthmon-{rng.randint(0, self.max_id - 1):07d}"
+
+    def _new_pokemon(self, rng: random.Random) -> dict:
+        pokemon = synthetic_pokemon(0, rng)
+        pokemon["name"] = f"Loadmon-{self.run_id}-{next(self._names)}"
+        return pokemon
+
+    def request(self, operation: str, rng: random.Random) -> Tuple[str, str, Optional[dict], Optional[dict]]:
+        """(método, ruta, parámetros, cuerpo JSON) para la operación indicada"""
+        random_id = rng.randint(self.min_id, self.max_id)
+        if operation == "root":
+            return "GET", "/", None, None
+        if operation == "list_offset":
+            return "GET", "/pokemon/", {"skip": rng.randint(0, max(self.max_id - 100, 0)), "limit": 100}, None
+        if operation == "list_cursor":
+            return "GET", "/pokemon/", {"cursor": encode_cursor(random_id), "limit": 100}, None
+        if operation == "list_fields":
+            return "GET", "/pokemon/", {"limit": 1000, "fields": "name,type1,type2,image_url"}, None
+        if operation == "get_by_id":
+            return "GET", f"/pokemon/{random_id}", None, None
+        if operation == "get_by_name":
+            return "GET", f"/pokemon/name/{self._synthetic_name(rng)}", None, None
+        if operation == "by_type":
+            return "GET", f"/pokemon/type/{rng.choice(TYPES)}", {"limit": 100}, None
+        if operation == "search":
+            return "GET", "/pokemon/search", {
+                "type": rng.choice(TYPES), "min_speed": rng.randint(5, 150), "sort": "-attack", "limit": 50,
+            }, None
+        if operation == "autocomplete":
+            name = self._synthetic_name(rng).lower()
+            query = name[:rng.randint(3, len(name))]
+            if rng.random() < 0.3 and len(query) > 4:
+                # Error de tipeo: intercambia dos letras
+                i = rng.randint(1, len(query) - 2)
+                query = query[:i] + query[i + 1] + query[i] + query[i + 2:]
+            return "GET", "/pokemon/autocomplete", {"q": query, "limit": 10}, None
+        if operation == "export":
+            return "GET", "/pokemon/export", {"format": rng.choice(["ndjson", "csv"])}, None
+        if operation == "create":
+            return "POST", "/pokemon/", None, self._new_pokemon(rng)
+        if operation == "update":
+            return "PUT", f"/pokemon/{random_id}", None, {"hp": rng.randint(1, 255)}
+        if operation == "delete":
+            target = self.created.pop(rng.randrange(len(self.created))) if self.created else random_id + 10 ** 9
+            return "DELETE", f"/pokemon/{target}", None, None
+        if operation == "bulk_create":
+            return "POST", "/pokemon/bulk", None, [self._new_pokemon(rng) for _ in range(50)]
+        if operation == "bulk_update":
+            ids = rng.sample(range(self.min_id, self.max_id + 1), min(50, self.max_id - self.min_id + 1))
+            return "PUT", "/pokemon/bulk", None, [{"id": i, "speed": rng.randint(5, 180)} for i in ids]
+        if operation == "bulk_delete":
+            targets = [self.created.pop() for _ in range(min(20, len(self.created)))]
+            return "POST", "/pokemon/bulk/delete", None, {"ids": targets or [random_id + 10 ** 9]}
+        if operation == "cache_stats":
+            return "GET", "/cache/stats", None, None
+        if operation == "pool_stats":
+            return "GET", "/pool/stats", None, None
+        if operation == "metrics":
+            return "GET", "/metrics", None, None
+        raise ValueError(f"Operación desconocida: {operation}")
+
+    def record_created(self, operation: str, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            return
+        if operation == "create":
+            self.created.append(response.json()["id"])
+        elif operation == "bulk_create":
+            self.created.extend(item["id"] for item in response.json()["results"] if item["id"] is not None)
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, float]:
+    mix = dict(DEFAULT_MIX)
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        if name.strip() not in mix:
+            raise SystemExit(f"Operación desconocida en --mix: {name}. Válidas: {', '.join(mix)}")
+        mix[name.strip()] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+async def run_workload(client: httpx.AsyncClient, workload: Workload, mix: Dict[str, float],
+                       requests: int, concurrency: int, seed_value: int) -> dict:
+    operations, weights = list(mix), list(mix.values())
+    samples: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    remaining = itertools.count()
+
+    async def worker(index: int):
+        rng = random.Random(seed_value * 1000 + index)
+        while next(remaining) < requests:
+            operation = rng.choices(operations, weights)[0]
+            method, path, params, body = workload.request(operation, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                await response.aread()
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                response, status = None, type(e).__name__
+            samples[operation].append((time.perf_counter() - started) * 1000)
+            # 404 es esperado al leer/eliminar IDs que otra operación ya eliminó
+            if response is None or response.status_code >= 500 or response.status_code in (400, 409, 422):
+                errors[operation][status] += 1
+            elif response is not None:
+                workload.record_created(operation, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        "requests": len(all_samples),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(all_samples) / elapsed, 1),
+        "errors": sum(sum(codes.values()) for codes in errors.values()),
+        "latency": percentiles(all_samples),
+        "operations": {
+            name: {**percentiles(values), "errors": dict(errors.get(name, {}))}
+            for name, values in sorted(samples.items())
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class UvicornServer:
+    """
+    Levanta el servidor de producción (`python -m app.server`) en un
+    subproceso apuntando a la base de datos de prueba. Registra el tiempo
+    hasta la primera respuesta (`startup_s`) y el del apagado (`shutdown_s`).
+    """
+
+    def __init__(self, workers: int = 1, extra_env: Optional[Dict[str, str]] = None):
+        self.port = _free_port()
+        self.workers = workers
+        self.env = {**os.environ, "DATABASE_URL": BENCH_DATABASE_URL, **(extra_env or {})}
+        self.process: Optional[subprocess.Popen] = None
+        self.startup_s: Optional[float] = None
+        self.shutdown_s: Optional[float] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        started = time.perf_counter()
+        # La base de prueba ya tiene el esquema (benchmarks.common); no se migra
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "app.server", "--no-migrate", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=ROOT, env=self.env,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("uvicorn terminó antes de aceptar conexiones")
+            try:
+                httpx.get(self.base_url + "/", timeout=1).raise_for_status()
+                self.startup_s = time.perf_counter() - started
+                return self
+            except httpx.HTTPError:
+                time.sleep(0.02)
+        raise RuntimeError("uvicorn no respondió en 60 s")
+
+    def __exit__(self, *exc_info):
+        started = time.perf_counter()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+            self.shutdown_s = time.perf_counter() - started
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+async def run_asgi(args, workload: Workload, mix: Dict[str, float]) -> dict:
+    # Dentro del proceso: sin red, mide la aplicación y la base de datos
+    from app.main import app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        return await run_workload(client, workload, mix, args.requests, args.concurrency, args.seed)
+
+
+async def run_uvicorn(args, workload: Workload, mix: Dict[str, float]) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    with UvicornServer(workers=args.workers) as server:
+        async with httpx.AsyncClient(base_url=server.base_url, limits=limits, timeout=120) as client:
+            return await run_workload(client, workload, mix, args.requests, args.concurrency, args.seed)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regresiones de `results` frente a `baseline` (p95/p99 más altos o menos peticiones por segundo)"""
+    regressions = []
+    for target, current in results["targets"].items():
+        previous = baseline.get("targets", {}).get(target)
+        if previous is None:
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{target}: throughput {previous['throughput_rps']} → {current['throughput_rps']} rps"
+            )
+        for name, stats in current["operations"].items():
+            old = previous["operations"].get(name)
+            if not old or old.get("count", 0) < 20 or stats.get("count", 0) < 20:
+                continue
+            for key in ("p95_ms", "p99_ms"):
+                if stats[key] > old[key] * (1 + tolerance):
+                    regressions.append(f"{target}/{name}: {key} {old[key]} → {stats[key]}")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Pokémon sintéticos a sembrar (200 a 1M)")
+    parser.add_argument("--requests", type=int, default=5000, help="Peticiones por objetivo")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--target", choices=["asgi", "uvicorn", "both"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn")
+    parser.add_argument("--mix", help="Pesos a cambiar, p. ej. 'export=0,get_by_id=30'")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Archivo donde guardar el JSON")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Empeoramiento permitido (0.2 = 20%%)")
+    args = parser.parse_args()
+    if not 200 <= args.rows <= 1_000_000:
+        parser.error("--rows debe estar entre 200 y 1000000")
+
+    engine = get_engine()
+    total = seed(engine, args.rows)
+    with engine.connect() as conn:
+        id_range = conn.execute(select(func.min(models.Pokemon.id), func.max(models.Pokemon.id))).one()
+    mix = parse_mix(args.mix)
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+
+    targets = ["asgi", "uvicorn"] if args.target == "both" else [args.target]
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "database": engine.dialect.name,
+            "rows": total,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "uvicorn_workers": args.workers,
+            "seed": args.seed,
+            "mix": mix,
+            "python": platform.python_version(),
+        },
+        "targets": {},
+    }
+    for target in targets:
+        workload = Workload(id_range, f"{run_id}{target[0]}")
+        print(f"  {target}: {args.requests} peticiones con concurrencia {args.concurrency}...", file=sys.stderr)
+        runner = run_asgi if target == "asgi" else run_uvicorn
+        results["targets"][target] = asyncio.run(runner(args, workload, mix))
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESIÓN {regression}", file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+-- Índices para los filtros por rango y el ordenamiento de /pokemon/search
+-- (el id se incluye como desempate para recorrer el índice ya ordenado)
+
+CREATE INDEX IF NOT EXISTS ix_pokemon_hp_id ON pokemon (hp, id);
+CREATE INDEX IF NOT EXISTS ix_pokemon_attack_id ON pokemon (attack, id);
+CREATE INDEX IF NOT EXISTS ix_pokemon_defense_id ON pokemon (defense, id);
+CREATE INDEX IF NOT EXISTS ix_pokemon_sp_attack_id ON pokemon (sp_attack, id);
+CREATE INDEX IF NOT EXISTS ix_pokemon_sp_defense_id ON pokemon (sp_defense, id);
+CREATE INDEX IF NOT EXISTS ix_pokemon_speed_id ON pokemon (speed, id);
+
+ANALYZE pokemon;
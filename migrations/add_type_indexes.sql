@@ -0,0 +1,7 @@
+-- Índices para la búsqueda por tipo sin distinguir mayúsculas
+-- (GET /pokemon/type/{pokemon_type} filtra con lower(type1) / lower(type2))
+
+CREATE INDEX IF NOT EXISTS ix_pokemon_type1_lower ON pokemon (lower(type1));
+CREATE INDEX IF NOT EXISTS ix_pokemon_type2_lower ON pokemon (lower(type2));
+
+ANALYZE pokemon;
@@ -0,0 +1,4 @@
+-- Versión de fila usada para los ETag y el control de concurrencia optimista
+-- (se incrementa en cada UPDATE hecho por la API)
+
+ALTER TABLE pokemon ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;